@@ -71,7 +71,7 @@ class RealMissionExecutor:
             ))
             
             task_plan = await self.task_parser.parse_prompt_to_task_plan(user_prompt, mission_id)
-            self.db_manager.update_mission_status(mission_id, "running", progress=25)
+            self.db_manager.update_mission_progress(mission_id, 25)
             
             logger.info(f"Task plan generated: {task_plan.get('task_type', 'unknown')}")
             agent_observability.push_event(LiveStreamEvent(
@@ -105,7 +105,7 @@ class RealMissionExecutor:
                 }
             ))
             
-            self.db_manager.update_mission_status(mission_id, "running", progress=40)
+            self.db_manager.update_mission_progress(mission_id, 40)
             
             # Phase 3: Execute the task plan
             logger.info(f"Phase 3: Executing task plan for mission {mission_id}")
@@ -121,7 +121,7 @@ class RealMissionExecutor:
             ))
             
             execution_result = await executable_agent.execute_task_plan(task_plan.get("executable_plan", {}))
-            self.db_manager.update_mission_status(mission_id, "running", progress=80)
+            self.db_manager.update_mission_progress(mission_id, 80)
             
             # Phase 4: Finalize and report results
             logger.info(f"Phase 4: Finalizing mission {mission_id}")
@@ -13,19 +13,29 @@ import os
 from datetime import datetime
 import sys
 from loguru import logger
-from starlette.responses import Response
 import time
 import logging
 
 # Import our AI components
 from .core.cognitive_forge_engine import cognitive_forge_engine
-from src.models.advanced_database import db_manager
+from src.models.advanced_database import db_manager, async_db_manager
+from src.models.retention import retention_manager
+from src.core.mission_scheduler import mission_scheduler, SchedulerError, priority_rank
+from src.core.mission_job_worker import mission_job_runner
+from src.core.mission_worker_pool import mission_worker_pool
+from src.models.job_queue import job_queue, result_store, JobQueueFullError
+from src.utils.blocking_executor import blocking_executor
+from src.utils.request_logging import RequestLoggingMiddleware
+from src.utils.log_stream import LogRingBuffer, LogFilter
+from src.config.settings import settings
 
 # --- Real-Time Logging & Streaming Setup ---
-# This is the in-memory buffer that will hold recent logs for streaming
-cognitive_log_buffer = []  # Start with empty buffer
-# This is a queue that our SSE endpoint will listen to for new messages
-cognitive_log_queue = asyncio.Queue()
+# Fixed-capacity ring of recent logs; every SSE subscriber reads it through its own cursor
+cognitive_log_buffer = LogRingBuffer(settings.LOG_STREAM_CAPACITY)
+
+def _push_log_entry(log_entry: Dict[str, Any]):
+    """Append to the live log ring (O(1), never blocks) and wake stream subscribers"""
+    cognitive_log_buffer.append(log_entry)
 
 # REMOVED: Log interceptor is now handled by the unified Event Bus in main.py
 # # Configure logging with our interceptor
@@ -40,9 +50,6 @@ app = FastAPI(
     version="2.0.0",
 )
 
-# In-memory store for mission results
-mission_results: Dict[str, Any] = {}
-
 # Configure logging
 logger.add("logs/cognitive_engine.log", rotation="10 MB", retention="7 days")
 
@@ -76,81 +83,41 @@ class CodeAnalysisResponse(BaseModel):
     issues: List[str]
     score: float
 
-# Request logging middleware
-MAX_LOG_BODY = 2048
-
-def safe_log_body(body):
-    if not body:
-        return None
-    if isinstance(body, (bytes, bytearray)):
-        body = body.decode(errors="replace")
-    if len(body) > MAX_LOG_BODY:
-        return body[:MAX_LOG_BODY] + "... [truncated]"
-    return body
-
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Capture HTTP requests for cognitive engine with enhanced logging"""
-    start_time = time.time()
-    
-    # Log incoming request
-    client_host = getattr(request.client, "host", "unknown") if request.client else "unknown"
-    client_port = getattr(request.client, "port", "unknown") if request.client else "unknown"
-    log_entry = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "level": "INFO",
-        "message": f'INFO: {client_host}:{client_port} - "{request.method} {request.url.path} HTTP/{request.scope["http_version"]}"',
-        "source": "http_request",
-        "server_port": "8002"
-    }
-    
-    cognitive_log_buffer.append(log_entry)
-    if len(cognitive_log_buffer) > 200:
-        cognitive_log_buffer.pop(0)
-    
-    # Also add to queue for real-time streaming
-    try:
-        loop = asyncio.get_event_loop()
-        asyncio.run_coroutine_threadsafe(cognitive_log_queue.put(log_entry), loop)
-    except RuntimeError:
-        pass
-    
-    logger.info(f"ENGINE: {request.method} {request.url} | Body: {safe_log_body(await request.body())}")
-    
-    try:
-        response = await call_next(request)
-        resp_body = b""
-        async for chunk in response.body_iterator:
-            resp_body += chunk
-        logger.info(f"ENGINE: Response {response.status_code} for {request.method} {request.url}")
-        
-        # Log response
-        process_time = time.time() - start_time
-        client_host = getattr(request.client, "host", "unknown") if request.client else "unknown"
-        client_port = getattr(request.client, "port", "unknown") if request.client else "unknown"
-        log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "level": "INFO",
-            "message": f'INFO: {client_host}:{client_port} - "{request.method} {request.url.path} HTTP/{request.scope["http_version"]}" {response.status_code} OK',
-            "source": "http_request",
-            "server_port": "8002"
-        }
-        
-        cognitive_log_buffer.append(log_entry)
-        if len(cognitive_log_buffer) > 200:
-            cognitive_log_buffer.pop(0)
-        
-        # Also add to queue for real-time streaming
-        try:
-            loop = asyncio.get_event_loop()
-            asyncio.run_coroutine_threadsafe(cognitive_log_queue.put(log_entry), loop)
-        except RuntimeError:
-            pass
-        
-        return Response(content=resp_body, status_code=response.status_code, headers=dict(response.headers), media_type=response.media_type)
-    except Exception as e:
-        logger.error(f"ENGINE: Exception during request: {request.method} {request.url} - {e}", exc_info=True)
-        raise
+# Request logging middleware (pure ASGI: request and response bodies are streamed, not buffered)
+app.add_middleware(RequestLoggingMiddleware, emit=_push_log_entry, server_port="8002", log_prefix="ENGINE")
+
+@app.on_event("startup")
+async def start_retention_job():
+    """Archive and purge aged mission_updates/system_logs/performance_metrics rows"""
+    if settings.RETENTION_ENABLED:
+        app.state.retention_task = asyncio.create_task(retention_manager.run_periodic())
+
+def _ingest_worker_event(log_entry: Dict[str, Any]):
+    """Feed a log event forwarded by a mission worker process into the live stream"""
+    _push_log_entry(log_entry)
+
+@app.on_event("startup")
+async def start_mission_scheduler():
+    """Bounded worker slots for mission execution (MAX_CONCURRENT_MISSIONS)"""
+    mission_scheduler.start()
+    if mission_worker_pool.enabled:
+        # Thin API mode: missions run only in the worker processes
+        mission_worker_pool.start(on_event=_ingest_worker_event)
+    elif settings.JOB_WORKER_IN_PROCESS:
+        mission_job_runner.start()
+
+@app.on_event("shutdown")
+async def stop_mission_scheduler():
+    """Hand running durable jobs back to the queue, then stop the worker slots"""
+    await mission_worker_pool.stop()
+    await mission_job_runner.stop()
+    await mission_scheduler.stop()
+    blocking_executor.shutdown()
+
+@app.on_event("shutdown")
+async def flush_database_buffers():
+    """Drain the write-behind queue so buffered progress and log rows are not lost"""
+    await async_db_manager.dispose()
 
 # Core endpoints
 @app.get("/health")
@@ -183,7 +150,7 @@ async def generate_ai_response(request: AIRequest):
     logger.info("API COGNITIVE: AI generation requested")
     try:
         # Use the cognitive forge engine for real AI generation
-        response = cognitive_forge_engine.llm.invoke(request.prompt)
+        response = await asyncio.wait_for(cognitive_forge_engine.llm.ainvoke(request.prompt), settings.LLM_CALL_TIMEOUT)
         
         return AIResponse(
             response=response.content,
@@ -216,7 +183,7 @@ async def analyze_code_endpoint(request: CodeAnalysisRequest):
         """
         
         # Use the cognitive forge engine
-        response = cognitive_forge_engine.llm.invoke(prompt)
+        response = await asyncio.wait_for(cognitive_forge_engine.llm.ainvoke(prompt), settings.LLM_CALL_TIMEOUT)
         
         # Parse the response for structured analysis
         analysis = response.content
@@ -236,7 +203,7 @@ async def chat_with_ai(request: AIRequest):
     """Chat with AI"""
     logger.info("API COGNITIVE: Chat requested")
     try:
-        response = cognitive_forge_engine.llm.invoke(request.prompt)
+        response = await asyncio.wait_for(cognitive_forge_engine.llm.ainvoke(request.prompt), settings.LLM_CALL_TIMEOUT)
         
         return AIResponse(
             response=response.content,
@@ -309,6 +276,25 @@ async def cognitive_process():
         "timestamp": datetime.utcnow().isoformat()
     }
 
+@app.get("/api/db/write-buffer/metrics")
+async def write_buffer_metrics():
+    """Queue depth and flush latency of the database write-behind buffer"""
+    return {
+        **db_manager.write_buffer.get_metrics(),
+        "server": "8002",
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@app.get("/api/db/retention")
+async def retention_status():
+    """Summary of the most recent retention/archival pass"""
+    return {
+        "enabled": settings.RETENTION_ENABLED,
+        "interval_seconds": settings.RETENTION_INTERVAL,
+        "last_run": retention_manager.last_run,
+        "server": "8002"
+    }
+
 # --- Real-Time Streaming Endpoints ---
 # REMOVED: This endpoint is now handled by the unified Event Bus in main.py
 # @app.get("/api/events/stream")
@@ -344,7 +330,7 @@ async def get_live_logs():
         cognitive_logs = []
         system_logs = []
         
-        for log_entry in cognitive_log_buffer[-100:]:
+        for log_entry in cognitive_log_buffer.latest(100):
             source = log_entry.get("source", "system")
             if source == "http_request":
                 http_logs.append(log_entry)
@@ -393,19 +379,54 @@ async def get_live_logs():
         return {"error": str(e), "server": "8002"}
 
 @app.get("/api/logs/history")
-async def get_log_history(limit: int = 100):
-    """Get recent log history"""
+async def get_log_history(limit: int = 100, after: Optional[int] = None,
+                          level: Optional[str] = None, source: Optional[str] = None):
+    """Get recent log history; pass ?after=<last id> to page forward from a cursor"""
+    entry_filter = LogFilter.from_params(level, source)
+    limit = min(max(limit, 1), cognitive_log_buffer.capacity)
+    if after is not None:
+        logs, cursor, missed = cognitive_log_buffer.since(after, limit, entry_filter)
+    else:
+        logs, cursor, missed = cognitive_log_buffer.latest(limit, entry_filter), cognitive_log_buffer.last_seq, 0
     return {
-        "logs": cognitive_log_buffer[-limit:],
+        "logs": logs,
         "total_logs": len(cognitive_log_buffer),
+        "cursor": cursor,
+        "missed": missed,
         "server_time": datetime.utcnow().isoformat(),
         "server": "8002"
     }
 
+@app.get("/api/logs/stream")
+async def stream_logs(request: Request, level: Optional[str] = None, source: Optional[str] = None,
+                      last_event_id: Optional[int] = None):
+    """Server-sent log stream; reconnecting clients resume from the Last-Event-ID header"""
+    header = request.headers.get("last-event-id")
+    if header and header.isdigit():
+        last_event_id = int(header)
+    subscription = cognitive_log_buffer.subscribe(
+        last_event_id=last_event_id, entry_filter=LogFilter.from_params(level, source), heartbeat=15
+    )
+
+    async def event_generator():
+        try:
+            async for kind, payload in subscription:
+                if kind == "logs":
+                    # One write per coalesced batch; the id lets the browser resume after a reconnect
+                    yield "".join(f"id: {e['id']}\ndata: {json.dumps(e, default=str)}\n\n" for e in payload)
+                elif kind == "gap":
+                    yield f"event: gap\ndata: {json.dumps({'missed': payload})}\n\n"
+                else:
+                    yield ": keep-alive\n\n"
+        finally:
+            await subscription.aclose()
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.get("/api/logs/clear")
 async def clear_logs():
     """Clear the log buffer"""
-    global cognitive_log_buffer
     cognitive_log_buffer.clear()
     logger.info("API COGNITIVE: Log buffer cleared")
     return {"message": "Log buffer cleared", "timestamp": datetime.utcnow().isoformat(), "server": "8002"}
@@ -423,64 +444,197 @@ async def generate_cognitive_activity():
                 "source": "cognitive_worker",
                 "server_port": "8002"
             }
-            cognitive_log_buffer.append(log_entry)
-            if len(cognitive_log_buffer) > 200:
-                cognitive_log_buffer.pop(0)
-            
-            # Add to queue for real-time streaming
-            try:
-                await cognitive_log_queue.put(log_entry)
-            except Exception:
-                pass
+            _push_log_entry(log_entry)
                 
         except Exception as e:
             logger.error(f"Error in cognitive activity generation: {e}")
 
 # Mission execution endpoints
-@app.post("/mission/execute")
-async def execute_mission(mission_data: Dict[str, Any]):
-    """Execute a mission using the Cognitive Forge Engine"""
+async def _resolve_priority(mission_id: str, requested: Optional[str]) -> Optional[str]:
+    """Explicit request priority wins; otherwise use the stored Mission.priority"""
+    if requested:
+        return requested
+    mission = await async_db_manager.get_mission(mission_id)
+    return mission.priority if mission else None
+
+async def _run_mission(mission_id: str, prompt: str, agent_type: str):
+    result = await cognitive_forge_engine.run_mission(prompt, mission_id, agent_type, False)
+    await asyncio.to_thread(result_store.put, mission_id, "completed", result)
+    logger.info(f"ENGINE: Mission {mission_id} completed successfully")
+    return result
+
+def _record_mission_outcome(mission_id: str, future: asyncio.Future):
+    """Store failed, timed-out and cancelled outcomes; successes are recorded by _run_mission"""
+    if future.cancelled():
+        error = "Mission was cancelled"
+    elif future.exception() is not None:
+        exc = future.exception()
+        error = str(exc) or type(exc).__name__
+    else:
+        return
+    logger.error(f"ENGINE: Mission {mission_id} failed: {error}")
+    asyncio.create_task(asyncio.to_thread(result_store.put, mission_id, "failed", None, error))
+    # Cancellation/timeout interrupts run_mission before it can mark the row itself
+    asyncio.create_task(async_db_manager.update_mission_status(mission_id, "failed", error_message=error))
+
+async def _submit_mission(mission_id: str, prompt: str, agent_type: str, priority: Optional[str] = None):
+    """Admit a mission to the scheduler, mapping a full or stopped queue to 429/503"""
+    priority = await _resolve_priority(mission_id, priority)
     try:
-        mission_id = mission_data.get("mission_id", f"mission_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}")
-        prompt = mission_data.get("prompt", "")
-        agent_type = mission_data.get("agent_type", "developer")
-        
-        logger.info(f"ENGINE: Starting mission execution for {mission_id}")
-        
-        # Use the cognitive forge engine to run the mission
-        def update_callback(message: str):
-            logger.info(f"ENGINE: Mission {mission_id} - {message}")
-        
-        # Run the mission (await async)
-        result = await cognitive_forge_engine.run_mission(
-            prompt, mission_id, agent_type, False
+        ticket = mission_scheduler.submit(
+            mission_id, lambda: _run_mission(mission_id, prompt, agent_type), priority=priority
         )
-        
-        mission_results[mission_id] = {
-            "status": "completed",
-            "result": result,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
+    except SchedulerError as e:
+        logger.warning(f"ENGINE: Mission {mission_id} rejected: {e}")
+        headers = {"Retry-After": "30"} if e.status_code in (429, 503) else None
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=headers)
+    ticket.future.add_done_callback(lambda f: _record_mission_outcome(mission_id, f))
+    return ticket
+
+async def _enqueue_mission_job(mission_id: str, prompt: str, agent_type: str, priority: Optional[str] = None):
+    """Persist a mission as a durable job for whichever worker claims it first"""
+    priority = await _resolve_priority(mission_id, priority)
+    try:
+        job, created = await asyncio.to_thread(
+            job_queue.enqueue, mission_id, prompt, agent_type, priority_rank(priority)
+        )
+    except JobQueueFullError as e:
+        logger.warning(f"ENGINE: Mission {mission_id} rejected: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": "30"})
+    mission_job_runner.notify()
+    return job, created
+
+async def _await_job_result(mission_id: str) -> Dict[str, Any]:
+    """Poll the result store until a worker process records the mission's outcome"""
+    deadline = time.monotonic() + settings.MISSION_TIMEOUT + settings.JOB_LEASE_SECONDS
+    delay = 0.25
+    while time.monotonic() < deadline:
+        stored = await asyncio.to_thread(result_store.get, mission_id)
+        if stored is not None:
+            return stored
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 2.0)
+    raise HTTPException(status_code=504, detail="Mission execution timed out")
+
+@app.post("/mission/execute")
+async def execute_mission(mission_data: Dict[str, Any]):
+    """Execute a mission using the Cognitive Forge Engine (waits for a worker slot)"""
+    mission_id = mission_data.get("mission_id", f"mission_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}")
+    prompt = mission_data.get("prompt", "")
+    agent_type = mission_data.get("agent_type", "developer")
+
+    if mission_worker_pool.enabled:
+        logger.info(f"ENGINE: Dispatching mission {mission_id} to the worker pool")
+        await asyncio.to_thread(result_store.delete, mission_id)  # do not return a previous run's outcome
+        await _enqueue_mission_job(mission_id, prompt, agent_type, mission_data.get("priority"))
+        outcome = await _await_job_result(mission_id)
+        if outcome["status"] == "cancelled":
+            raise HTTPException(status_code=409, detail="Mission was cancelled")
+        if outcome["status"] != "completed":
+            raise HTTPException(status_code=500, detail=f"Mission execution failed: {outcome['error']}")
         return {
             "mission_id": mission_id,
             "status": "completed",
-            "result": result,
+            "result": outcome["result"],
             "message": "Mission executed successfully"
         }
-        
+
+    logger.info(f"ENGINE: Queuing mission execution for {mission_id}")
+    ticket = await _submit_mission(mission_id, prompt, agent_type, mission_data.get("priority"))
+
+    try:
+        # shield: a dropped client connection must not cancel the scheduled mission
+        result = await asyncio.shield(ticket.future)
+    except asyncio.TimeoutError as e:
+        raise HTTPException(status_code=504, detail=f"Mission execution timed out: {str(e)}")
+    except asyncio.CancelledError:
+        if not ticket.future.cancelled():
+            raise
+        raise HTTPException(status_code=409, detail="Mission was cancelled")
     except Exception as e:
         logger.error(f"Error executing mission: {e}")
         raise HTTPException(status_code=500, detail=f"Mission execution failed: {str(e)}")
 
+    return {
+        "mission_id": mission_id,
+        "status": "completed",
+        "result": result,
+        "message": "Mission executed successfully"
+    }
+
+@app.post("/mission/cancel/{mission_id}")
+async def cancel_mission(mission_id: str):
+    """Cancel a queued (or running) mission, including durable jobs owned by other worker processes"""
+    previous = mission_scheduler.cancel(mission_id)
+    job_previous = await asyncio.to_thread(job_queue.cancel, mission_id)
+    previous = previous or job_previous
+    if previous is None:
+        raise HTTPException(status_code=404, detail="Mission is not queued or running")
+    logger.info(f"ENGINE: Mission {mission_id} cancelled while {previous}")
+    return {"mission_id": mission_id, "cancelled": True, "previous_state": previous}
+
+@app.get("/api/missions/scheduler")
+async def scheduler_status():
+    """Worker slot occupancy, queue depth and outcome counters of the mission scheduler"""
+    return {
+        **mission_scheduler.get_stats(),
+        "job_queue": await asyncio.to_thread(job_queue.get_stats),
+        "job_worker": mission_job_runner.get_stats(),
+        "worker_pool": mission_worker_pool.get_stats(),
+        "blocking_executor": blocking_executor.get_stats(),
+        "server": "8002",
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@app.get("/missions")
+async def list_missions(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    owner_id: Optional[int] = None,
+    organization_id: Optional[int] = None,
+    fields: Optional[str] = None
+):
+    """Keyset-paginated mission listing; pass next_cursor back as ?cursor= for the next page"""
+    columns = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        return await async_db_manager.list_missions_page(
+            limit=min(max(limit, 1), 500),
+            cursor=cursor,
+            columns=columns,
+            status=status,
+            owner_id=owner_id,
+            organization_id=organization_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/mission/result/{mission_id}")
 async def get_mission_result(mission_id: str):
     """Get the result of a completed mission"""
-    if mission_id in mission_results:
-        return mission_results[mission_id]
+    ticket = mission_scheduler.get_ticket(mission_id)
+    if ticket is not None:
+        return {
+            "mission_id": mission_id,
+            "status": ticket.state,
+            "queue_position": mission_scheduler.position(mission_id),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    job = await asyncio.to_thread(job_queue.get, mission_id)
+    if job is not None and job["status"] in ("queued", "leased"):
+        return {
+            "mission_id": mission_id,
+            "status": "running" if job["status"] == "leased" else "queued",
+            "attempts": job["attempts"],
+            "queue_position": await asyncio.to_thread(job_queue.position, mission_id),
+            "timestamp": job["updated_at"]
+        }
+    stored = await asyncio.to_thread(result_store.get, mission_id)
+    if stored is not None:
+        return stored
     else:
         # Try to get from database
-        mission = db_manager.get_mission(mission_id)
+        mission = await async_db_manager.get_mission(mission_id)
         if mission:
             return {
                 "mission_id": mission_id,
@@ -499,39 +653,14 @@ async def execute_mission_legacy(plan: Dict):
     mission_id = plan.get("mission_id")
     if not mission_id:
         return {"error": "mission_id is required in the plan"}
-    
-    # Start execution as background task
-    asyncio.create_task(run_mission_background(mission_id, plan))
-    return {"message": f"Execution started for mission {mission_id}."}
 
-async def run_mission_background(mission_id: str, plan: Dict):
-    """Execute mission in background"""
-    try:
-        logger.info(f"ENGINE: Starting background execution for mission {mission_id}")
-        
-        # Extract prompt from plan
-        prompt = plan.get("prompt", "Execute the mission plan")
-        
-        def update_callback(message: str):
-            logger.info(f"ENGINE: Background mission {mission_id} - {message}")
-        
-        # Run the mission
-        result = await cognitive_forge_engine.run_mission(
-            prompt, mission_id, "developer", False
-        )
-        
-        mission_results[mission_id] = {
-            "status": "completed",
-            "result": result,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        logger.info(f"ENGINE: Background mission {mission_id} completed successfully")
-        
-    except Exception as e:
-        logger.error(f"ENGINE: Background mission {mission_id} failed: {e}")
-        mission_results[mission_id] = {
-            "status": "failed",
-            "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
-        } 
\ No newline at end of file
+    # Persisted as a job so a crash or redeploy does not lose it; any worker process may run it
+    job, created = await _enqueue_mission_job(
+        mission_id, plan.get("prompt", "Execute the mission plan"), "developer", plan.get("priority")
+    )
+    return {
+        "message": f"Execution started for mission {mission_id}." if created
+        else f"Mission {mission_id} is already {job['status']}.",
+        "job_status": job["status"],
+        "queue_position": await asyncio.to_thread(job_queue.position, mission_id)
+    }
@@ -68,18 +68,38 @@ class Settings(BaseSettings):
     # Machine learning configuration
     ML_MODEL_UPDATE_INTERVAL: int = 3600  # 1 hour
     MIN_TRAINING_SAMPLES: int = 50
+    PREDICTOR_HASH_DIM: int = 32  # hashed prompt features for the latency/success model
+    PREDICTOR_FORGETTING: float = 0.999  # RLS forgetting factor (~1000-execution memory)
+    PREDICTOR_CONFIDENCE_Z: float = 1.96  # 95% intervals
     
     # Predictive caching
     CACHE_SIZE_LIMIT: int = 1000
     CACHE_TTL: int = 3600  # 1 hour
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64 MB
+    CACHE_SWEEP_INTERVAL: int = 60
+    
+    # Semantic (similarity) decision cache
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.9  # cosine similarity
+    SEMANTIC_CACHE_SIZE: int = 1000
+    SEMANTIC_CACHE_DIM: int = 1024
+    SEMANTIC_CACHE_AUDIT_RATE: float = 0.05
     
     # Advanced analytics
     ANALYTICS_SAMPLE_RATE: float = 0.1  # 10% of requests
-    PERFORMANCE_METRICS_RETENTION: int = 86400  # 24 hours
+    PERFORMANCE_REHYDRATE_WINDOW: int = 1000  # metrics replayed per path on startup
+    PERFORMANCE_METRICS_MAX_ROWS: int = 10000  # per path; retention archives older rows (never below the rehydrate window)
+    ANALYTICS_TREND_BUCKET_SECONDS: int = 60
+    ANALYTICS_TREND_BUCKETS: int = 60  # one hour of per-minute trend points
     
     # Dynamic threshold adjustment
     THRESHOLD_UPDATE_INTERVAL: int = 1800  # 30 minutes
-    THRESHOLD_LEARNING_RATE: float = 0.1
+    THRESHOLD_LEARNING_RATE: float = 0.1  # trust-region radius for threshold/weight moves
+    TUNER_SUCCESS_FLOOR: float = 0.8
+    TUNER_WINDOW: int = 2000  # recent executions replayed per tuning pass
+    TUNER_CANDIDATES: int = 64
+    TUNER_PROBATION_SAMPLES: int = 20
+    TUNER_ROLLBACK_MARGIN: float = 0.05
     
     # --- SERVER CONFIGURATION ---
     HOST: str = Field(default="0.0.0.0", validation_alias="HOST")
@@ -142,12 +162,32 @@ class Settings(BaseSettings):
     # --- LOGGING & WORKSPACE ---
     LOGS_DIR: str = Field(default="logs", validation_alias="LOGS_DIR")
     WORKSPACE_PATH: str = Field(default=".", validation_alias="WORKSPACE_PATH")
+    LOG_STREAM_CAPACITY: int = Field(default=1000, validation_alias="LOG_STREAM_CAPACITY")  # live log ring buffer entries
 
     # --- MISSION CONFIGURATION ---
     MAX_CONCURRENT_MISSIONS: int = Field(default=5, validation_alias="MAX_CONCURRENT_MISSIONS")
     MISSION_TIMEOUT: int = Field(default=3600, validation_alias="MISSION_TIMEOUT")
+    MISSION_QUEUE_SIZE: int = Field(default=50, validation_alias="MISSION_QUEUE_SIZE")  # waiting beyond the running slots
+    BLOCKING_EXECUTOR_WORKERS: int = Field(default=8, validation_alias="BLOCKING_EXECUTOR_WORKERS")  # threads for sync agent/LLM calls
+    LLM_CALL_TIMEOUT: int = Field(default=300, validation_alias="LLM_CALL_TIMEOUT")
     MEMORY_RETENTION_DAYS: int = Field(default=30, validation_alias="MEMORY_RETENTION_DAYS")
 
+    # --- DURABLE JOB QUEUE ---
+    JOB_WORKER_IN_PROCESS: bool = Field(default=True, validation_alias="JOB_WORKER_IN_PROCESS")  # API process also claims jobs
+    MISSION_WORKER_PROCESSES: int = Field(default=0, validation_alias="MISSION_WORKER_PROCESSES")  # >0: missions run in worker processes
+    JOB_QUEUE_MAX_PENDING: int = Field(default=500, validation_alias="JOB_QUEUE_MAX_PENDING")
+    JOB_LEASE_SECONDS: int = Field(default=60, validation_alias="JOB_LEASE_SECONDS")
+    JOB_HEARTBEAT_INTERVAL: int = Field(default=15, validation_alias="JOB_HEARTBEAT_INTERVAL")
+    JOB_MAX_ATTEMPTS: int = Field(default=3, validation_alias="JOB_MAX_ATTEMPTS")
+    JOB_POLL_INTERVAL: float = Field(default=1.0, validation_alias="JOB_POLL_INTERVAL")
+    MISSION_RESULT_TTL: int = Field(default=86400, validation_alias="MISSION_RESULT_TTL")  # 24 hours
+
+    # --- RETENTION & ARCHIVAL ---
+    RETENTION_ENABLED: bool = Field(default=True, validation_alias="RETENTION_ENABLED")
+    RETENTION_INTERVAL: int = Field(default=21600, validation_alias="RETENTION_INTERVAL")  # 6 hours
+    RETENTION_BATCH_SIZE: int = Field(default=1000, validation_alias="RETENTION_BATCH_SIZE")
+    ARCHIVE_DIR: str = Field(default="db/archive", validation_alias="ARCHIVE_DIR")
+
     # --- NETWORKING ---
     DESKTOP_TUNNEL_URL: Optional[str] = Field(default=None, validation_alias="DESKTOP_TUNNEL_URL")
 
@@ -186,6 +226,8 @@ class Settings(BaseSettings):
     WEBSOCKET_PING_TIMEOUT: int = 10
     MAX_WEBSOCKET_CONNECTIONS: int = 100
     WEBSOCKET_BUFFER_SIZE: int = 1024 * 64  # 64KB
+    WEBSOCKET_FANOUT_BUS: str = Field(default="inprocess", validation_alias="WEBSOCKET_FANOUT_BUS")  # "socket" shares broadcasts across processes
+    WEBSOCKET_FANOUT_PORT: int = Field(default=8765, validation_alias="WEBSOCKET_FANOUT_PORT")  # loopback port of the socket bus hub
     
     # --- CORS CONFIGURATION ---
     ALLOW_ORIGINS: List[str] = ["*"]
@@ -24,7 +24,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Import core modules using absolute imports
 from config.settings import settings
 from utils.google_ai_wrapper import create_google_ai_llm, direct_inference, google_ai_wrapper
-from models.advanced_database import db_manager
+from models.advanced_database import db_manager, async_db_manager
 from utils.agent_observability import agent_observability, LiveStreamEvent
 from utils.guardian_protocol import GuardianProtocol
 from utils.self_learning_module import SelfLearningModule
@@ -74,6 +74,7 @@ class CognitiveForgeEngine:
             raise
 
         self.db_manager = db_manager
+        self.async_db_manager = async_db_manager
         self.guardian_protocol = GuardianProtocol(self.llm)
         self.self_learning_module = SelfLearningModule(self.llm, self.db_manager)
 
@@ -82,211 +83,211 @@ class CognitiveForgeEngine:
         self, user_prompt: str, mission_id_str: str, agent_type: str, is_healing_attempt: bool = False
     ) -> Dict[str, Any]:
         transaction = start_transaction(f"mission_execution_{mission_id_str}", "mission")
-        try:
-            if not is_healing_attempt:
-                self.db_manager.update_mission_status(mission_id_str=mission_id_str, status="running", progress=5)
-                agent_observability.push_event(LiveStreamEvent(
-                    event_type="mission_update",
-                    source="mission_control",
-                    severity="INFO",
-                    message=f"Mission '{mission_id_str}' initiated - deploying real AI agents.",
-                    payload=self.db_manager.get_mission(mission_id_str).as_dict()
-                ))
+        async with self.async_db_manager.mission_scope(mission_id_str) as mission:
+            try:
+                if not is_healing_attempt:
+                    await mission.update_status(status="running", progress=5)
+                    agent_observability.push_event(LiveStreamEvent(
+                        event_type="mission_update",
+                        source="mission_control",
+                        severity="INFO",
+                        message=f"Mission '{mission_id_str}' initiated - deploying real AI agents.",
+                        payload=mission.as_dict()
+                    ))
             
-            # First priority: Enhanced multi-agent system (disabled for simplified architecture)
-            if False:  # ENHANCED_MULTI_AGENT_AVAILABLE and EnhancedCognitiveForgeEngine:
-                logger.info(f"🚀 Using ENHANCED MULTI-AGENT SYSTEM for mission {mission_id_str}")
+                # First priority: Enhanced multi-agent system (disabled for simplified architecture)
+                if False:  # ENHANCED_MULTI_AGENT_AVAILABLE and EnhancedCognitiveForgeEngine:
+                    logger.info(f"🚀 Using ENHANCED MULTI-AGENT SYSTEM for mission {mission_id_str}")
                 
-                # Create enhanced cognitive forge engine if not already created
-                if not hasattr(self, '_enhanced_engine'):
-                    pass  # self._enhanced_engine = EnhancedCognitiveForgeEngine()
+                    # Create enhanced cognitive forge engine if not already created
+                    if not hasattr(self, '_enhanced_engine'):
+                        pass  # self._enhanced_engine = EnhancedCognitiveForgeEngine()
                 
-                agent_observability.push_event(LiveStreamEvent(
-                    event_type="enhanced_agent_deployment", 
-                    source="enhanced_multi_agent_system", 
-                    severity="INFO",
-                    message="Deploying enhanced multi-agent system for mission execution.",
-                    payload={"mission_id": mission_id_str, "phase": "Enhanced Multi-Agent Deployment"}
-                ))
-                self.db_manager.update_mission_status(mission_id_str=mission_id_str, status="running", progress=30)
+                    agent_observability.push_event(LiveStreamEvent(
+                        event_type="enhanced_agent_deployment", 
+                        source="enhanced_multi_agent_system", 
+                        severity="INFO",
+                        message="Deploying enhanced multi-agent system for mission execution.",
+                        payload={"mission_id": mission_id_str, "phase": "Enhanced Multi-Agent Deployment"}
+                    ))
+                    await mission.update_progress(30)
                 
-                # Execute using enhanced multi-agent system
-                logger.info(f"🤖 Deploying enhanced multi-agent workflow for mission {mission_id_str}: {user_prompt}")
-                enhanced_result = await self._enhanced_engine.run_mission(user_prompt, mission_id_str, agent_type)
+                    # Execute using enhanced multi-agent system
+                    logger.info(f"🤖 Deploying enhanced multi-agent workflow for mission {mission_id_str}: {user_prompt}")
+                    enhanced_result = await self._enhanced_engine.run_mission(user_prompt, mission_id_str, agent_type)
                 
-                self.db_manager.update_mission_status(mission_id_str=mission_id_str, status="running", progress=85)
+                    await mission.update_progress(85)
                 
-                # Process enhanced execution result
-                if enhanced_result.get("status") == "completed":
-                    final_result_text = (
-                        f"Mission '{mission_id_str}' completed successfully by enhanced multi-agent system. "
-                        f"Workflow pattern: {enhanced_result.get('summary', {}).get('workflow_pattern', 'standard')}. "
-                        f"Agents involved: {enhanced_result.get('summary', {}).get('agents_involved', 'multiple')}."
-                    )
-                    self.db_manager.update_mission_status(
-                        mission_id_str=mission_id_str, 
-                        status="completed", 
-                        progress=100, 
-                        result=final_result_text
-                    )
-                    agent_observability.push_event(LiveStreamEvent(
-                        event_type="mission_complete",
-                        source="enhanced_multi_agent_system",
-                        severity="SUCCESS", 
-                        message=final_result_text,
-                        payload={
-                            **self.db_manager.get_mission(mission_id_str).as_dict(),
-                            **enhanced_result
-                        }
-                    ))
-                    await self.self_learning_module.synthesize_and_learn(self.db_manager.get_mission(mission_id_str))
-                    return {"status": "completed", "enhanced_multi_agent": True, "result": enhanced_result}
-                else:
-                    # Enhanced execution failed, try fallback
-                    logger.warning(f"Enhanced multi-agent execution failed for {mission_id_str}, trying fallback")
-                    error_message = enhanced_result.get("error", "Enhanced multi-agent execution failed")
-                    agent_observability.push_event(LiveStreamEvent(
-                        event_type="enhanced_execution_fallback",
-                        source="enhanced_multi_agent_system",
-                        severity="WARNING", 
-                        message=f"Enhanced execution failed, falling back: {error_message}",
-                        payload=enhanced_result
-                    ))
+                    # Process enhanced execution result
+                    if enhanced_result.get("status") == "completed":
+                        final_result_text = (
+                            f"Mission '{mission_id_str}' completed successfully by enhanced multi-agent system. "
+                            f"Workflow pattern: {enhanced_result.get('summary', {}).get('workflow_pattern', 'standard')}. "
+                            f"Agents involved: {enhanced_result.get('summary', {}).get('agents_involved', 'multiple')}."
+                        )
+                        await mission.update_status(
+                            status="completed",
+                            progress=100,
+                            result=final_result_text
+                        )
+                        agent_observability.push_event(LiveStreamEvent(
+                            event_type="mission_complete",
+                            source="enhanced_multi_agent_system",
+                            severity="SUCCESS", 
+                            message=final_result_text,
+                            payload={
+                                **mission.as_dict(),
+                                **enhanced_result
+                            }
+                        ))
+                        await self.self_learning_module.synthesize_and_learn(mission.mission)
+                        return {"status": "completed", "enhanced_multi_agent": True, "result": enhanced_result}
+                    else:
+                        # Enhanced execution failed, try fallback
+                        logger.warning(f"Enhanced multi-agent execution failed for {mission_id_str}, trying fallback")
+                        error_message = enhanced_result.get("error", "Enhanced multi-agent execution failed")
+                        agent_observability.push_event(LiveStreamEvent(
+                            event_type="enhanced_execution_fallback",
+                            source="enhanced_multi_agent_system",
+                            severity="WARNING", 
+                            message=f"Enhanced execution failed, falling back: {error_message}",
+                            payload=enhanced_result
+                        ))
             
-            # Use REAL AGENT EXECUTION if available, otherwise fallback to simulation
-            elif REAL_EXECUTOR_AVAILABLE and RealMissionExecutor:
-                # REAL AGENT EXECUTION PATH
-                logger.info(f"🚀 Using REAL AGENT EXECUTION for mission {mission_id_str}")
+                # Use REAL AGENT EXECUTION if available, otherwise fallback to simulation
+                elif REAL_EXECUTOR_AVAILABLE and RealMissionExecutor:
+                    # REAL AGENT EXECUTION PATH
+                    logger.info(f"🚀 Using REAL AGENT EXECUTION for mission {mission_id_str}")
                 
-                # Create real mission executor
-                real_executor = RealMissionExecutor()
+                    # Create real mission executor
+                    real_executor = RealMissionExecutor()
                 
-                # Prepare mission data for real execution
-                mission_data = {
-                    'id': mission_id_str,
-                    'objective': user_prompt,
-                    'agent_type': agent_type,
-                    'complexity': 'medium',  # Could be derived from user_prompt analysis
-                    'metadata': {
-                        'is_healing_attempt': is_healing_attempt,
-                        'created_by': 'cognitive_forge_engine'
+                    # Prepare mission data for real execution
+                    mission_data = {
+                        'id': mission_id_str,
+                        'objective': user_prompt,
+                        'agent_type': agent_type,
+                        'complexity': 'medium',  # Could be derived from user_prompt analysis
+                        'metadata': {
+                            'is_healing_attempt': is_healing_attempt,
+                            'created_by': 'cognitive_forge_engine'
+                        }
                     }
-                }
                 
-                agent_observability.push_event(LiveStreamEvent(
-                    event_type="agent_deployment", 
-                    source="real_mission_executor", 
-                    severity="INFO",
-                    message="Deploying real CrewAI agents to complete mission.",
-                    payload={"mission_id": mission_id_str, "phase": "Real Agent Deployment"}
-                ))
-                self.db_manager.update_mission_status(mission_id_str=mission_id_str, status="running", progress=25)
+                    agent_observability.push_event(LiveStreamEvent(
+                        event_type="agent_deployment", 
+                        source="real_mission_executor", 
+                        severity="INFO",
+                        message="Deploying real CrewAI agents to complete mission.",
+                        payload={"mission_id": mission_id_str, "phase": "Real Agent Deployment"}
+                    ))
+                    await mission.update_progress(25)
                 
-                # Execute the mission using REAL AGENTS (not simulation)
-                logger.info(f"🤖 Deploying real AI agents for mission {mission_id_str}: {user_prompt}")
-                execution_result = await real_executor.execute_mission(mission_data)
+                    # Execute the mission using REAL AGENTS (not simulation)
+                    logger.info(f"🤖 Deploying real AI agents for mission {mission_id_str}: {user_prompt}")
+                    execution_result = await real_executor.execute_mission(mission_data)
                 
-                self.db_manager.update_mission_status(mission_id_str=mission_id_str, status="running", progress=75)
+                    await mission.update_progress(75)
                 
-                # Process the real execution result
-                if execution_result.get("success", False):
-                    final_result_text = (
-                        f"Mission '{mission_id_str}' completed successfully by real AI agents. "
-                        f"Real-world changes made: {execution_result.get('real_world_changes', False)}"
-                    )
-                    self.db_manager.update_mission_status(
-                        mission_id_str=mission_id_str, 
-                        status="completed", 
-                        progress=100, 
-                        result=final_result_text
-                    )
-                    agent_observability.push_event(LiveStreamEvent(
-                        event_type="mission_complete",
-                        source="mission_control",
-                        severity="SUCCESS", 
-                        message=final_result_text,
-                        payload={
-                            **self.db_manager.get_mission(mission_id_str).as_dict(),
-                            **execution_result
-                        }
-                    ))
-                    await self.self_learning_module.synthesize_and_learn(self.db_manager.get_mission(mission_id_str))
-                    return {"status": "completed", "real_execution": True, "result": execution_result}
-                else:
-                    # Real execution failed, this is a genuine failure
-                    error_message = execution_result.get("message", "Real agent execution failed")
-                    raise ValueError(f"Real agent execution failed: {error_message}")
+                    # Process the real execution result
+                    if execution_result.get("success", False):
+                        final_result_text = (
+                            f"Mission '{mission_id_str}' completed successfully by real AI agents. "
+                            f"Real-world changes made: {execution_result.get('real_world_changes', False)}"
+                        )
+                        await mission.update_status(
+                            status="completed",
+                            progress=100,
+                            result=final_result_text
+                        )
+                        agent_observability.push_event(LiveStreamEvent(
+                            event_type="mission_complete",
+                            source="mission_control",
+                            severity="SUCCESS", 
+                            message=final_result_text,
+                            payload={
+                                **mission.as_dict(),
+                                **execution_result
+                            }
+                        ))
+                        await self.self_learning_module.synthesize_and_learn(mission.mission)
+                        return {"status": "completed", "real_execution": True, "result": execution_result}
+                    else:
+                        # Real execution failed, this is a genuine failure
+                        error_message = execution_result.get("message", "Real agent execution failed")
+                        raise ValueError(f"Real agent execution failed: {error_message}")
                     
-            else:
-                # SIMULATION FALLBACK PATH (when real agents not available)
-                logger.warning(f"⚠️ Using SIMULATION MODE for mission {mission_id_str} - real agents not available")
+                else:
+                    # SIMULATION FALLBACK PATH (when real agents not available)
+                    logger.warning(f"⚠️ Using SIMULATION MODE for mission {mission_id_str} - real agents not available")
                 
-                await asyncio.sleep(2)
-                agent_observability.push_event(LiveStreamEvent(
-                    event_type="agent_action", source="Simulated Agent", severity="WARNING",
-                    message="Using simulation mode - real agents not available.",
-                    payload={"mission_id": mission_id_str, "phase": "Simulation Fallback"}
-                ))
-                self.db_manager.update_mission_status(mission_id_str=mission_id_str, status="running", progress=25)
+                    await asyncio.sleep(2)
+                    agent_observability.push_event(LiveStreamEvent(
+                        event_type="agent_action", source="Simulated Agent", severity="WARNING",
+                        message="Using simulation mode - real agents not available.",
+                        payload={"mission_id": mission_id_str, "phase": "Simulation Fallback"}
+                    ))
+                    await mission.update_progress(25)
                 
-                await asyncio.sleep(3)
-                agent_observability.push_event(LiveStreamEvent(
-                    event_type="agent_action", source="Simulated Planner", severity="WARNING",
-                    message="Simulating task planning and execution.",
-                    payload={"mission_id": mission_id_str, "phase": "Simulated Planning"}
-                ))
-                self.db_manager.update_mission_status(mission_id_str=mission_id_str, status="running", progress=50)
+                    await asyncio.sleep(3)
+                    agent_observability.push_event(LiveStreamEvent(
+                        event_type="agent_action", source="Simulated Planner", severity="WARNING",
+                        message="Simulating task planning and execution.",
+                        payload={"mission_id": mission_id_str, "phase": "Simulated Planning"}
+                    ))
+                    await mission.update_progress(50)
 
-                if not is_healing_attempt and random.random() < 0.3:
-                    raise ValueError("Simulated failure: Critical component 'CodeGenerator' failed.")
+                    if not is_healing_attempt and random.random() < 0.3:
+                        raise ValueError("Simulated failure: Critical component 'CodeGenerator' failed.")
 
-                await asyncio.sleep(4)
-                agent_observability.push_event(LiveStreamEvent(
-                    event_type="agent_action", source="Simulated Executor", severity="WARNING",
-                    message="Simulating task execution - no real changes made.",
-                    payload={"mission_id": mission_id_str, "phase": "Simulated Execution"}
-                ))
-                self.db_manager.update_mission_status(mission_id_str=mission_id_str, status="running", progress=75)
+                    await asyncio.sleep(4)
+                    agent_observability.push_event(LiveStreamEvent(
+                        event_type="agent_action", source="Simulated Executor", severity="WARNING",
+                        message="Simulating task execution - no real changes made.",
+                        payload={"mission_id": mission_id_str, "phase": "Simulated Execution"}
+                    ))
+                    await mission.update_progress(75)
 
-                await asyncio.sleep(2)
-                final_result_text = f"Mission '{mission_id_str}' completed in SIMULATION MODE - no real changes made."
-                self.db_manager.update_mission_status(mission_id_str=mission_id_str, status="completed", progress=100, result=final_result_text)
-                agent_observability.push_event(LiveStreamEvent(
-                    event_type="mission_complete",
-                    source="mission_control",
-                    severity="WARNING",
-                    message=final_result_text,
-                    payload=self.db_manager.get_mission(mission_id_str).as_dict()
-                ))
-                await self.self_learning_module.synthesize_and_learn(self.db_manager.get_mission(mission_id_str))
-                return {"status": "completed", "real_execution": False, "simulation_mode": True}
-        except Exception as e:
-            error_message = str(e)
-            logger.error(f"Mission {mission_id_str} failed: {error_message}")
-            self.db_manager.update_mission_status(mission_id_str=mission_id_str, status="failed", error_message=error_message)
-            agent_observability.push_event(LiveStreamEvent(
-                event_type="mission_error", source="mission_control", severity="ERROR",
-                message=f"Mission '{mission_id_str}' failed: {error_message}",
-                payload=self.db_manager.get_mission(mission_id_str).as_dict()
-            ))
-            retries = self.db_manager.increment_phoenix_retry(mission_id_str)
-            if retries <= 2:
-                logger.warning(f"🔥 Phoenix Protocol: Activating self-healing for mission {mission_id_str}. Attempt #{retries}.")
-                self.db_manager.update_mission_status(mission_id_str=mission_id_str, status="healing", is_healing=True)
+                    await asyncio.sleep(2)
+                    final_result_text = f"Mission '{mission_id_str}' completed in SIMULATION MODE - no real changes made."
+                    await mission.update_status(status="completed", progress=100, result=final_result_text)
+                    agent_observability.push_event(LiveStreamEvent(
+                        event_type="mission_complete",
+                        source="mission_control",
+                        severity="WARNING",
+                        message=final_result_text,
+                        payload=mission.as_dict()
+                    ))
+                    await self.self_learning_module.synthesize_and_learn(mission.mission)
+                    return {"status": "completed", "real_execution": False, "simulation_mode": True}
+            except Exception as e:
+                error_message = str(e)
+                logger.error(f"Mission {mission_id_str} failed: {error_message}")
+                await mission.rollback()
+                await mission.update_status(status="failed", error_message=error_message)
                 agent_observability.push_event(LiveStreamEvent(
-                    event_type="mission_update", source="phoenix_protocol", severity="WARNING",
-                    message=f"Phoenix Protocol initiating self-healing for mission {mission_id_str}.",
-                    payload=self.db_manager.get_mission(mission_id_str).as_dict()
+                    event_type="mission_error", source="mission_control", severity="ERROR",
+                    message=f"Mission '{mission_id_str}' failed: {error_message}",
+                    payload=mission.as_dict()
                 ))
-                await asyncio.sleep(2)
-                healed_prompt = f"Original prompt failed due to '{error_message}'. Please re-attempt the task with a focus on robustness and error handling. Original prompt: {user_prompt}"
-                logger.info(f"Phoenix Protocol: Rerunning mission with modified prompt.")
-                await self.run_mission(healed_prompt, mission_id_str, agent_type, is_healing_attempt=True)
-            else:
-                logger.error(f"Mission {mission_id_str} failed permanently after {retries} healing attempts.")
-        finally:
-            if transaction:
-                transaction.finish()
+                retries = await mission.increment_phoenix_retry()
+                if retries <= 2:
+                    logger.warning(f"🔥 Phoenix Protocol: Activating self-healing for mission {mission_id_str}. Attempt #{retries}.")
+                    await mission.update_status(status="healing", is_healing=True)
+                    agent_observability.push_event(LiveStreamEvent(
+                        event_type="mission_update", source="phoenix_protocol", severity="WARNING",
+                        message=f"Phoenix Protocol initiating self-healing for mission {mission_id_str}.",
+                        payload=mission.as_dict()
+                    ))
+                    await asyncio.sleep(2)
+                    healed_prompt = f"Original prompt failed due to '{error_message}'. Please re-attempt the task with a focus on robustness and error handling. Original prompt: {user_prompt}"
+                    logger.info(f"Phoenix Protocol: Rerunning mission with modified prompt.")
+                    await self.run_mission(healed_prompt, mission_id_str, agent_type, is_healing_attempt=True)
+                else:
+                    logger.error(f"Mission {mission_id_str} failed permanently after {retries} healing attempts.")
+            finally:
+                if transaction:
+                    transaction.finish()
 
     async def run_periodic_self_optimization(self):
         """Enhanced periodic self-optimization using multi-agent analysis"""
@@ -15,12 +15,16 @@ try:
     from ..agents.executable_agent import ExecutableAgents
     from ..utils.agent_observability import agent_observability, LiveStreamEvent
     from ..utils.google_ai_wrapper import get_crewai_llm # Import the function instead of variable
+    from ..utils.blocking_executor import blocking_executor, raise_if_cancelled
+    from ..config.settings import settings
 except ImportError as e:
     # Fallback for when module is imported from outside the package
     try:
         from src.agents.executable_agent import ExecutableAgents
         from src.utils.agent_observability import agent_observability, LiveStreamEvent
         from src.utils.google_ai_wrapper import get_crewai_llm
+        from src.utils.blocking_executor import blocking_executor, raise_if_cancelled
+        from src.config.settings import settings
     except ImportError:
         logger.error(f"Failed to import required modules: {e}")
         raise ImportError("Could not import ExecutableAgents and related components")
@@ -95,13 +99,14 @@ class ExecutionWorkflow:
                 tasks=[planning_task, execution_task],
                 verbose=True,
                 process=Process.sequential,
-                manager_llm=crewai_llm # Use the same LLM for the manager
+                manager_llm=crewai_llm, # Use the same LLM for the manager
+                task_callback=raise_if_cancelled # Stop between tasks once the mission timed out or was cancelled
             )
 
             self._broadcast_workflow_event("crew_executing", "CrewAI agents are now executing the mission.")
             
-            # The result of the crew's work
-            result = crew.kickoff()
+            # The result of the crew's work; kickoff() blocks, so it runs on the bounded executor
+            result = await blocking_executor.run(crew.kickoff, timeout=settings.MISSION_TIMEOUT, name="crew.kickoff")
 
             workflow_result = {
                 "success": True,
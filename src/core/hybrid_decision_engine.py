@@ -6,11 +6,16 @@ Advanced AI-powered decision making for optimal execution path selection
 import json
 import time
 import hashlib
+import math
+import random
+import re
+import zlib
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 import numpy as np
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict
+from contextlib import nullcontext
 import threading
 import pickle
 import os
@@ -19,8 +24,28 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ..config.settings import settings
+from ..utils.keyword_matcher import keyword_matcher
 from loguru import logger
 
+try:
+    from ..models.advanced_database import db_manager
+except ImportError:
+    db_manager = None
+
+# Context indicators for TaskComplexityAnalyzer._analyze_context
+CONTEXT_INDICATORS = [
+    "system", "architecture", "design", "framework",
+    "database", "api", "integration", "deployment",
+    "scalability", "performance", "security", "testing"
+]
+
+# Keywords that route a moderately complex prompt to the full workflow
+ROUTING_COMPLEX_KEYWORDS = [
+    "design", "architecture", "system", "complex", "advanced",
+    "algorithm", "optimization", "machine learning", "neural network",
+    "database", "api", "framework", "microservice", "distributed"
+]
+
 @dataclass
 class TaskComplexity:
     """Task complexity analysis result"""
@@ -39,6 +64,11 @@ class PerformancePrediction:
     golden_path_success_rate: float
     full_workflow_success_rate: float
     confidence: float
+    golden_path_time_interval: Tuple[float, float] = (0.0, 0.0)
+    full_workflow_time_interval: Tuple[float, float] = (0.0, 0.0)
+    golden_path_success_interval: Tuple[float, float] = (0.0, 1.0)
+    full_workflow_success_interval: Tuple[float, float] = (0.0, 1.0)
+    model: str = "ewma"
 
 @dataclass
 class UserPreferences:
@@ -50,101 +80,524 @@ class UserPreferences:
     satisfaction_history: List[float]
     last_updated: datetime
 
+@dataclass
+class RoutingConfig:
+    """Switch threshold and decision-score weights used to route one tenant"""
+    threshold: float
+    complexity_weight: float
+    performance_weight: float
+    user_preference_weight: float
+    
+    @classmethod
+    def from_settings(cls) -> "RoutingConfig":
+        return cls(
+            threshold=settings.HYBRID_SWITCH_THRESHOLD,
+            complexity_weight=settings.COMPLEXITY_WEIGHT,
+            performance_weight=settings.PERFORMANCE_WEIGHT,
+            user_preference_weight=settings.USER_PREFERENCE_WEIGHT
+        )
+    
+    @property
+    def weights(self) -> np.ndarray:
+        return np.array([self.complexity_weight, self.performance_weight, self.user_preference_weight])
+
+def tenant_of(task_id: Optional[str]) -> str:
+    """Tenant/user key encoded as the task id prefix (``<user>_<n>``)"""
+    return task_id.split('_')[0] if task_id and '_' in task_id else "default"
+
 class PredictiveCache:
-    """Intelligent caching system for task results"""
+    """Intelligent caching system for task results.
+
+    TTL-LRU on an ``OrderedDict`` kept in access order: get/set/evict are O(1),
+    the least recently used entry is always first and, since TTL is measured from
+    the last access, expired entries are always a prefix of the ordering.
+    """
     
-    def __init__(self):
-        self.cache = {}
-        self.access_times = {}
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        self.cache: "OrderedDict[str, Tuple[Dict[str, Any], float, int, str]]" = OrderedDict()
         self.hit_count = defaultdict(int)
         self.miss_count = defaultdict(int)
-        self.max_size = settings.CACHE_SIZE_LIMIT
-        self.ttl = settings.CACHE_TTL
+        self.eviction_count = defaultdict(int)
+        self.expiration_count = defaultdict(int)
+        self.max_size = max_size or settings.CACHE_SIZE_LIMIT
+        self.ttl = ttl or settings.CACHE_TTL
+        self.max_bytes = max_bytes or settings.CACHE_MAX_BYTES
+        self.current_bytes = 0
+        self._lock = nullcontext()
         
-    def _generate_cache_key(self, prompt: str, path: str) -> str:
-        """Generate cache key for task"""
-        content = f"{prompt.lower().strip()}:{path}"
+    def _generate_cache_key(self, prompt: str, path: str, scope: str = "") -> str:
+        """Generate cache key for task; ``scope`` (e.g. tenant and config version) is kept verbatim"""
+        content = f"{scope}\x00{prompt.lower().strip()}:{path}"
         return hashlib.md5(content.encode()).hexdigest()
     
-    def get(self, prompt: str, path: str) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _sizeof(result: Dict[str, Any]) -> int:
+        """Approximate entry size as its pickled length"""
+        try:
+            return len(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return sys.getsizeof(result)
+    
+    def get(self, prompt: str, path: str, scope: str = "") -> Optional[Dict[str, Any]]:
         """Get cached result if available"""
-        key = self._generate_cache_key(prompt, path)
+        key = self._generate_cache_key(prompt, path, scope)
         
-        if key in self.cache:
-            result = self.cache[key]
-            access_time = self.access_times[key]
-            
-            # Check TTL
-            if time.time() - access_time < self.ttl:
-                self.access_times[key] = time.time()
-                self.hit_count[path] += 1
-                logger.info(f"🔄 Cache HIT for {path}: {key[:8]}...")
-                return result
-            else:
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                result, accessed_at, size, entry_path = entry
+                now = time.monotonic()
+                
+                # Check TTL
+                if now - accessed_at < self.ttl:
+                    self.cache[key] = (result, now, size, entry_path)
+                    self.cache.move_to_end(key)
+                    self.hit_count[path] += 1
+                    return result
+                
                 # Expired, remove
-                del self.cache[key]
-                del self.access_times[key]
-        
-        self.miss_count[path] += 1
-        return None
+                self._remove(key)
+                self.expiration_count[entry_path] += 1
+            
+            self.miss_count[path] += 1
+            return None
     
-    def set(self, prompt: str, path: str, result: Dict[str, Any]):
+    def set(self, prompt: str, path: str, result: Dict[str, Any], scope: str = ""):
         """Cache task result"""
-        key = self._generate_cache_key(prompt, path)
-        
-        # Evict if cache is full
-        if len(self.cache) >= self.max_size:
-            self._evict_oldest()
+        key = self._generate_cache_key(prompt, path, scope)
+        size = self._sizeof(result)
+        if size > self.max_bytes:
+            logger.debug(f"💾 Cache SKIP for {path}: entry of {size} bytes exceeds budget")
+            return
         
-        self.cache[key] = result
-        self.access_times[key] = time.time()
-        logger.info(f"💾 Cache SET for {path}: {key[:8]}...")
+        with self._lock:
+            if key in self.cache:
+                self._remove(key)
+            
+            # Evict least recently used entries until both budgets fit
+            while self.cache and (len(self.cache) >= self.max_size or
+                                  self.current_bytes + size > self.max_bytes):
+                self._evict_oldest()
+            
+            self.cache[key] = (result, time.monotonic(), size, path)
+            self.current_bytes += size
+    
+    def _remove(self, key: str):
+        _, _, size, _ = self.cache.pop(key)
+        self.current_bytes -= size
     
     def _evict_oldest(self):
-        """Evict oldest cache entries"""
-        if not self.access_times:
+        """Evict the least recently used entry"""
+        if not self.cache:
             return
         
-        oldest_key = min(self.access_times.keys(), key=lambda k: self.access_times[k])
-        del self.cache[oldest_key]
-        del self.access_times[oldest_key]
-        logger.info(f"🗑️ Cache EVICT: {oldest_key[:8]}...")
+        _, (_, _, size, path) = self.cache.popitem(last=False)
+        self.current_bytes -= size
+        self.eviction_count[path] += 1
+    
+    def expire(self) -> int:
+        """Drop every entry past its TTL; only the expired prefix of the ordering is visited"""
+        cutoff = time.monotonic() - self.ttl
+        removed = 0
+        with self._lock:
+            while self.cache:
+                key, (_, accessed_at, size, path) = next(iter(self.cache.items()))
+                if accessed_at > cutoff:
+                    break
+                self.cache.popitem(last=False)
+                self.current_bytes -= size
+                self.expiration_count[path] += 1
+                removed += 1
+        return removed
+    
+    def clear(self):
+        with self._lock:
+            self.cache.clear()
+            self.current_bytes = 0
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        total_hits = sum(self.hit_count.values())
-        total_misses = sum(self.miss_count.values())
-        hit_rate = total_hits / (total_hits + total_misses) if (total_hits + total_misses) > 0 else 0
+        with self._lock:
+            total_hits = sum(self.hit_count.values())
+            total_misses = sum(self.miss_count.values())
+            hit_rate = total_hits / (total_hits + total_misses) if (total_hits + total_misses) > 0 else 0
+            
+            return {
+                "cache_size": len(self.cache),
+                "cache_bytes": self.current_bytes,
+                "hit_rate": hit_rate,
+                "hits_by_path": dict(self.hit_count),
+                "misses_by_path": dict(self.miss_count),
+                "evictions_by_path": dict(self.eviction_count),
+                "expirations_by_path": dict(self.expiration_count),
+                "max_size": self.max_size,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl
+            }
+
+class ThreadSafePredictiveCache(PredictiveCache):
+    """PredictiveCache guarded by a lock, for sharing across threads or with the sweeper.
+
+    The background sweeper lives here rather than on the base class, whose ``OrderedDict``
+    is unguarded and must not be touched from a second thread.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.RLock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_sweeper = threading.Event()
+    
+    def start_sweeper(self, interval: Optional[float] = None):
+        """Expire entries in the background instead of only on read"""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        interval = interval or settings.CACHE_SWEEP_INTERVAL
+        self._stop_sweeper.clear()
+        
+        def sweep():
+            while not self._stop_sweeper.wait(interval):
+                removed = self.expire()
+                if removed:
+                    logger.debug(f"🧹 Cache sweeper expired {removed} entries")
+        
+        self._sweeper = threading.Thread(target=sweep, name="predictive-cache-sweeper", daemon=True)
+        self._sweeper.start()
+    
+    def stop_sweeper(self):
+        self._stop_sweeper.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=1)
+            self._sweeper = None
+
+class SemanticDecisionCache:
+    """Similarity tier behind the exact-match decision cache.
+
+    Prompts are embedded locally with the signed hashing trick over word unigrams,
+    bigrams and character trigrams, L2-normalised and kept as rows of a fixed-size
+    NumPy matrix, so one lookup is a single matrix-vector product. A lookup hits when
+    the best cosine similarity reaches ``threshold``; a sample of hits is audited by
+    recomputing the decision to measure the false-hit rate.
+    """
+    
+    _TOKEN_RE = re.compile(r"[a-z0-9]+")
+    
+    def __init__(self, capacity: Optional[int] = None, dim: Optional[int] = None,
+                 threshold: Optional[float] = None, ttl: Optional[float] = None,
+                 audit_rate: Optional[float] = None):
+        self.capacity = capacity or settings.SEMANTIC_CACHE_SIZE
+        self.dim = dim or settings.SEMANTIC_CACHE_DIM
+        self.threshold = threshold if threshold is not None else settings.SEMANTIC_CACHE_THRESHOLD
+        self.ttl = ttl or settings.CACHE_TTL
+        self.audit_rate = audit_rate if audit_rate is not None else settings.SEMANTIC_CACHE_AUDIT_RATE
+        
+        self.vectors = np.zeros((self.capacity, self.dim), dtype=np.float32)
+        self.inserted_at = np.full(self.capacity, -np.inf)
+        self.decisions: List[Optional[Dict[str, Any]]] = [None] * self.capacity
+        self.scopes = np.full(self.capacity, None, dtype=object)
+        self.size = 0
+        self._next_slot = 0
+        self._lock = threading.Lock()
+        
+        self.metrics = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "audits": 0,
+            "false_hits": 0,
+            "similarity_sum": 0.0
+        }
+    
+    def embed(self, prompt: str) -> np.ndarray:
+        """Hashing-trick embedding; crc32 keeps buckets stable across processes"""
+        text = prompt.lower()
+        words = self._TOKEN_RE.findall(text)
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        joined = " ".join(words)
+        features += [f"#{joined[i:i + 3]}" for i in range(len(joined) - 2)]
+        
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if not features:
+            return vector
+        hashes = np.fromiter((zlib.crc32(f.encode()) for f in features), dtype=np.uint32, count=len(features))
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, hashes % self.dim, signs)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def lookup(self, prompt: str, scope: str = "") -> Optional[Tuple[Dict[str, Any], float, int]]:
+        """Best cached decision above the threshold within ``scope``, as (decision, similarity, slot)"""
+        vector = self.embed(prompt)
+        with self._lock:
+            self.metrics["lookups"] += 1
+            if self.size:
+                similarities = self.vectors[:self.size] @ vector
+                similarities[self.inserted_at[:self.size] < time.monotonic() - self.ttl] = -1.0
+                similarities[self.scopes[:self.size] != scope] = -1.0
+                slot = int(np.argmax(similarities))
+                similarity = float(similarities[slot])
+                if similarity >= self.threshold:
+                    self.metrics["hits"] += 1
+                    self.metrics["similarity_sum"] += similarity
+                    return self.decisions[slot], similarity, slot
+            self.metrics["misses"] += 1
+            return None
+    
+    def add(self, prompt: str, decision: Dict[str, Any], scope: str = ""):
+        """Insert a decision, overwriting the oldest slot once full"""
+        vector = self.embed(prompt)
+        with self._lock:
+            slot = self._next_slot
+            self.vectors[slot] = vector
+            self.inserted_at[slot] = time.monotonic()
+            self.decisions[slot] = decision
+            self.scopes[slot] = scope
+            self._next_slot = (slot + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+    
+    def should_audit(self) -> bool:
+        return self.audit_rate > 0 and random.random() < self.audit_rate
+    
+    def record_audit(self, slot: int, cached: Dict[str, Any], fresh: Dict[str, Any]) -> bool:
+        """Compare a semantic hit with a freshly computed decision; returns True on a false hit"""
+        false_hit = cached.get("path") != fresh.get("path")
+        with self._lock:
+            self.metrics["audits"] += 1
+            if false_hit:
+                self.metrics["false_hits"] += 1
+                # Stop serving the wrong decision from this slot
+                self.inserted_at[slot] = -np.inf
+        return false_hit
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            m = dict(self.metrics)
+            size = self.size
+        return {
+            "size": size,
+            "capacity": self.capacity,
+            "threshold": self.threshold,
+            "lookups": m["lookups"],
+            "hits": m["hits"],
+            "misses": m["misses"],
+            "hit_rate": m["hits"] / m["lookups"] if m["lookups"] else 0.0,
+            "avg_hit_similarity": m["similarity_sum"] / m["hits"] if m["hits"] else 0.0,
+            "audits": m["audits"],
+            "false_hits": m["false_hits"],
+            "false_hit_rate": m["false_hits"] / m["audits"] if m["audits"] else 0.0
+        }
+
+class PathPerformanceModel:
+    """Online per-path latency and success model over hashed prompt features.
+
+    Latency: recursive least squares with exponential forgetting on log(seconds),
+    so predictions are medians and intervals are multiplicative. Success: logistic
+    regression trained by SGD. Both update in O(d^2) per execution.
+    """
+    
+    _TOKEN_RE = re.compile(r"[a-z0-9]+")
+    PRIOR_COV = 100.0
+    
+    def __init__(self, hash_dim: Optional[int] = None, forgetting: Optional[float] = None,
+                 learning_rate: Optional[float] = None):
+        self.hash_dim = hash_dim or settings.PREDICTOR_HASH_DIM
+        self.forgetting = forgetting or settings.PREDICTOR_FORGETTING
+        self.learning_rate = learning_rate or settings.LEARNING_RATE
+        self.dim = 3 + self.hash_dim
+        self.latency_weights = np.zeros(self.dim)
+        self.latency_cov = np.eye(self.dim) * self.PRIOR_COV
+        self.residual_var = 1.0
+        self.success_weights = np.zeros(self.dim)
+        self.sample_count = 0
+    
+    def features(self, prompt: Optional[str], complexity_score: float) -> np.ndarray:
+        """[bias, complexity, complexity^2, signed hashed word features]"""
+        x = np.zeros(self.dim)
+        x[0] = 1.0
+        x[1] = complexity_score
+        x[2] = complexity_score * complexity_score
+        tokens = self._TOKEN_RE.findall(prompt.lower()) if prompt else []
+        if tokens:
+            scale = 1.0 / math.sqrt(len(tokens))
+            for token in tokens:
+                h = zlib.crc32(token.encode())
+                x[3 + h % self.hash_dim] += -scale if h & 0x80000000 else scale
+        return x
+    
+    def update(self, x: np.ndarray, execution_time: float, success: bool):
+        # RLS on log latency
+        y = math.log(max(execution_time, 1e-3))
+        px = self.latency_cov @ x
+        gain = px / (self.forgetting + x @ px)
+        error = y - self.latency_weights @ x
+        self.latency_weights += gain * error
+        self.latency_cov = (self.latency_cov - np.outer(gain, px)) / self.forgetting
+        self._bound_covariance()
+        self.residual_var = 0.95 * self.residual_var + 0.05 * error * error
         
+        # Logistic SGD on success
+        p = 1.0 / (1.0 + math.exp(-float(np.clip(self.success_weights @ x, -30, 30))))
+        self.success_weights += self.learning_rate * ((1.0 if success else 0.0) - p) * x
+        self.sample_count += 1
+    
+    def _bound_covariance(self):
+        """Anti-windup: forgetting inflates unexcited directions (most hashed features) by
+        1/forgetting per update; rescale rows/columns so no variance exceeds the prior.
+        D P D with a diagonal D keeps the matrix positive semi-definite."""
+        diag = np.diag(self.latency_cov)
+        scale = np.sqrt(np.minimum(1.0, self.PRIOR_COV / np.maximum(diag, 1e-12)))
+        if scale.min() < 1.0:
+            self.latency_cov *= np.outer(scale, scale)
+        # Keep rounding error from making the matrix asymmetric over long runs
+        self.latency_cov = 0.5 * (self.latency_cov + self.latency_cov.T)
+    
+    def predict(self, X: np.ndarray, z: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Vectorized predictions for feature rows ``X`` (n x dim)"""
+        z = z or settings.PREDICTOR_CONFIDENCE_Z
+        log_mean = X @ self.latency_weights
+        log_std = np.sqrt(self.residual_var * (1.0 + np.einsum("ij,jk,ik->i", X, self.latency_cov, X)))
+        success = 1.0 / (1.0 + np.exp(-np.clip(X @ self.success_weights, -30, 30)))
+        success_margin = z * np.sqrt(success * (1.0 - success) / (self.sample_count + 1))
         return {
-            "cache_size": len(self.cache),
-            "hit_rate": hit_rate,
-            "hits_by_path": dict(self.hit_count),
-            "misses_by_path": dict(self.miss_count),
-            "max_size": self.max_size,
-            "ttl": self.ttl
+            "time": np.exp(log_mean),
+            "time_low": np.exp(log_mean - z * log_std),
+            "time_high": np.exp(log_mean + z * log_std),
+            "success": success,
+            "success_low": np.clip(success - success_margin, 0.0, 1.0),
+            "success_high": np.clip(success + success_margin, 0.0, 1.0)
+        }
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "sample_count": self.sample_count,
+            "residual_std_log_seconds": math.sqrt(self.residual_var),
+            "complexity_weight": float(self.latency_weights[1]),
+            "active": self.sample_count >= settings.MIN_TRAINING_SAMPLES
+        }
+
+def replay_evaluate(records: List[Dict[str, Any]], warmup: Optional[int] = None) -> Dict[str, Any]:
+    """Offline progressive validation over recorded executions (oldest first).
+
+    Each record is predicted before it is trained on, by a fresh regression model
+    and by the legacy EWMA x (1 + 0.5 * complexity) baseline; errors are scored
+    once ``warmup`` records of that path have been seen.
+    """
+    warmup = settings.MIN_TRAINING_SAMPLES if warmup is None else warmup
+    models: Dict[str, PathPerformanceModel] = {}
+    baselines: Dict[str, Dict[str, float]] = {}
+    scores: Dict[str, Dict[str, Any]] = {}
+    
+    for record in records:
+        if record.get("execution_time") is None or record.get("success") is None:
+            continue
+        path = record["path"]
+        model = models.setdefault(path, PathPerformanceModel())
+        baseline = baselines.setdefault(path, {"time": 0.0, "success": 0.0, "n": 0})
+        score = scores.setdefault(path, defaultdict(float))
+        complexity = record.get("complexity_score") or 0.0
+        actual_time = record["execution_time"]
+        actual_success = 1.0 if record["success"] else 0.0
+        x = model.features(record.get("prompt"), complexity)
+        
+        if model.sample_count >= warmup:
+            predicted = model.predict(x[None, :])
+            baseline_time = baseline["time"] * (1.0 + 0.5 * complexity)
+            score["scored"] += 1
+            score["latency_abs_error"] += abs(float(predicted["time"][0]) - actual_time)
+            score["baseline_latency_abs_error"] += abs(baseline_time - actual_time)
+            score["latency_abs_pct_error"] += abs(float(predicted["time"][0]) - actual_time) / max(actual_time, 1e-3)
+            score["interval_hits"] += float(predicted["time_low"][0] <= actual_time <= predicted["time_high"][0])
+            score["success_sq_error"] += (float(predicted["success"][0]) - actual_success) ** 2
+            score["baseline_success_sq_error"] += (baseline["success"] - actual_success) ** 2
+        
+        model.update(x, actual_time, bool(record["success"]))
+        alpha = 1.0 if baseline["n"] == 0 else 0.1
+        baseline["time"] += alpha * (actual_time - baseline["time"])
+        baseline["success"] += alpha * (actual_success - baseline["success"])
+        baseline["n"] += 1
+    
+    report = {}
+    for path, score in scores.items():
+        n = score["scored"]
+        report[path] = {
+            "records": models[path].sample_count,
+            "scored": int(n),
+            "latency_mae": score["latency_abs_error"] / n if n else None,
+            "baseline_latency_mae": score["baseline_latency_abs_error"] / n if n else None,
+            "latency_mape": score["latency_abs_pct_error"] / n if n else None,
+            "interval_coverage": score["interval_hits"] / n if n else None,
+            "success_brier": score["success_sq_error"] / n if n else None,
+            "baseline_success_brier": score["baseline_success_sq_error"] / n if n else None
         }
+    return report
 
 class PerformanceLearningSystem:
     """Machine learning system for performance prediction"""
     
-    def __init__(self):
+    def __init__(self, store=None):
         self.execution_history = deque(maxlen=10000)
         self.user_preferences = {}
         self.performance_models = {
             "golden_path": self._create_simple_model(),
             "full_workflow": self._create_simple_model()
         }
+        self.regressors = {path: PathPerformanceModel() for path in self.performance_models}
         self.last_model_update = datetime.now()
         self.update_lock = threading.Lock()
+        # Persisted through the database write-behind queue; None keeps everything in memory
+        self.store = store if store is not None else db_manager
+        self._rehydrate()
+    
+    def _rehydrate(self):
+        """Rebuild the models, execution history and user preferences from persisted history.
+
+        Rows recorded before prompts were persisted only warm the EWMA baseline; they
+        stay out of the regressor and of the history used for replay and tuning.
+        """
+        if self.store is None or not settings.PERFORMANCE_TRACKING:
+            return
+        try:
+            replayed = 0
+            for path in self.performance_models:
+                rows = self.store.get_recent_performance_metrics(path, settings.PERFORMANCE_REHYDRATE_WINDOW)
+                for row in rows:
+                    if row["execution_time"] is None or row["success"] is None:
+                        continue
+                    record = {
+                        "task_id": row.get("task_id"),
+                        "prompt": row.get("prompt"),
+                        "path": path,
+                        "execution_time": row["execution_time"],
+                        "success": bool(row["success"]),
+                        "user_satisfaction": row["user_satisfaction"],
+                        "complexity_score": row["complexity_score"],
+                        "timestamp": row["timestamp"]
+                    }
+                    has_inputs = record["prompt"] is not None
+                    self._update_performance_model(path, record, train_regressor=has_inputs)
+                    if has_inputs:
+                        self.execution_history.append(record)
+                    replayed += 1
+            
+            for row in self.store.get_user_preferences():
+                self.user_preferences[row["user_id"]] = UserPreferences(
+                    user_id=row["user_id"],
+                    preferred_path=row["preferred_path"] or "golden_path",
+                    speed_preference=row["speed_preference"] if row["speed_preference"] is not None else 0.5,
+                    complexity_preference=row["complexity_preference"] if row["complexity_preference"] is not None else 0.5,
+                    satisfaction_history=list(row["satisfaction_history"] or []),
+                    last_updated=row["created_at"] or datetime.now()
+                )
+            logger.info(f"📈 Learning system rehydrated: {replayed} metrics, {len(self.user_preferences)} user preferences")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not rehydrate learning system, starting cold: {e}")
     
     def _create_simple_model(self) -> Dict[str, Any]:
         """Create a simple performance prediction model"""
         return {
             "avg_execution_time": 0.0,
             "success_rate": 0.0,
-            "complexity_weights": {},
-            "keyword_weights": {},
             "sample_count": 0
         }
     
@@ -170,9 +623,28 @@ class PerformanceLearningSystem:
             self._update_performance_model(path, record)
             
             # Update user preferences
-            self._update_user_preferences(task_id, path, user_satisfaction)
+            user_pref = self._update_user_preferences(task_id, path, user_satisfaction)
+            
+            self._persist(record, user_pref)
     
-    def _update_performance_model(self, path: str, record: Dict[str, Any]):
+    def _persist(self, record: Dict[str, Any], user_pref: UserPreferences):
+        """Queue the execution and the user's updated preferences for batched writing"""
+        if self.store is None or not settings.PERFORMANCE_TRACKING:
+            return
+        try:
+            self.store.record_performance_metric(
+                record["path"], record["complexity_score"], record["execution_time"],
+                record["success"], record["user_satisfaction"],
+                task_id=record["task_id"], prompt=record["prompt"]
+            )
+            self.store.save_user_preference(
+                user_pref.user_id, user_pref.preferred_path, user_pref.speed_preference,
+                user_pref.complexity_preference, user_pref.satisfaction_history
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to queue performance metric: {e}")
+    
+    def _update_performance_model(self, path: str, record: Dict[str, Any], train_regressor: bool = True):
         """Update performance prediction model"""
         model = self.performance_models[path]
         
@@ -198,10 +670,19 @@ class PerformanceLearningSystem:
             )
         
         model["sample_count"] += 1
+        
+        # Train the per-prompt regression model
+        if train_regressor:
+            regressor = self.regressors[path]
+            regressor.update(
+                regressor.features(record["prompt"], record["complexity_score"] or 0.0),
+                record["execution_time"], record["success"]
+            )
+        self.last_model_update = datetime.now()
     
-    def _update_user_preferences(self, task_id: str, path: str, satisfaction: float):
+    def _update_user_preferences(self, task_id: str, path: str, satisfaction: float) -> UserPreferences:
         """Update user preferences based on satisfaction"""
-        user_id = task_id.split('_')[0] if '_' in task_id else "default"
+        user_id = tenant_of(task_id)
         
         if user_id not in self.user_preferences:
             self.user_preferences[user_id] = UserPreferences(
@@ -228,30 +709,59 @@ class PerformanceLearningSystem:
             user_pref.preferred_path = "full_workflow" if path == "golden_path" else "golden_path"
         
         user_pref.last_updated = datetime.now()
+        return user_pref
+    
+    def predict_paths(self, prompts: List[Optional[str]], complexity_scores: np.ndarray) -> Dict[str, Dict[str, Any]]:
+        """Vectorized per-path predictions for a batch of prompts.
+
+        Uses the regression model once a path has MIN_TRAINING_SAMPLES executions and
+        the EWMA x (1 + 0.5 * complexity) estimate before that.
+        """
+        complexity_scores = np.asarray(complexity_scores, dtype=np.float64)
+        floors = {"golden_path": 0.5, "full_workflow": 10.0}
+        predictions = {}
+        for path, regressor in self.regressors.items():
+            if regressor.sample_count >= settings.MIN_TRAINING_SAMPLES:
+                X = np.stack([regressor.features(p, c) for p, c in zip(prompts, complexity_scores)])
+                predictions[path] = {**regressor.predict(X), "model": "regression"}
+                continue
+            model = self.performance_models[path]
+            times = np.maximum(model["avg_execution_time"] * (1.0 + complexity_scores * 0.5), floors[path])
+            success = np.full(len(complexity_scores), model["success_rate"])
+            predictions[path] = {
+                "time": times, "time_low": times, "time_high": times,
+                "success": success, "success_low": np.zeros_like(success), "success_high": np.ones_like(success),
+                "model": "ewma"
+            }
+        return predictions
     
     def predict_performance(self, prompt: str, complexity_score: float) -> PerformancePrediction:
         """Predict performance for both execution paths"""
-        golden_model = self.performance_models["golden_path"]
-        full_model = self.performance_models["full_workflow"]
-        
-        # Adjust predictions based on complexity
-        complexity_factor = 1.0 + (complexity_score * 0.5)
-        
-        golden_time = golden_model["avg_execution_time"] * complexity_factor
-        full_time = full_model["avg_execution_time"] * complexity_factor
-        
-        # Ensure minimum values
-        golden_time = max(golden_time, 0.5)
-        full_time = max(full_time, 10.0)
+        predictions = self.predict_paths([prompt], np.array([complexity_score]))
+        golden = predictions["golden_path"]
+        full = predictions["full_workflow"]
         
         return PerformancePrediction(
-            golden_path_time=golden_time,
-            full_workflow_time=full_time,
-            golden_path_success_rate=golden_model["success_rate"],
-            full_workflow_success_rate=full_model["success_rate"],
-            confidence=min(golden_model["sample_count"], full_model["sample_count"]) / 100.0
+            golden_path_time=float(golden["time"][0]),
+            full_workflow_time=float(full["time"][0]),
+            golden_path_success_rate=float(golden["success"][0]),
+            full_workflow_success_rate=float(full["success"][0]),
+            confidence=min(self.regressors["golden_path"].sample_count,
+                           self.regressors["full_workflow"].sample_count, 100) / 100.0,
+            golden_path_time_interval=(float(golden["time_low"][0]), float(golden["time_high"][0])),
+            full_workflow_time_interval=(float(full["time_low"][0]), float(full["time_high"][0])),
+            golden_path_success_interval=(float(golden["success_low"][0]), float(golden["success_high"][0])),
+            full_workflow_success_interval=(float(full["success_low"][0]), float(full["success_high"][0])),
+            model=golden["model"] if golden["model"] == full["model"] else "mixed"
         )
     
+    def evaluate_replay(self, records: Optional[List[Dict[str, Any]]] = None,
+                        warmup: Optional[int] = None) -> Dict[str, Any]:
+        """Replay recorded executions through a fresh model (see replay_evaluate)"""
+        with self.update_lock:
+            history = list(self.execution_history) if records is None else records
+        return replay_evaluate(history, warmup)
+    
     def get_user_preferences(self, user_id: str = "default") -> UserPreferences:
         """Get user preferences"""
         return self.user_preferences.get(user_id, UserPreferences(
@@ -263,11 +773,270 @@ class PerformanceLearningSystem:
             last_updated=datetime.now()
         ))
 
+class ThresholdTuner:
+    """Background tuner for the switch threshold and decision-score weights.
+
+    Every THRESHOLD_UPDATE_INTERVAL it replays recent executions through the
+    learned per-path models: each candidate config (sampled within a
+    THRESHOLD_LEARNING_RATE trust region of the current one) is scored by the
+    expected latency of the paths it would have chosen, subject to an expected
+    success rate of at least TUNER_SUCCESS_FLOOR. Tenants with enough history
+    get their own config; pinned overrides are never tuned. After a change the
+    observed success rate is on probation and a regression rolls it back.
+    """
+    
+    GLOBAL = "__global__"
+    
+    def __init__(self, engine: "HybridDecisionEngine"):
+        self.engine = engine
+        self.global_config = RoutingConfig.from_settings()
+        self.overrides: Dict[str, RoutingConfig] = {}
+        self.pinned: set = set()
+        # Config in force before the last tune, and whether that was a tenant override (False: tenant followed global)
+        self.previous: Dict[str, Tuple[RoutingConfig, bool]] = {}
+        self.probation: Dict[str, Dict[str, Any]] = {}
+        self.outcomes: Dict[str, deque] = defaultdict(lambda: deque(maxlen=settings.TUNER_WINDOW))
+        self.changes = deque(maxlen=50)
+        # Bumped on every config change; part of the decision cache key so cached routes never outlive their config
+        self.version = 0
+        self._rng = np.random.default_rng()
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    # --- config lookup -----------------------------------------------------
+    def config_for(self, tenant: str = "default") -> RoutingConfig:
+        return self.overrides.get(tenant, self.global_config)
+    
+    def set_override(self, tenant: str, pinned: bool = True, **fields) -> RoutingConfig:
+        """Per-tenant config; pinned overrides are left alone by the tuner"""
+        with self._lock:
+            base = self.config_for(tenant)
+            config = RoutingConfig(**{**base.__dict__, **fields})
+            self.overrides[tenant] = config
+            if pinned:
+                self.pinned.add(tenant)
+            self.probation.pop(tenant, None)
+            self.version += 1
+            return config
+    
+    def clear_override(self, tenant: str):
+        with self._lock:
+            self.overrides.pop(tenant, None)
+            self.pinned.discard(tenant)
+            self.probation.pop(tenant, None)
+            self.version += 1
+    
+    def _key(self, tenant: str) -> str:
+        return tenant if tenant in self.overrides else self.GLOBAL
+    
+    def _apply(self, key: str, config: RoutingConfig):
+        if key == self.GLOBAL:
+            self.global_config = config
+            # Mirror into settings so the live values are visible everywhere
+            settings.HYBRID_SWITCH_THRESHOLD = config.threshold
+            settings.COMPLEXITY_WEIGHT = config.complexity_weight
+            settings.PERFORMANCE_WEIGHT = config.performance_weight
+            settings.USER_PREFERENCE_WEIGHT = config.user_preference_weight
+        else:
+            self.overrides[key] = config
+        self.version += 1
+        self.engine.last_threshold_update = datetime.now()
+    
+    # --- rollback ----------------------------------------------------------
+    def observe(self, tenant: str, success: bool):
+        """Feed a real outcome; rolls back a change whose success rate regressed"""
+        with self._lock:
+            key = self._key(tenant)
+            self.outcomes[key].append(1.0 if success else 0.0)
+            if key != self.GLOBAL:
+                self.outcomes[self.GLOBAL].append(1.0 if success else 0.0)
+            
+            trial = self.probation.get(key)
+            if trial is None:
+                return
+            trial["total"] += 1
+            trial["successes"] += 1 if success else 0
+            if trial["total"] < settings.TUNER_PROBATION_SAMPLES:
+                return
+            
+            rate = trial["successes"] / trial["total"]
+            baseline = trial["baseline"]
+            regressed = (rate < baseline - settings.TUNER_ROLLBACK_MARGIN or
+                         rate < settings.TUNER_SUCCESS_FLOOR <= baseline)
+            del self.probation[key]
+            if regressed:
+                previous, had_override = self.previous.pop(key)
+                if key == self.GLOBAL or had_override:
+                    self._apply(key, previous)
+                else:
+                    # The tune created this override; drop it so the tenant follows global tuning again
+                    self.clear_override(key)
+                    self.engine.last_threshold_update = datetime.now()
+                self.outcomes[key].clear()
+                self.changes.append({"key": key, "action": "rollback", "success_rate": rate,
+                                     "baseline": baseline, "config": self.config_for(key).__dict__,
+                                     "timestamp": datetime.now().isoformat()})
+                logger.warning(f"↩️ Routing config for {key} rolled back: success {rate:.2f} < baseline {baseline:.2f}")
+    
+    # --- tuning ------------------------------------------------------------
+    def _features(self, records: List[Dict[str, Any]], tenant: str) -> Dict[str, np.ndarray]:
+        """Routing inputs for recorded executions, as arrays"""
+        prompts = [r.get("prompt") or "" for r in records]
+        overall = np.array([r.get("complexity_score") or 0.0 for r in records])
+        routing = np.array([bool(keyword_matcher.scan(p)["routing_complex"]) for p in prompts])
+        word_counts = np.array([len(p.split()) for p in prompts])
+        predictions = self.engine.learning_system.predict_paths(prompts, overall)
+        preferred = self.engine.learning_system.get_user_preferences(tenant).preferred_path
+        n = len(records)
+        return {
+            "overall": overall,
+            "routing": routing,
+            "word_counts": word_counts,
+            "golden_time": predictions["golden_path"]["time"],
+            "full_time": predictions["full_workflow"]["time"],
+            "golden_success": predictions["golden_path"]["success"],
+            "full_success": predictions["full_workflow"]["success"],
+            "prefers_golden": np.full(n, preferred == "golden_path"),
+            "prefers_full": np.full(n, preferred == "full_workflow"),
+            "user_score": np.full(n, 0.8 if preferred == "full_workflow" else 0.2 if preferred == "golden_path" else 0.5)
+        }
+    
+    def evaluate(self, config: RoutingConfig, f: Dict[str, np.ndarray]) -> Tuple[float, float]:
+        """Expected (latency, success rate) had ``config`` routed these executions"""
+        score = self.engine._calculate_decision_scores(
+            f["overall"], f["golden_time"], f["full_time"], f["user_score"], config.weights
+        )
+        full_path, _ = self.engine._route(score, config.threshold, f["overall"], f["routing"],
+                                          f["word_counts"], f["prefers_golden"], f["prefers_full"])
+        latency = float(np.mean(np.where(full_path, f["full_time"], f["golden_time"])))
+        success = float(np.mean(np.where(full_path, f["full_success"], f["golden_success"])))
+        return latency, success
+    
+    def _candidates(self, current: RoutingConfig, local: bool = True) -> List[RoutingConfig]:
+        """Configs in the trust region around ``current``, or spread over the whole space"""
+        radius = settings.THRESHOLD_LEARNING_RATE
+        total = float(current.weights.sum())
+        candidates = []
+        for _ in range(settings.TUNER_CANDIDATES):
+            if local:
+                weights = np.clip(current.weights + self._rng.uniform(-radius, radius, 3), 0.0, None)
+                threshold = current.threshold + self._rng.uniform(-radius, radius)
+            else:
+                weights = self._rng.dirichlet(np.ones(3))
+                threshold = self._rng.uniform(0.05, 0.95)
+            if weights.sum() <= 0:
+                continue
+            weights *= total / weights.sum()
+            candidates.append(RoutingConfig(
+                threshold=float(np.clip(threshold, 0.05, 0.95)),
+                complexity_weight=float(weights[0]),
+                performance_weight=float(weights[1]),
+                user_preference_weight=float(weights[2])
+            ))
+        return candidates
+    
+    def _tune_key(self, key: str, records: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        current = self.global_config if key == self.GLOBAL else self.overrides.get(key, self.global_config)
+        f = self._features(records, "default" if key == self.GLOBAL else key)
+        floor = settings.TUNER_SUCCESS_FLOOR
+        
+        current_latency, current_success = self.evaluate(current, f)
+        best, best_latency, best_success = current, current_latency, current_success
+        # Small moves first; the routing rules are step functions, so when no
+        # nearby config changes the outcome, look across the whole space
+        for local in (True, False):
+            for candidate in self._candidates(current, local):
+                latency, success = self.evaluate(candidate, f)
+                if best_success < floor:
+                    # Infeasible so far: climb toward the success floor first
+                    better = success > best_success or (success == best_success and latency < best_latency)
+                else:
+                    better = success >= floor and latency < best_latency
+                if better:
+                    best, best_latency, best_success = candidate, latency, success
+            if best is not current:
+                break
+        
+        # Require a meaningful gain before touching live routing
+        if best is current or (current_success >= floor and best_latency > current_latency * 0.99):
+            return None
+        
+        observed = self.outcomes.get(key)
+        baseline = float(np.mean(observed)) if observed else current_success
+        self.previous[key] = (current, key == self.GLOBAL or key in self.overrides)
+        self.probation[key] = {"baseline": baseline, "successes": 0, "total": 0}
+        self._apply(key, best)
+        change = {"key": key, "action": "tune", "config": best.__dict__,
+                  "expected_latency": best_latency, "previous_expected_latency": current_latency,
+                  "expected_success": best_success, "timestamp": datetime.now().isoformat()}
+        self.changes.append(change)
+        logger.info(f"🎚️ Routing config for {key}: threshold {current.threshold:.3f} -> {best.threshold:.3f}, "
+                    f"expected latency {current_latency:.2f}s -> {best_latency:.2f}s, "
+                    f"success {current_success:.2f} -> {best_success:.2f}")
+        return change
+    
+    def tune(self) -> List[Dict[str, Any]]:
+        """One tuning pass over global and per-tenant history"""
+        with self.engine.learning_system.update_lock:
+            history = list(self.engine.learning_system.execution_history)[-settings.TUNER_WINDOW:]
+        history = [r for r in history if r.get("execution_time") is not None]
+        
+        by_tenant: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for record in history:
+            if record.get("task_id"):
+                by_tenant[tenant_of(record["task_id"])].append(record)
+        
+        changes = []
+        with self._lock:
+            groups = [(self.GLOBAL, history)] + [
+                (tenant, records) for tenant, records in by_tenant.items() if tenant != "default"
+            ]
+            for key, records in groups:
+                if len(records) < settings.MIN_TRAINING_SAMPLES or key in self.pinned or key in self.probation:
+                    continue
+                try:
+                    change = self._tune_key(key, records)
+                except Exception as e:
+                    logger.error(f"❌ Routing tuner failed for {key}: {e}")
+                    continue
+                if change:
+                    changes.append(change)
+        return changes
+    
+    def start(self, interval: Optional[float] = None):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        interval = interval or settings.THRESHOLD_UPDATE_INTERVAL
+        self._stop.clear()
+        
+        def loop():
+            while not self._stop.wait(interval):
+                self.tune()
+        
+        self._thread = threading.Thread(target=loop, name="routing-threshold-tuner", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "global": self.global_config.__dict__,
+                "overrides": {tenant: c.__dict__ for tenant, c in self.overrides.items()},
+                "pinned": sorted(self.pinned),
+                "on_probation": {key: dict(trial) for key, trial in self.probation.items()},
+                "recent_changes": list(self.changes)[-10:]
+            }
+
 class HybridDecisionEngine:
     """Intelligent hybrid decision engine for optimal path selection"""
     
     def __init__(self):
-        self.cache = PredictiveCache()
+        self.cache = ThreadSafePredictiveCache()
+        self.cache.start_sweeper()
+        self.semantic_cache = SemanticDecisionCache() if settings.SEMANTIC_CACHE_ENABLED else None
         self.learning_system = PerformanceLearningSystem()
         self.complexity_analyzer = TaskComplexityAnalyzer()
         self.analytics = AdvancedAnalytics()
@@ -276,6 +1045,10 @@ class HybridDecisionEngine:
         self.decision_history = deque(maxlen=1000)
         self.last_threshold_update = datetime.now()
         
+        self.tuner = ThresholdTuner(self)
+        if settings.ENABLE_DYNAMIC_THRESHOLDS:
+            self.tuner.start()
+        
         logger.info("🚀 Hybrid Decision Engine initialized")
     
     def analyze_task_complexity(self, prompt: str) -> TaskComplexity:
@@ -286,13 +1059,17 @@ class HybridDecisionEngine:
         """Predict performance for both execution paths"""
         return self.learning_system.predict_performance(prompt, complexity_score)
     
+    def _cache_scope(self, user_id: str) -> str:
+        """Decision cache scope: routes depend on the tenant and the routing config in force"""
+        return f"{user_id}:{self.tuner.version}"
+    
     def make_hybrid_decision(self, prompt: str, user_id: str = "default", 
                            force_path: Optional[str] = None) -> Dict[str, Any]:
         """Make intelligent routing decision"""
         
         # Check cache first
-        cache_key = f"{prompt}:{user_id}"
-        cached_decision = self.cache.get(prompt, "decision")
+        scope = self._cache_scope(user_id)
+        cached_decision = self.cache.get(prompt, "decision", scope)
         if cached_decision:
             return cached_decision
         
@@ -305,11 +1082,55 @@ class HybridDecisionEngine:
                 "complexity_score": 0.5,
                 "predicted_time": 0.0
             }
-            self.cache.set(prompt, "decision", decision)
+            self.cache.set(prompt, "decision", decision, scope)
             return decision
         
+        # Near-duplicate prompts: similarity tier, only among this tenant's decisions
+        if self.semantic_cache is not None:
+            match = self.semantic_cache.lookup(prompt, scope)
+            if match:
+                cached, similarity, slot = match
+                if self.semantic_cache.should_audit():
+                    # Score without caching or analytics so the audit does not count as a second decision
+                    fresh, complexity, performance = self._evaluate_decision(prompt, user_id)
+                    if self.semantic_cache.record_audit(slot, cached, fresh):
+                        logger.warning(f"⚠️ Semantic cache false hit (similarity {similarity:.3f}): "
+                                       f"{cached.get('path')} != {fresh.get('path')}")
+                        # The fresh decision is what gets served, so record it once as this request's decision
+                        self._record_decision(prompt, user_id, fresh, complexity, performance)
+                        self.semantic_cache.add(prompt, fresh, scope)
+                        return fresh
+                return {**cached, "semantic_similarity": similarity}
+        
+        decision = self._compute_decision(prompt, user_id)
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(prompt, decision, scope)
+        return decision
+    
+    def _compute_decision(self, prompt: str, user_id: str = "default") -> Dict[str, Any]:
+        """Full complexity/performance/preference evaluation for one prompt, cached and recorded"""
+        decision, complexity, performance = self._evaluate_decision(prompt, user_id)
+        self._record_decision(prompt, user_id, decision, complexity, performance)
+        return decision
+    
+    def _record_decision(self, prompt: str, user_id: str, decision: Dict[str, Any],
+                         complexity: TaskComplexity, performance: PerformancePrediction):
+        # Cache decision
+        self.cache.set(prompt, "decision", decision, self._cache_scope(user_id))
+        
+        # Record analytics
+        self.analytics.record_decision(prompt, decision, complexity, performance)
+        
+        # Log decision
+        logger.info(f"🎯 Hybrid Decision: {decision['path']} ({decision['reason']}) - Confidence: {complexity.confidence:.2f}")
+    
+    def _evaluate_decision(self, prompt: str, user_id: str = "default") -> Tuple[Dict[str, Any], TaskComplexity, PerformancePrediction]:
+        """Score and route one prompt without side effects (no caching, analytics or logging)"""
+        # One pass over the prompt finds every keyword category used below
+        keyword_hits = keyword_matcher.scan(prompt)
+        
         # Analyze task complexity
-        complexity = self.analyze_task_complexity(prompt)
+        complexity = self.complexity_analyzer.analyze(prompt, keyword_hits)
         
         # Predict performance
         performance = self.predict_performance(prompt, complexity.overall_score)
@@ -317,9 +1138,12 @@ class HybridDecisionEngine:
         # Get user preferences
         user_prefs = self.learning_system.get_user_preferences(user_id)
         
+        # Threshold and weights for this tenant (tuned or overridden)
+        config = self.tuner.config_for(user_id)
+        
         # Calculate decision weights
         decision_score = self._calculate_decision_score(
-            complexity, performance, user_prefs
+            complexity, performance, user_prefs, config
         )
         
         # Enhanced decision logic with multiple criteria
@@ -327,17 +1151,12 @@ class HybridDecisionEngine:
         reason = "simple_task"
         
         # Primary decision based on complexity threshold
-        if decision_score > settings.HYBRID_SWITCH_THRESHOLD:
+        if decision_score > config.threshold:
             chosen_path = "full_workflow"
             reason = "complex_task"
         
         # Secondary criteria: keyword analysis
-        prompt_lower = prompt.lower()
-        complex_keywords = ["design", "architecture", "system", "complex", "advanced", 
-                          "algorithm", "optimization", "machine learning", "neural network",
-                          "database", "api", "framework", "microservice", "distributed"]
-        
-        if any(keyword in prompt_lower for keyword in complex_keywords):
+        if keyword_hits["routing_complex"]:
             if complexity.overall_score > 0.3:  # Lower threshold for keyword detection
                 chosen_path = "full_workflow"
                 reason = "complex_keywords"
@@ -369,25 +1188,150 @@ class HybridDecisionEngine:
                 "golden_path_time": performance.golden_path_time,
                 "full_workflow_time": performance.full_workflow_time,
                 "golden_path_success_rate": performance.golden_path_success_rate,
-                "full_workflow_success_rate": performance.full_workflow_success_rate
+                "full_workflow_success_rate": performance.full_workflow_success_rate,
+                "golden_path_time_interval": performance.golden_path_time_interval,
+                "full_workflow_time_interval": performance.full_workflow_time_interval,
+                "model": performance.model
             }
         }
         
-        # Cache decision
-        self.cache.set(prompt, "decision", decision)
+        return decision, complexity, performance
+    
+    def make_hybrid_decisions(self, prompts: List[str], user_id: str = "default",
+                              user_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Route a batch of prompts in one call.
+
+        Cached prompts are served from the decision cache; for the rest, features
+        are gathered into NumPy arrays and scored, thresholded and routed with
+        vectorized expressions. Decisions match make_hybrid_decision prompt for prompt.
+        """
+        if user_ids is not None and len(user_ids) != len(prompts):
+            raise ValueError("user_ids must be the same length as prompts")
         
-        # Record analytics
-        self.analytics.record_decision(prompt, decision, complexity, performance)
+        decisions: List[Optional[Dict[str, Any]]] = [None] * len(prompts)
+        scopes = [self._cache_scope(user_ids[i] if user_ids is not None else user_id) for i in range(len(prompts))]
+        pending = []
+        for i, prompt in enumerate(prompts):
+            cached = self.cache.get(prompt, "decision", scopes[i])
+            if cached:
+                decisions[i] = cached
+            else:
+                pending.append(i)
+        if not pending:
+            return decisions
         
-        # Log decision
-        logger.info(f"🎯 Hybrid Decision: {chosen_path} ({reason}) - Confidence: {complexity.confidence:.2f}")
+        batch = [prompts[i] for i in pending]
+        batch_users = [user_ids[i] if user_ids is not None else user_id for i in pending]
+        n = len(batch)
         
-        return decision
+        # Per-prompt features: one keyword scan each, everything else as arrays
+        lengths = np.fromiter((len(p) for p in batch), dtype=np.float64, count=n)
+        word_counts = np.fromiter((len(p.split()) for p in batch), dtype=np.int64, count=n)
+        simple = np.empty(n)
+        complex_ = np.empty(n)
+        context = np.empty(n)
+        routing = np.empty(n, dtype=bool)
+        for j, prompt in enumerate(batch):
+            hits = keyword_matcher.scan(prompt)
+            simple[j] = len(hits["simple_task"])
+            complex_[j] = len(hits["complex_task"])
+            context[j] = len(hits["context"])
+            routing[j] = bool(hits["routing_complex"])
+        
+        # TaskComplexityAnalyzer.analyze, vectorized
+        length_score = np.minimum(lengths / 1000.0, 1.0)
+        keyword_score = complex_ / np.maximum(simple + complex_, 1)
+        context_score = np.minimum(context / len(CONTEXT_INDICATORS), 1.0)
+        historical_score = np.full(n, 0.5)
+        overall = 0.3 * length_score + 0.4 * keyword_score + 0.2 * context_score + 0.1 * historical_score
+        confidence = np.minimum((simple + complex_) / 10.0 + length_score * 0.5, 1.0)
+        
+        # Per-path latency/success predictions for the whole batch
+        predictions = self.learning_system.predict_paths(batch, overall)
+        golden, full = predictions["golden_path"], predictions["full_workflow"]
+        golden_time, full_time = golden["time"], full["time"]
+        model = golden["model"] if golden["model"] == full["model"] else "mixed"
+        
+        preferred = [self.learning_system.get_user_preferences(u).preferred_path for u in batch_users]
+        prefers_golden = np.array([p == "golden_path" for p in preferred])
+        prefers_full = np.array([p == "full_workflow" for p in preferred])
+        user_score = np.where(prefers_full, 0.8, np.where(prefers_golden, 0.2, 0.5))
+        
+        configs = [self.tuner.config_for(u) for u in batch_users]
+        thresholds = np.array([c.threshold for c in configs])
+        weights = np.stack([c.weights for c in configs])
+        
+        score = self._calculate_decision_scores(overall, golden_time, full_time, user_score, weights)
+        full_path, reasons = self._route(score, thresholds, overall, routing, word_counts,
+                                         prefers_golden, prefers_full)
+        
+        predicted_time = np.where(full_path, full_time, golden_time)
+        for j, i in enumerate(pending):
+            decision = {
+                "path": "full_workflow" if full_path[j] else "golden_path",
+                "reason": reasons[j],
+                "confidence": float(confidence[j]),
+                "complexity_score": float(overall[j]),
+                "predicted_time": float(predicted_time[j]),
+                "user_preference": preferred[j],
+                "performance_prediction": {
+                    "golden_path_time": float(golden_time[j]),
+                    "full_workflow_time": float(full_time[j]),
+                    "golden_path_success_rate": float(golden["success"][j]),
+                    "full_workflow_success_rate": float(full["success"][j]),
+                    "golden_path_time_interval": (float(golden["time_low"][j]), float(golden["time_high"][j])),
+                    "full_workflow_time_interval": (float(full["time_low"][j]), float(full["time_high"][j])),
+                    "model": model
+                }
+            }
+            self.cache.set(batch[j], "decision", decision, scopes[i])
+            decisions[i] = decision
+        
+        self.analytics.record_decisions([decisions[i] for i in pending])
+        logger.info(f"🎯 Hybrid batch: {n} decided, {len(prompts) - n} cached, "
+                    f"{int(full_path.sum())} full_workflow")
+        return decisions
+    
+    @staticmethod
+    def _calculate_decision_scores(complexity_scores: np.ndarray, golden_times: np.ndarray,
+                                   full_times: np.ndarray, user_scores: np.ndarray,
+                                   weights: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_decision_score; ``weights`` is (3,) or one row per prompt"""
+        golden_advantage = full_times / np.maximum(golden_times, 0.1)
+        performance_scores = np.minimum(golden_advantage / 10.0, 1.0)
+        weights = np.atleast_2d(weights)
+        final_scores = (
+            weights[:, 0] * complexity_scores +
+            weights[:, 1] * performance_scores +
+            weights[:, 2] * user_scores
+        )
+        return np.clip(final_scores, 0.0, 1.0)
+    
+    @staticmethod
+    def _route(score: np.ndarray, thresholds, overall: np.ndarray, routing: np.ndarray,
+               word_counts: np.ndarray, prefers_golden: np.ndarray,
+               prefers_full: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Routing rules, applied in the same order as make_hybrid_decision"""
+        full_path = score > thresholds
+        reasons = np.where(full_path, "complex_task", "simple_task").astype(object)
+        keyword_rule = routing & (overall > 0.3)
+        full_path |= keyword_rule
+        reasons[keyword_rule] = "complex_keywords"
+        length_rule = (word_counts > 20) & (overall > 0.2)
+        full_path |= length_rule
+        reasons[length_rule] = "long_complex_task"
+        to_golden = prefers_golden & full_path & (score < 0.8)
+        to_full = prefers_full & ~full_path & (score > 0.4)
+        full_path = (full_path & ~to_golden) | to_full
+        reasons[to_golden | to_full] = "user_preference"
+        return full_path, reasons
     
     def _calculate_decision_score(self, complexity: TaskComplexity, 
                                 performance: PerformancePrediction,
-                                user_prefs: UserPreferences) -> float:
+                                user_prefs: UserPreferences,
+                                config: Optional[RoutingConfig] = None) -> float:
         """Calculate weighted decision score"""
+        config = config or self.tuner.config_for(user_prefs.user_id)
         
         # Complexity score (0.0 = simple, 1.0 = complex)
         complexity_score = complexity.overall_score
@@ -405,9 +1349,9 @@ class HybridDecisionEngine:
         
         # Weighted combination
         final_score = (
-            settings.COMPLEXITY_WEIGHT * complexity_score +
-            settings.PERFORMANCE_WEIGHT * performance_score +
-            settings.USER_PREFERENCE_WEIGHT * user_score
+            config.complexity_weight * complexity_score +
+            config.performance_weight * performance_score +
+            config.user_preference_weight * user_score
         )
         
         return min(max(final_score, 0.0), 1.0)
@@ -427,38 +1371,51 @@ class HybridDecisionEngine:
         self.analytics.record_execution_result(
             task_id, prompt, path, execution_time, success, user_satisfaction
         )
+        
+        # Watch for success-rate regressions after a threshold change
+        self.tuner.observe(tenant_of(task_id), success)
     
     def get_system_stats(self) -> Dict[str, Any]:
         """Get comprehensive system statistics"""
         return {
             "cache_stats": self.cache.get_stats(),
+            "semantic_cache_stats": self.semantic_cache.get_stats() if self.semantic_cache else None,
             "analytics": self.analytics.get_stats(),
             "performance_models": self.learning_system.performance_models,
+            "regression_models": {path: model.summary() for path, model in self.learning_system.regressors.items()},
             "user_preferences_count": len(self.learning_system.user_preferences),
             "total_decisions": len(self.decision_history),
-            "last_threshold_update": self.last_threshold_update.isoformat()
+            "last_threshold_update": self.last_threshold_update.isoformat(),
+            "routing_tuner": self.tuner.get_stats()
         }
 
 class TaskComplexityAnalyzer:
     """Advanced task complexity analysis"""
     
-    def analyze(self, prompt: str) -> TaskComplexity:
+    def __init__(self):
+        keyword_matcher.register_all({
+            "simple_task": settings.SIMPLE_TASK_KEYWORDS,
+            "complex_task": settings.COMPLEX_TASK_KEYWORDS,
+            "context": CONTEXT_INDICATORS,
+            "routing_complex": ROUTING_COMPLEX_KEYWORDS
+        })
+    
+    def analyze(self, prompt: str, keyword_hits: Optional[Dict[str, set]] = None) -> TaskComplexity:
         """Analyze task complexity using multiple factors"""
+        if keyword_hits is None:
+            keyword_hits = keyword_matcher.scan(prompt)
         
         # Length analysis
         length_score = min(len(prompt) / 1000.0, 1.0)
         
         # Keyword analysis
-        prompt_lower = prompt.lower()
-        simple_matches = sum(1 for keyword in settings.SIMPLE_TASK_KEYWORDS 
-                           if keyword in prompt_lower)
-        complex_matches = sum(1 for keyword in settings.COMPLEX_TASK_KEYWORDS 
-                            if keyword in prompt_lower)
+        simple_matches = len(keyword_hits["simple_task"])
+        complex_matches = len(keyword_hits["complex_task"])
         
         keyword_score = complex_matches / max(simple_matches + complex_matches, 1)
         
         # Context analysis
-        context_score = self._analyze_context(prompt)
+        context_score = self._analyze_context(prompt, keyword_hits)
         
         # Historical analysis (placeholder for now)
         historical_score = 0.5
@@ -487,104 +1444,209 @@ class TaskComplexityAnalyzer:
             confidence=confidence
         )
     
-    def _analyze_context(self, prompt: str) -> float:
+    def _analyze_context(self, prompt: str, keyword_hits: Optional[Dict[str, set]] = None) -> float:
         """Analyze context complexity"""
-        # Simple heuristics for context analysis
-        context_indicators = [
-            "system", "architecture", "design", "framework",
-            "database", "api", "integration", "deployment",
-            "scalability", "performance", "security", "testing"
-        ]
+        if keyword_hits is None:
+            keyword_hits = keyword_matcher.scan(prompt)
+        matches = len(keyword_hits["context"])
         
-        prompt_lower = prompt.lower()
-        matches = sum(1 for indicator in context_indicators 
-                     if indicator in prompt_lower)
-        
-        return min(matches / len(context_indicators), 1.0)
+        return min(matches / len(CONTEXT_INDICATORS), 1.0)
+
+class RunningStats:
+    """Welford's online mean/variance: O(1) per sample, constant memory"""
+    
+    __slots__ = ("count", "mean", "m2", "min", "max")
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+    
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+    
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    def as_dict(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0, "mean": 0.0, "std": 0.0, "min": 0.0, "max": 0.0}
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.variance ** 0.5,
+            "min": self.min,
+            "max": self.max
+        }
+
+class LatencyHistogram:
+    """HDR-style log-bucketed histogram; percentiles are within ``precision`` relative error"""
+    
+    def __init__(self, lowest: float = 0.001, highest: float = 86400.0, precision: float = 0.02):
+        self.lowest = lowest
+        self._log_base = math.log1p(precision)
+        self.bucket_count = int(np.ceil(np.log(highest / lowest) / self._log_base)) + 2
+        self.counts = np.zeros(self.bucket_count, dtype=np.int64)
+        self.total = 0
+    
+    def _bucket(self, value: float) -> int:
+        if value <= self.lowest:
+            return 0
+        return min(int(math.log(value / self.lowest) / self._log_base) + 1, self.bucket_count - 1)
+    
+    def add(self, value: float):
+        self.counts[self._bucket(value)] += 1
+        self.total += 1
+    
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-th percentile (0-100)"""
+        if not self.total:
+            return 0.0
+        rank = max(int(np.ceil(q / 100.0 * self.total)), 1)
+        bucket = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return self.lowest * float(np.exp(bucket * self._log_base))
+
+class TimeBucketedRing:
+    """Fixed ring of time buckets (e.g. 60 x 1 minute) holding running stats per bucket"""
+    
+    def __init__(self, bucket_seconds: Optional[int] = None, buckets: Optional[int] = None):
+        self.bucket_seconds = bucket_seconds or settings.ANALYTICS_TREND_BUCKET_SECONDS
+        self.size = buckets or settings.ANALYTICS_TREND_BUCKETS
+        self.epochs = [-1] * self.size
+        self.stats = [RunningStats() for _ in range(self.size)]
+    
+    def add(self, value: float, now: Optional[float] = None):
+        epoch = int((now if now is not None else time.time()) // self.bucket_seconds)
+        slot = epoch % self.size
+        if self.epochs[slot] != epoch:
+            # Slot last held a bucket that has fallen out of the window
+            self.epochs[slot] = epoch
+            self.stats[slot] = RunningStats()
+        self.stats[slot].add(value)
+    
+    def series(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Oldest-to-newest non-empty buckets inside the window"""
+        current = int((now if now is not None else time.time()) // self.bucket_seconds)
+        points = []
+        for epoch in range(current - self.size + 1, current + 1):
+            slot = epoch % self.size
+            if self.epochs[slot] == epoch and self.stats[slot].count:
+                stats = self.stats[slot]
+                points.append({
+                    "timestamp": datetime.fromtimestamp(epoch * self.bucket_seconds).isoformat(),
+                    "count": stats.count,
+                    "mean": stats.mean
+                })
+        return points
 
 class AdvancedAnalytics:
-    """Advanced analytics and performance tracking"""
+    """Advanced analytics and performance tracking.
+
+    Everything is a streaming aggregate: memory is fixed per path and reason and
+    get_stats costs the same after ten decisions as after ten million.
+    """
+    
+    PATHS = ("golden_path", "full_workflow")
     
     def __init__(self):
-        self.decision_metrics = defaultdict(list)
-        self.execution_metrics = defaultdict(list)
-        self.performance_trends = defaultdict(list)
-        self.user_satisfaction = defaultdict(list)
+        self.decision_count = 0
+        self.path_counts = defaultdict(int)
+        self.reason_counts = defaultdict(int)
+        self.confidence_stats = RunningStats()
+        self.complexity_stats = RunningStats()
+        
+        self.execution_time_stats = defaultdict(RunningStats)
+        self.execution_time_histograms = defaultdict(LatencyHistogram)
+        self.success_stats = defaultdict(RunningStats)
+        self.satisfaction_stats = defaultdict(RunningStats)
+        self.execution_time_trends = defaultdict(TimeBucketedRing)
+        self.success_rate_trends = defaultdict(TimeBucketedRing)
+        self.satisfaction_trends = defaultdict(TimeBucketedRing)
+        self._lock = threading.Lock()
     
     def record_decision(self, prompt: str, decision: Dict[str, Any],
                        complexity: TaskComplexity, performance: PerformancePrediction):
         """Record decision metrics"""
-        timestamp = datetime.now()
-        
-        self.decision_metrics["total_decisions"].append({
-            "timestamp": timestamp,
-            "path": decision["path"],
-            "reason": decision["reason"],
-            "confidence": decision["confidence"],
-            "complexity_score": complexity.overall_score
-        })
+        self.record_decisions([{**decision, "complexity_score": complexity.overall_score}])
+    
+    def record_decisions(self, decisions: List[Dict[str, Any]]):
+        """Record decision metrics for a batch"""
+        with self._lock:
+            for decision in decisions:
+                self.decision_count += 1
+                self.path_counts[decision["path"]] += 1
+                self.reason_counts[decision["reason"]] += 1
+                self.confidence_stats.add(decision["confidence"])
+                self.complexity_stats.add(decision["complexity_score"])
     
     def record_execution_result(self, task_id: str, prompt: str, path: str,
                               execution_time: float, success: bool,
                               user_satisfaction: float):
         """Record execution result metrics"""
-        timestamp = datetime.now()
+        now = time.time()
+        success_value = 1.0 if success else 0.0
         
-        self.execution_metrics[path].append({
-            "timestamp": timestamp,
-            "execution_time": execution_time,
-            "success": success,
-            "user_satisfaction": user_satisfaction
-        })
-        
-        # Update performance trends
-        self.performance_trends[path].append({
-            "timestamp": timestamp,
-            "execution_time": execution_time,
-            "success_rate": 1.0 if success else 0.0
-        })
-        
-        # Update user satisfaction
-        self.user_satisfaction[path].append({
-            "timestamp": timestamp,
-            "satisfaction": user_satisfaction
-        })
+        with self._lock:
+            self.execution_time_stats[path].add(execution_time)
+            self.execution_time_histograms[path].add(execution_time)
+            self.success_stats[path].add(success_value)
+            self.satisfaction_stats[path].add(user_satisfaction)
+            
+            # Update performance trends
+            self.execution_time_trends[path].add(execution_time, now)
+            self.success_rate_trends[path].add(success_value, now)
+            
+            # Update user satisfaction
+            self.satisfaction_trends[path].add(user_satisfaction, now)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive analytics statistics"""
-        stats = {
-            "decision_metrics": {
-                "total_decisions": len(self.decision_metrics["total_decisions"]),
-                "path_distribution": defaultdict(int),
-                "avg_confidence": 0.0,
-                "avg_complexity": 0.0
-            },
-            "execution_metrics": {},
-            "performance_trends": {},
-            "user_satisfaction": {}
-        }
-        
-        # Calculate decision metrics
-        if self.decision_metrics["total_decisions"]:
-            decisions = self.decision_metrics["total_decisions"]
-            stats["decision_metrics"]["path_distribution"] = {
-                path: sum(1 for d in decisions if d["path"] == path)
-                for path in ["golden_path", "full_workflow"]
+        with self._lock:
+            stats = {
+                "decision_metrics": {
+                    "total_decisions": self.decision_count,
+                    "path_distribution": {path: self.path_counts.get(path, 0) for path in self.PATHS},
+                    "reason_distribution": dict(self.reason_counts),
+                    "avg_confidence": self.confidence_stats.mean,
+                    "avg_complexity": self.complexity_stats.mean
+                },
+                "execution_metrics": {},
+                "performance_trends": {},
+                "user_satisfaction": {}
             }
-            stats["decision_metrics"]["avg_confidence"] = np.mean([d["confidence"] for d in decisions])
-            stats["decision_metrics"]["avg_complexity"] = np.mean([d["complexity_score"] for d in decisions])
-        
-        # Calculate execution metrics for each path
-        for path in ["golden_path", "full_workflow"]:
-            if path in self.execution_metrics:
-                executions = self.execution_metrics[path]
-                if executions:
-                    stats["execution_metrics"][path] = {
-                        "total_executions": len(executions),
-                        "avg_execution_time": np.mean([e["execution_time"] for e in executions]),
-                        "success_rate": np.mean([1.0 if e["success"] else 0.0 for e in executions]),
-                        "avg_satisfaction": np.mean([e["user_satisfaction"] for e in executions])
-                    }
+            
+            # Calculate execution metrics for each path
+            for path in self.PATHS:
+                times = self.execution_time_stats.get(path)
+                if not times or not times.count:
+                    continue
+                histogram = self.execution_time_histograms[path]
+                stats["execution_metrics"][path] = {
+                    "total_executions": times.count,
+                    "avg_execution_time": times.mean,
+                    "std_execution_time": times.variance ** 0.5,
+                    "p50_execution_time": histogram.percentile(50),
+                    "p95_execution_time": histogram.percentile(95),
+                    "p99_execution_time": histogram.percentile(99),
+                    "success_rate": self.success_stats[path].mean,
+                    "avg_satisfaction": self.satisfaction_stats[path].mean
+                }
+                stats["performance_trends"][path] = {
+                    "execution_time": self.execution_time_trends[path].series(),
+                    "success_rate": self.success_rate_trends[path].series()
+                }
+                stats["user_satisfaction"][path] = {
+                    **self.satisfaction_stats[path].as_dict(),
+                    "trend": self.satisfaction_trends[path].series()
+                }
         
         return stats
 
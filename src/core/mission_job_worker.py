@@ -0,0 +1,203 @@
+"""
+Mission Job Worker - Runs durable mission jobs through the mission scheduler
+Claims jobs from the database queue only when a scheduler slot is free, heartbeats their
+leases while they run and records the outcome; any number of processes can run one
+
+Standalone worker process: python -m src.core.mission_job_worker
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from loguru import logger
+
+try:
+    from ..config.settings import settings
+    from ..models.job_queue import job_queue, JobQueue
+    from .mission_scheduler import mission_scheduler, MissionScheduler, SchedulerError
+except ImportError:
+    from config.settings import settings
+    from models.job_queue import job_queue, JobQueue
+    from core.mission_scheduler import mission_scheduler, MissionScheduler, SchedulerError
+
+
+async def run_mission_job(job: Dict[str, Any]) -> Any:
+    """Default job body: run the mission on the Cognitive Forge engine"""
+    try:
+        from .cognitive_forge_engine import cognitive_forge_engine
+    except ImportError:
+        from core.cognitive_forge_engine import cognitive_forge_engine
+    return await cognitive_forge_engine.run_mission(
+        job["prompt"], job["mission_id_str"], job["agent_type"] or "developer", False
+    )
+
+
+class MissionJobRunner:
+    """Bridges the durable ``JobQueue`` to a local ``MissionScheduler``"""
+
+    def __init__(self, queue: Optional[JobQueue] = None, scheduler: Optional[MissionScheduler] = None,
+                 execute: Optional[Callable[[Dict[str, Any]], Awaitable[Any]]] = None,
+                 worker_id: Optional[str] = None):
+        self.queue = queue or job_queue
+        self.scheduler = scheduler or mission_scheduler
+        self.execute = execute or run_mission_job
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.poll_interval = settings.JOB_POLL_INTERVAL
+        self.heartbeat_interval = settings.JOB_HEARTBEAT_INTERVAL
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks = []
+        self._cancel_reasons: Dict[str, str] = {}
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        self._stopping = False
+        self.stats = {"claimed": 0, "completed": 0, "failed": 0, "cancelled": 0, "released": 0, "lost": 0}
+
+    def start(self):
+        if self._tasks:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._claim_loop(), name="mission-job-claim"),
+            asyncio.create_task(self._recovery_loop(), name="mission-job-recovery"),
+        ]
+        logger.info(f"📥 Mission job worker {self.worker_id} started")
+
+    async def stop(self, timeout: float = 10):
+        """Stop claiming; missions still running locally are cancelled and their jobs released"""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for mission_id in list(self._inflight):
+            self.scheduler.cancel(mission_id)
+        deadline = asyncio.get_running_loop().time() + timeout
+        while self._inflight and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.05)
+
+    def notify(self):
+        """Wake the claim loop right away (a job was just enqueued by this process)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # --- Loops ---
+
+    async def _claim_loop(self):
+        while True:
+            try:
+                free = self.scheduler.idle_slots()
+                jobs = await asyncio.to_thread(self.queue.claim, self.worker_id, free) if free else []
+                for job in jobs:
+                    self._dispatch(job)
+            except Exception as e:
+                logger.error(f"❌ Mission job claim failed: {e}")
+                jobs = []
+            if not jobs:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _recovery_loop(self):
+        """Requeue leases abandoned by crashed workers and expire old results"""
+        while True:
+            try:
+                await asyncio.to_thread(self.queue.requeue_expired)
+                await asyncio.to_thread(self.queue.purge)
+            except Exception as e:
+                logger.error(f"❌ Mission job recovery failed: {e}")
+            await asyncio.sleep(self.queue.lease_seconds / 2)
+
+    # --- Per job ---
+
+    def _dispatch(self, job: Dict[str, Any]):
+        mission_id = job["mission_id_str"]
+        try:
+            ticket = self.scheduler.submit(mission_id, lambda: self._run(job), priority=job["priority_rank"])
+        except SchedulerError as e:
+            # Another path is already running this mission here, or we are shutting down
+            logger.warning(f"⚠️ Releasing job for {mission_id}: {e}")
+            asyncio.create_task(asyncio.to_thread(self.queue.release, job["id"], self.worker_id))
+            self.stats["released"] += 1
+            return
+        self.stats["claimed"] += 1
+        self._inflight[mission_id] = job
+        ticket.future.add_done_callback(lambda f: asyncio.create_task(self._settle(job, f)))
+
+    async def _run(self, job: Dict[str, Any]) -> Any:
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            return await self.execute(job)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job: Dict[str, Any]):
+        mission_id = job["mission_id_str"]
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                state = await asyncio.to_thread(self.queue.heartbeat, job["id"], self.worker_id)
+            except Exception as e:
+                logger.error(f"❌ Heartbeat for {mission_id} failed: {e}")
+                continue
+            if state != "ok":
+                self._cancel_reasons[mission_id] = state
+                self.scheduler.cancel(mission_id)
+                return
+
+    async def _settle(self, job: Dict[str, Any], future: asyncio.Future):
+        """Write the outcome back to the queue (fenced on our lease)"""
+        job_id, mission_id = job["id"], job["mission_id_str"]
+        reason = self._cancel_reasons.pop(mission_id, None)
+        try:
+            if future.cancelled():
+                if reason == "lost":
+                    self.stats["lost"] += 1  # someone else owns the job now; nothing to record
+                elif self._stopping and reason is None:
+                    await asyncio.to_thread(self.queue.release, job_id, self.worker_id)
+                    self.stats["released"] += 1
+                else:
+                    await asyncio.to_thread(self.queue.mark_cancelled, job_id, self.worker_id)
+                    self.stats["cancelled"] += 1
+            elif future.exception() is not None:
+                exc = future.exception()
+                timed_out = isinstance(exc, asyncio.TimeoutError)
+                # Timeouts are deterministic enough not to retry; crashes in the run itself are retried
+                await asyncio.to_thread(self.queue.fail, job_id, self.worker_id,
+                                        str(exc) or type(exc).__name__, not timed_out)
+                self.stats["failed"] += 1
+            else:
+                await asyncio.to_thread(self.queue.complete, job_id, self.worker_id, future.result())
+                self.stats["completed"] += 1
+        except Exception as e:
+            logger.error(f"❌ Could not record outcome of job for {mission_id}: {e}")
+        self._inflight.pop(mission_id, None)
+        self.notify()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"worker_id": self.worker_id, "running": bool(self._tasks), "inflight": len(self._inflight), **self.stats}
+
+
+# Global mission job runner instance
+mission_job_runner = MissionJobRunner()
+
+
+async def _serve():
+    mission_scheduler.start()
+    mission_job_runner.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await mission_job_runner.stop()
+        await mission_scheduler.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        logger.info("📥 Mission job worker stopped")
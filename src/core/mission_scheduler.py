@@ -0,0 +1,274 @@
+"""
+Mission Scheduler - Bounded admission and execution for mission runs
+A fixed pool of worker slots drains a priority queue (FIFO within a priority level)
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from loguru import logger
+
+try:
+    from ..config.settings import settings
+except ImportError:
+    from config.settings import settings
+
+
+# Mission.priority is stored as a string; lower rank runs first
+PRIORITY_RANKS = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+DEFAULT_PRIORITY = "medium"
+
+
+def priority_rank(priority: Union[str, int, None]) -> int:
+    """Map a Mission.priority value (or a raw integer rank) to a queue rank"""
+    if isinstance(priority, int) and not isinstance(priority, bool):
+        return priority
+    return PRIORITY_RANKS.get(str(priority or DEFAULT_PRIORITY).lower(), PRIORITY_RANKS[DEFAULT_PRIORITY])
+
+
+class SchedulerError(Exception):
+    """Base class for admission failures; ``status_code`` is the HTTP status to surface"""
+    status_code = 503
+
+
+class QueueFullError(SchedulerError):
+    status_code = 429
+
+
+class SchedulerUnavailableError(SchedulerError):
+    status_code = 503
+
+
+class DuplicateMissionError(SchedulerError):
+    status_code = 409
+
+
+@dataclass
+class MissionTicket:
+    """A submitted mission; ``future`` resolves with the runner's result"""
+    mission_id: str
+    rank: int
+    seq: int
+    run: Callable[[], Awaitable[Any]]
+    future: asyncio.Future
+    timeout: float
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    state: str = "queued"  # queued | running | completed | failed | timeout | cancelled
+    task: Optional[asyncio.Task] = None
+
+    def __lt__(self, other: "MissionTicket") -> bool:
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+
+class MissionScheduler:
+    """Runs at most ``max_concurrent`` missions at once and holds at most ``max_queued`` more.
+
+    Submissions beyond the queue bound are rejected immediately (``QueueFullError``)
+    rather than buffered, so a burst costs a 429 per excess request instead of an
+    unbounded pile of tasks each holding an LLM call open.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, max_queued: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        self.max_concurrent = max(1, max_concurrent or settings.MAX_CONCURRENT_MISSIONS)
+        self.max_queued = max(0, max_queued if max_queued is not None else settings.MISSION_QUEUE_SIZE)
+        self.timeout = timeout or settings.MISSION_TIMEOUT
+
+        self._heap: List[MissionTicket] = []
+        self._tickets: Dict[str, MissionTicket] = {}
+        self._seq = itertools.count()
+        self._items: Optional[asyncio.Semaphore] = None
+        self._workers: List[asyncio.Task] = []
+        self._accepting = False
+
+        self.stats = {
+            "submitted": 0,
+            "rejected_full": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+        }
+        self._wait_total = 0.0
+        self._run_total = 0.0
+
+    # --- Lifecycle ---
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self):
+        """Spawn the worker slots on the running event loop"""
+        if self._workers:
+            return
+        self._items = asyncio.Semaphore(0)
+        self._accepting = True
+        self._workers = [asyncio.create_task(self._worker(i), name=f"mission-worker-{i}")
+                         for i in range(self.max_concurrent)]
+        logger.info(f"🚦 Mission scheduler started: {self.max_concurrent} slots, queue bound {self.max_queued}")
+
+    async def stop(self, drain_timeout: float = 0):
+        """Stop admitting work, cancel everything still queued, then stop the workers"""
+        self._accepting = False
+        while self._heap:
+            self._cancel_ticket(heapq.heappop(self._heap))
+        if drain_timeout:
+            running = [t.task for t in self._tickets.values() if t.task is not None]
+            if running:
+                await asyncio.wait(running, timeout=drain_timeout)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("🚦 Mission scheduler stopped")
+
+    # --- Admission ---
+
+    def submit(self, mission_id: str, run: Callable[[], Awaitable[Any]],
+               priority: Union[str, int, None] = None, timeout: Optional[float] = None) -> MissionTicket:
+        """Queue ``run`` for execution; raises a ``SchedulerError`` instead of over-admitting"""
+        if not self._accepting:
+            raise SchedulerUnavailableError("Mission scheduler is not accepting work")
+        if mission_id in self._tickets:
+            raise DuplicateMissionError(f"Mission {mission_id} is already {self._tickets[mission_id].state}")
+        if len(self._tickets) >= self.max_concurrent + self.max_queued:
+            self.stats["rejected_full"] += 1
+            raise QueueFullError(f"Mission queue is full ({self.max_queued} waiting)")
+
+        ticket = MissionTicket(
+            mission_id=mission_id,
+            rank=priority_rank(priority),
+            seq=next(self._seq),
+            run=run,
+            future=asyncio.get_running_loop().create_future(),
+            timeout=timeout or self.timeout,
+        )
+        heapq.heappush(self._heap, ticket)
+        self._tickets[mission_id] = ticket
+        self.stats["submitted"] += 1
+        self._items.release()
+        return ticket
+
+    def cancel(self, mission_id: str) -> Optional[str]:
+        """Cancel a queued or running mission; returns the state it was in, or None if unknown"""
+        ticket = self._tickets.get(mission_id)
+        if ticket is None:
+            return None
+        previous = ticket.state
+        if previous == "queued":
+            self._heap.remove(ticket)
+            heapq.heapify(self._heap)
+            self._cancel_ticket(ticket)
+        elif previous == "running" and ticket.task is not None:
+            ticket.task.cancel()
+        return previous
+
+    def position(self, mission_id: str) -> Optional[int]:
+        """0-based place in the queue (missions ahead of this one), None if not queued"""
+        ticket = self._tickets.get(mission_id)
+        if ticket is None or ticket.state != "queued":
+            return None
+        return sum(1 for other in self._heap if other < ticket)
+
+    def get_ticket(self, mission_id: str) -> Optional[MissionTicket]:
+        return self._tickets.get(mission_id)
+
+    def idle_slots(self) -> int:
+        """Worker slots that would start a new submission immediately"""
+        if not self._accepting:
+            return 0
+        return max(0, self.max_concurrent - len(self._tickets))
+
+    def _cancel_ticket(self, ticket: MissionTicket):
+        ticket.state = "cancelled"
+        self._tickets.pop(ticket.mission_id, None)
+        self.stats["cancelled"] += 1
+        if not ticket.future.done():
+            ticket.future.cancel()
+
+    # --- Execution ---
+
+    async def _worker(self, slot: int):
+        while True:
+            await self._items.acquire()
+            if not self._heap:
+                continue  # the entry was cancelled while queued
+            ticket = heapq.heappop(self._heap)
+            await self._execute(ticket)
+
+    async def _execute(self, ticket: MissionTicket):
+        ticket.state = "running"
+        ticket.started_at = time.monotonic()
+        self._wait_total += ticket.started_at - ticket.submitted_at
+        ticket.task = asyncio.create_task(ticket.run())
+        try:
+            result = await asyncio.wait_for(asyncio.shield(ticket.task), timeout=ticket.timeout)
+            ticket.state = "completed"
+            self.stats["completed"] += 1
+            if not ticket.future.done():
+                ticket.future.set_result(result)
+        except asyncio.TimeoutError:
+            ticket.task.cancel()
+            await asyncio.gather(ticket.task, return_exceptions=True)
+            ticket.state = "timeout"
+            self.stats["timed_out"] += 1
+            logger.warning(f"⏱️ Mission {ticket.mission_id} exceeded {ticket.timeout:.0f}s and was cancelled")
+            if not ticket.future.done():
+                ticket.future.set_exception(asyncio.TimeoutError(f"Mission exceeded {ticket.timeout:.0f}s"))
+        except asyncio.CancelledError:
+            if not ticket.task.done():
+                # The worker itself is being stopped; take the mission down with it
+                ticket.task.cancel()
+                await asyncio.gather(ticket.task, return_exceptions=True)
+                self._finish(ticket, cancelled=True)
+                raise
+            self._finish(ticket, cancelled=True)
+            return
+        except Exception as e:
+            ticket.state = "failed"
+            self.stats["failed"] += 1
+            if not ticket.future.done():
+                ticket.future.set_exception(e)
+        self._finish(ticket)
+
+    def _finish(self, ticket: MissionTicket, cancelled: bool = False):
+        if cancelled:
+            ticket.state = "cancelled"
+            self.stats["cancelled"] += 1
+            if not ticket.future.done():
+                ticket.future.cancel()
+        self._run_total += time.monotonic() - ticket.started_at
+        ticket.task = None
+        self._tickets.pop(ticket.mission_id, None)
+
+    # --- Reporting ---
+
+    def get_stats(self) -> Dict[str, Any]:
+        running = [t for t in self._tickets.values() if t.state == "running"]
+        started = self.stats["completed"] + self.stats["failed"] + self.stats["timed_out"]
+        by_priority: Dict[int, int] = {}
+        for ticket in self._heap:
+            by_priority[ticket.rank] = by_priority.get(ticket.rank, 0) + 1
+        return {
+            **self.stats,
+            "running": len(running),
+            "queued": len(self._heap),
+            "queued_by_rank": by_priority,
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "timeout_seconds": self.timeout,
+            "accepting": self._accepting,
+            "avg_wait_seconds": self._wait_total / max(1, started + len(running)),
+            "avg_run_seconds": self._run_total / max(1, started),
+            "running_missions": [t.mission_id for t in running],
+        }
+
+
+# Global mission scheduler instance
+mission_scheduler = MissionScheduler()
@@ -0,0 +1,185 @@
+"""
+Mission Worker Pool - Runs mission execution in separate worker processes
+The API process stays thin: missions reach the workers through the durable job queue and
+each worker's log events are forwarded back over a multiprocessing queue for live streaming
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+try:
+    from ..config.settings import settings
+except ImportError:
+    from config.settings import settings
+
+
+EVENT_QUEUE_SIZE = 10000
+RESTART_BACKOFF_SECONDS = 5
+
+
+def _forwarding_sink(events, index: int):
+    """loguru sink that ships each record to the API process; drops when the API falls behind"""
+    def sink(message):
+        record = message.record
+        entry = {
+            "timestamp": record["time"].astimezone(timezone.utc).replace(tzinfo=None).isoformat(),
+            "level": record["level"].name,
+            "message": record["message"],
+            "source": "mission_worker",
+            "worker": index,
+            "server_port": "8002",
+        }
+        try:
+            events.put_nowait(entry)
+        except queue.Full:
+            pass
+    return sink
+
+
+def _worker_main(index: int, events):
+    """Entry point of a worker process: drain the job queue until SIGTERM"""
+    logger.add(_forwarding_sink(events, index), level="INFO", format="{message}")
+    try:
+        from .mission_job_worker import mission_job_runner
+        from .mission_scheduler import mission_scheduler
+    except ImportError:
+        from core.mission_job_worker import mission_job_runner
+        from core.mission_scheduler import mission_scheduler
+
+    async def serve():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: terminate() kills the process outright; leases then expire
+        mission_scheduler.start()
+        mission_job_runner.start()
+        logger.info(f"⚙️ Mission worker {index} ready (pid {os.getpid()})")
+        await stop.wait()
+        # Running missions are cancelled and their jobs released for another worker
+        await mission_job_runner.stop()
+        await mission_scheduler.stop()
+
+    asyncio.run(serve())
+
+
+class MissionWorkerPool:
+    """Supervises ``processes`` mission workers and relays their events to ``on_event``"""
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes = processes if processes is not None else settings.MISSION_WORKER_PROCESSES
+        # spawn: workers must not inherit the API's event loop, DB connections or threads
+        self._ctx = multiprocessing.get_context("spawn")
+        self._events = None
+        self._workers: List[Optional[multiprocessing.Process]] = []
+        self._restarts: List[int] = []
+        self._on_event: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reader: Optional[threading.Thread] = None
+        self._supervisor: Optional[asyncio.Task] = None
+        self._stopping = threading.Event()
+        self.events_forwarded = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 0
+
+    def start(self, on_event: Optional[Callable[[Dict[str, Any]], None]] = None):
+        if not self.enabled or self._workers:
+            return
+        self._on_event = on_event
+        self._loop = asyncio.get_running_loop()
+        self._stopping.clear()
+        self._events = self._ctx.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self._workers = [None] * self.processes
+        self._restarts = [0] * self.processes
+        for index in range(self.processes):
+            self._spawn(index)
+        self._reader = threading.Thread(target=self._read_events, name="mission-worker-events", daemon=True)
+        self._reader.start()
+        self._supervisor = asyncio.create_task(self._supervise())
+        logger.info(f"⚙️ Mission worker pool started with {self.processes} processes")
+
+    def _spawn(self, index: int):
+        process = self._ctx.Process(
+            target=_worker_main, args=(index, self._events), name=f"mission-worker-{index}", daemon=True
+        )
+        process.start()
+        self._workers[index] = process
+
+    async def _supervise(self):
+        """Replace workers that died; their leased jobs are requeued once the leases expire"""
+        while True:
+            await asyncio.sleep(RESTART_BACKOFF_SECONDS)
+            for index, process in enumerate(self._workers):
+                if process is not None and not process.is_alive():
+                    logger.error(f"❌ Mission worker {index} exited with code {process.exitcode}; restarting")
+                    self._restarts[index] += 1
+                    self._spawn(index)
+
+    def _read_events(self):
+        """Reader thread: hand worker events to the API event loop"""
+        while not self._stopping.is_set():
+            try:
+                entry = self._events.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            self.events_forwarded += 1
+            if self._on_event is not None:
+                self._loop.call_soon_threadsafe(self._on_event, entry)
+
+    async def stop(self, timeout: float = 15):
+        if not self._workers:
+            return
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            await asyncio.gather(self._supervisor, return_exceptions=True)
+        for process in self._workers:
+            if process is not None and process.is_alive():
+                process.terminate()  # SIGTERM: graceful stop that releases running jobs
+        deadline = time.monotonic() + timeout
+        for process in self._workers:
+            if process is None:
+                continue
+            await asyncio.to_thread(process.join, max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+        self._stopping.set()
+        if self._reader is not None:
+            await asyncio.to_thread(self._reader.join, 2)
+        self._workers = []
+        logger.info("⚙️ Mission worker pool stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "processes": self.processes,
+            "workers": [
+                {
+                    "index": index,
+                    "pid": process.pid if process else None,
+                    "alive": bool(process and process.is_alive()),
+                    "restarts": self._restarts[index] if index < len(self._restarts) else 0,
+                }
+                for index, process in enumerate(self._workers)
+            ],
+            "events_forwarded": self.events_forwarded,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+
+# Global mission worker pool instance
+mission_worker_pool = MissionWorkerPool()
@@ -5,12 +5,172 @@ Implements high-performance WebSocket connections with advanced features
 
 import asyncio
 import json
+import time
 import uuid
+import zlib
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, Set, Any, Optional, List
+from typing import Deque, Dict, Set, Any, Optional, List, Union
 from fastapi import WebSocket, WebSocketDisconnect
 from loguru import logger
 
+try:
+    from ..config.settings import settings
+    from ..utils.timer_wheel import TimerWheel
+    from .websocket_fanout_bus import FanoutBus, create_fanout_bus
+except ImportError:
+    from config.settings import settings
+    from utils.timer_wheel import TimerWheel
+    from core.websocket_fanout_bus import FanoutBus, create_fanout_bus
+
+# Optional fast/binary encoders
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Wire encodings a client can negotiate; json is a text frame, the others are binary frames
+ENCODING_JSON = "json"
+ENCODING_DEFLATE = "json+deflate"  # raw DEFLATE (wbits=-15) of the JSON frame
+ENCODING_MSGPACK = "msgpack"
+
+
+def dumps_json(message: Any) -> str:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(message, default=str)
+
+
+def deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def msgpack_array_header(length: int) -> bytes:
+    if length < 16:
+        return bytes([0x90 | length])
+    if length < 0x10000:
+        return b"\xdc" + length.to_bytes(2, "big")
+    return b"\xdd" + length.to_bytes(4, "big")
+
+
+class EncodedMessage:
+    """A message plus its lazily built wire encodings, shared by every recipient of a broadcast.
+
+    Each encoding is produced at most once no matter how many clients receive it.
+    """
+
+    __slots__ = ("message", "_encoded")
+
+    def __init__(self, message: Dict[str, Any]):
+        self.message = message
+        self._encoded: Dict[str, Union[str, bytes]] = {}
+
+    def encode(self, encoding: str, stats: Dict[str, Dict[str, float]]) -> Union[str, bytes]:
+        encoded = self._encoded.get(encoding)
+        if encoded is None:
+            started = time.process_time()
+            if encoding == ENCODING_MSGPACK:
+                encoded = msgpack.packb(self.message, default=str)
+            elif encoding == ENCODING_DEFLATE:
+                encoded = deflate(self.encode(ENCODING_JSON, stats).encode())
+            else:
+                encoded = dumps_json(self.message)
+            self._encoded[encoding] = encoded
+            counters = stats[encoding]
+            counters["messages_encoded"] += 1
+            counters["encode_cpu_ms"] += (time.process_time() - started) * 1000
+        return encoded
+
+
+class ClientConnection:
+    """Per-socket outbound state: a bounded send queue drained by a dedicated writer task.
+
+    Messages whose type is in the manager's ``coalesce_types`` replace any copy of the
+    same type still waiting in the queue, so a slow client only ever sees the latest one.
+    """
+
+    def __init__(self, websocket: WebSocket, metadata: Dict[str, Any], max_queue: int):
+        self.websocket = websocket
+        self.metadata = metadata
+        self.max_queue = max_queue
+        self.encoding = metadata.get("encoding", ENCODING_JSON)
+        self.queue: Deque[list] = deque()  # [EncodedMessage, enqueued_at, coalesce_key] slots
+        self.urgent: Deque[list] = deque()  # pings: sent before the backlog, outside the overflow bound
+        self.pending_keys: Dict[str, list] = {}
+        self.wakeup = asyncio.Event()
+        self.writer: Optional[asyncio.Task] = None
+        self.closed = False
+        self.dropped = 0
+        self.coalesced = 0
+        self.topics: Set[str] = set()  # empty = legacy firehose, receives every broadcast
+        # Heartbeat state (monotonic clock)
+        self.last_seen = time.monotonic()
+        self.ping_id: Optional[str] = None
+        self.ping_sent_at = 0.0
+        self.rtt_ms: Optional[float] = None  # smoothed round-trip time
+        self.last_rtt_ms: Optional[float] = None
+        self.pings_sent = 0
+        self.pongs_received = 0
+
+    def push(self, message: EncodedMessage, coalesce_key: Optional[str] = None, urgent: bool = False) -> Optional[str]:
+        """Queue without blocking; returns "coalesced", "dropped" or "overflow" when the message was not simply appended.
+
+        ``urgent`` messages (pings) jump the backlog and are never shed.
+        """
+        if self.closed:
+            return "dropped"
+        if urgent:
+            self.urgent.append([message, time.perf_counter(), None])
+            self.wakeup.set()
+            return None
+        if coalesce_key is not None:
+            slot = self.pending_keys.get(coalesce_key)
+            if slot is not None:
+                slot[0] = message
+                self.coalesced += 1
+                return "coalesced"
+        outcome = None
+        if len(self.queue) >= self.max_queue:
+            outcome = "overflow"
+            oldest = self.queue.popleft()
+            if oldest[2] is not None:
+                self.pending_keys.pop(oldest[2], None)
+            self.dropped += 1
+        slot = [message, time.perf_counter(), coalesce_key]
+        self.queue.append(slot)
+        if coalesce_key is not None:
+            self.pending_keys[coalesce_key] = slot
+        self.wakeup.set()
+        return outcome
+
+    def take(self, limit: int) -> List[list]:
+        batch = []
+        while self.urgent and len(batch) < limit:
+            batch.append(self.urgent.popleft())
+        while self.queue and len(batch) < limit:
+            slot = self.queue.popleft()
+            if slot[2] is not None:
+                self.pending_keys.pop(slot[2], None)
+            batch.append(slot)
+        if not self.queue and not self.urgent:
+            self.wakeup.clear()
+        return batch
+
+    def close(self):
+        self.closed = True
+        self.queue.clear()
+        self.urgent.clear()
+        self.pending_keys.clear()
+        self.wakeup.set()
+
 
 class SuperchargedWebSocketManager:
     """Advanced WebSocket manager with performance optimizations and reliability features"""
@@ -18,12 +178,26 @@ class SuperchargedWebSocketManager:
     def __init__(self):
         self.active_connections: Set[WebSocket] = set()
         self.connection_metadata: Dict[WebSocket, Dict[str, Any]] = {}
-        self.message_queue: asyncio.Queue = asyncio.Queue(maxsize=10000)
+        self.connections: Dict[WebSocket, ClientConnection] = {}
+        # Inverted index: topic -> subscribed connections; connections without topics get everything
+        self.topic_subscribers: Dict[str, Set[ClientConnection]] = {}
+        self.firehose: Set[ClientConnection] = set()
+        # Cross-process backplane; broadcasts published before it starts are delivered locally
+        self.fanout_bus: FanoutBus = create_fanout_bus()
+        self._bus_started = False
+        self._recent_broadcast_ids: "OrderedDict[str, None]" = OrderedDict()
+        self.dedup_window = 4096
         self.performance_stats = {
             "total_connections": 0,
             "current_connections": 0,
             "messages_sent": 0,
+            "frames_sent": 0,
+            "messages_dropped": 0,
+            "messages_coalesced": 0,
+            "slow_consumer_disconnects": 0,
             "bytes_transferred": 0,
+            "duplicates_suppressed": 0,
+            "heartbeat_timeouts": 0,
             "average_latency_ms": 0,
             "connection_uptime": {}
         }
@@ -31,22 +205,59 @@ class SuperchargedWebSocketManager:
         
         # Advanced features
         self.message_compression = True
-        self.heartbeat_interval = 30
+        self.heartbeat_interval = settings.WEBSOCKET_PING_INTERVAL  # ping a client after this long without hearing from it
+        self.ping_timeout = settings.WEBSOCKET_PING_TIMEOUT  # reap it if the pong takes longer than this
+        self.heartbeat_wheel = TimerWheel(tick=1.0, slots=64)
         self.max_connections = 1000
         self.rate_limiting = True
         self.message_batching = True
         self.batch_size = 10
         self.batch_timeout = 0.1
+
+        # Slow-consumer handling: each client gets at most send_queue_size pending messages;
+        # on overflow "drop_oldest" sheds the oldest one, "disconnect" closes the client
+        self.send_queue_size = 256
+        self.slow_consumer_policy = "drop_oldest"
+        self.send_timeout = 10.0
+        self.coalesce_types: Set[str] = {"system_metrics", "performance_update"}
+        self.max_topics_per_connection = 100
+
+        # Per-encoding counters: encode CPU is paid once per message, bytes once per frame sent
+        self.encoding_stats: Dict[str, Dict[str, float]] = {
+            encoding: {"messages_encoded": 0, "encode_cpu_ms": 0.0, "frames_sent": 0, "bytes_sent": 0}
+            for encoding in (ENCODING_JSON, ENCODING_DEFLATE, ENCODING_MSGPACK)
+        }
         
     async def start_background_tasks(self):
         """Start background tasks for message processing and health monitoring"""
         if not self.running:
             self.running = True
-            asyncio.create_task(self._message_processor())
-            asyncio.create_task(self._health_monitor())
+            await self.fanout_bus.start(self._deliver_envelope)
+            self._bus_started = True
+            asyncio.create_task(self._heartbeat_loop())
             asyncio.create_task(self._performance_monitor())
             logger.info("🚀 SuperchargedWebSocketManager background tasks started")
     
+    def supported_encodings(self) -> List[str]:
+        encodings = [ENCODING_JSON]
+        if self.message_compression:
+            encodings.append(ENCODING_DEFLATE)
+        if MSGPACK_AVAILABLE:
+            encodings.append(ENCODING_MSGPACK)
+        return encodings
+    
+    def _negotiate_encoding(self, websocket: WebSocket, client_info: Dict[str, Any]) -> str:
+        """Pick the client's requested encoding (client_info or ?encoding=), falling back to JSON"""
+        requested = client_info.get("encoding")
+        if not requested:
+            query_params = getattr(websocket, "query_params", None)
+            requested = query_params.get("encoding") if query_params else None
+        if requested in self.supported_encodings():
+            return requested
+        if requested:
+            logger.debug(f"🔌 Unsupported WebSocket encoding {requested!r}; using {ENCODING_JSON}")
+        return ENCODING_JSON
+    
     async def connect(self, websocket: WebSocket, client_info: Dict[str, Any] = None) -> bool:
         """Enhanced connection handling with metadata and limits"""
         try:
@@ -60,13 +271,23 @@ class SuperchargedWebSocketManager:
             
             # Store connection metadata
             connection_id = str(uuid.uuid4())
-            self.connection_metadata[websocket] = {
+            client_info = client_info or {}
+            metadata = {
                 "id": connection_id,
                 "connected_at": datetime.utcnow(),
-                "client_info": client_info or {},
+                "client_info": client_info,
+                "encoding": self._negotiate_encoding(websocket, client_info),
                 "messages_sent": 0,
                 "last_activity": datetime.utcnow()
             }
+            self.connection_metadata[websocket] = metadata
+            connection = ClientConnection(websocket, metadata, self.send_queue_size)
+            self.connections[websocket] = connection
+            self.firehose.add(connection)
+            if client_info.get("topics"):
+                self.subscribe(connection, client_info["topics"])
+            connection.writer = asyncio.create_task(self._connection_writer(connection))
+            self.heartbeat_wheel.schedule(connection, self.heartbeat_interval)
             
             # Update stats
             self.performance_stats["total_connections"] += 1
@@ -80,10 +301,15 @@ class SuperchargedWebSocketManager:
                 "type": "connection_established",
                 "connection_id": connection_id,
                 "server_time": datetime.utcnow().isoformat(),
+                "encoding": metadata["encoding"],
+                "topics": sorted(connection.topics),
                 "features": {
                     "compression": self.message_compression,
+                    "encodings": self.supported_encodings(),
                     "batching": self.message_batching,
-                    "heartbeat": self.heartbeat_interval
+                    "batch_format": "json_array",
+                    "heartbeat": self.heartbeat_interval,
+                    "ping_timeout": self.ping_timeout
                 }
             })
             
@@ -98,7 +324,13 @@ class SuperchargedWebSocketManager:
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
             
-            # Clean up metadata
+            # Stop the writer (it exits on its own once the queue is closed) and clean up metadata
+            connection = self.connections.pop(websocket, None)
+            if connection is not None:
+                self.heartbeat_wheel.cancel(connection)
+                self.unsubscribe(connection, list(connection.topics))
+                self.firehose.discard(connection)
+                connection.close()
             metadata = self.connection_metadata.pop(websocket, {})
             connection_id = metadata.get("id", "unknown")
             
@@ -109,10 +341,111 @@ class SuperchargedWebSocketManager:
             
             logger.info(f"🔌 WebSocket disconnected: {connection_id} (Total: {len(self.active_connections)})")
     
-    async def broadcast(self, message: Dict[str, Any], message_type: str = "broadcast"):
-        """Enhanced broadcast with performance optimizations"""
-        if not self.active_connections:
+    def subscribe(self, connection: ClientConnection, topics: List[str]) -> List[str]:
+        """Add topics (e.g. ``mission:<id>``, ``system_metrics``, ``logs:error`` or ``mission:*``) to a connection"""
+        added = []
+        for topic in topics:
+            if not isinstance(topic, str) or not topic or topic in connection.topics:
+                continue
+            if len(connection.topics) >= self.max_topics_per_connection:
+                logger.warning(f"📡 Topic limit reached for WebSocket {connection.metadata['id']}")
+                break
+            connection.topics.add(topic)
+            self.topic_subscribers.setdefault(topic, set()).add(connection)
+            added.append(topic)
+        if connection.topics:
+            self.firehose.discard(connection)
+        return added
+    
+    def unsubscribe(self, connection: ClientConnection, topics: List[str]) -> List[str]:
+        removed = []
+        for topic in topics:
+            if topic not in connection.topics:
+                continue
+            connection.topics.discard(topic)
+            subscribers = self.topic_subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(connection)
+                if not subscribers:
+                    del self.topic_subscribers[topic]
+            removed.append(topic)
+        if not connection.topics and connection.websocket in self.connections:
+            self.firehose.add(connection)
+        return removed
+    
+    def _recipients(self, topic: str) -> Set[ClientConnection]:
+        """Subscribers of the topic, of its ``prefix:*`` wildcard, and every firehose connection"""
+        recipients = set(self.firehose)
+        subscribers = self.topic_subscribers.get(topic)
+        if subscribers:
+            recipients |= subscribers
+        prefix, sep, _ = topic.partition(":")
+        if sep:
+            wildcard = self.topic_subscribers.get(f"{prefix}:*")
+            if wildcard:
+                recipients |= wildcard
+        return recipients
+    
+    async def handle_client_message(self, websocket: WebSocket, data: Union[str, Dict[str, Any]]):
+        """Handle a control message from a client: subscribe, unsubscribe, list_subscriptions, ping or pong"""
+        connection = self.connections.get(websocket)
+        if connection is None:
+            return
+        # Anything the client sends proves it is alive
+        connection.last_seen = time.monotonic()
+        connection.metadata["last_activity"] = datetime.utcnow()
+        try:
+            request = json.loads(data) if isinstance(data, str) else data
+        except json.JSONDecodeError:
+            await self.send_to_websocket(websocket, {"type": "error", "error": "Invalid JSON"})
             return
+        if not isinstance(request, dict):
+            request = {}
+        action = request.get("action")
+        topics = request.get("topics") or request.get("topic") or []
+        if isinstance(topics, str):
+            topics = [topics]
+        
+        if action == "pong":
+            self._record_pong(connection, request.get("ping_id"))
+            return
+        if action == "ping":
+            await self.send_to_websocket(websocket, {"type": "pong", "ping_id": request.get("ping_id"),
+                                                     "server_time": datetime.utcnow().isoformat()})
+            return
+        if action == "subscribe":
+            changed = self.subscribe(connection, topics)
+        elif action == "unsubscribe":
+            changed = self.unsubscribe(connection, topics)
+        elif action == "list_subscriptions":
+            changed = []
+        else:
+            await self.send_to_websocket(websocket, {"type": "error", "error": f"Unknown action: {action}"})
+            return
+        await self.send_to_websocket(websocket, {
+            "type": "subscriptions",
+            "action": action,
+            "changed": changed,
+            "topics": sorted(connection.topics)
+        })
+    
+    async def serve(self, websocket: WebSocket, client_info: Dict[str, Any] = None):
+        """Accept a client and process its control messages until it disconnects"""
+        if not await self.connect(websocket, client_info):
+            return
+        try:
+            while True:
+                await self.handle_client_message(websocket, await websocket.receive_text())
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            logger.error(f"❌ WebSocket receive error: {e}")
+        finally:
+            await self.disconnect(websocket)
+    
+    async def broadcast(self, message: Dict[str, Any], message_type: str = "broadcast", topic: Optional[str] = None):
+        """Publish to every process on the fan-out bus; ``topic`` defaults to ``message_type``"""
+        topic = topic or message_type
         
         # Add metadata to message
         enhanced_message = {
@@ -120,122 +453,190 @@ class SuperchargedWebSocketManager:
             "broadcast_id": str(uuid.uuid4()),
             "timestamp": datetime.utcnow().isoformat(),
             "type": message_type,
+            "topic": topic,
             "server_version": "v6.0"
         }
         
-        # Queue message for batch processing
-        await self.message_queue.put({
-            "type": "broadcast",
-            "message": enhanced_message,
-            "recipients": list(self.active_connections)
-        })
+        envelope = {
+            "origin": self.fanout_bus.origin,
+            "topic": topic,
+            "message_type": message_type,
+            "message": enhanced_message
+        }
+        if self._bus_started:
+            await self.fanout_bus.publish(envelope)
+        else:
+            self._deliver_envelope(envelope)
+    
+    def _deliver_envelope(self, envelope: Dict[str, Any]):
+        """Bus handler: fan a published message out to this process's interested sockets, once"""
+        message = envelope["message"]
+        broadcast_id = message.get("broadcast_id")
+        if broadcast_id in self._recent_broadcast_ids:
+            self.performance_stats["duplicates_suppressed"] += 1
+            return
+        self._recent_broadcast_ids[broadcast_id] = None
+        if len(self._recent_broadcast_ids) > self.dedup_window:
+            self._recent_broadcast_ids.popitem(last=False)
+        
+        topic = envelope["topic"]
+        message_type = envelope["message_type"]
+        recipients = self._recipients(topic)
+        if not recipients:
+            return
         
-        logger.debug(f"📡 Queued broadcast message to {len(self.active_connections)} connections")
+        # Hand one shared, encode-once message to each interested client's send queue; nothing here waits on a socket
+        encoded = EncodedMessage(message)
+        coalesce_key = f"{topic}|{message_type}" if message_type in self.coalesce_types else None
+        for connection in recipients:
+            self._enqueue(connection, encoded, coalesce_key)
+        
+        logger.debug(f"📡 Queued {topic} broadcast to {len(recipients)} connections")
+    
+    async def publish_mission_update(self, mission_id: str, message: Dict[str, Any], message_type: str = "mission_update"):
+        await self.broadcast({**message, "mission_id": mission_id}, message_type, topic=f"mission:{mission_id}")
+    
+    async def publish_log(self, log_entry: Dict[str, Any]):
+        level = str(log_entry.get("level", "info")).lower()
+        await self.broadcast({"log": log_entry}, "log", topic=f"logs:{level}")
     
     async def send_to_websocket(self, websocket: WebSocket, message: Dict[str, Any]):
-        """Send message to specific WebSocket with error handling"""
+        """Queue a message for a specific WebSocket; False if the client is gone or was dropped"""
+        connection = self.connections.get(websocket)
+        if connection is None or connection.closed:
+            return False
+        return self._enqueue(connection, EncodedMessage(message))
+    
+    def _enqueue(self, connection: ClientConnection, message: EncodedMessage,
+                 coalesce_key: Optional[str] = None) -> bool:
+        outcome = connection.push(message, coalesce_key)
+        if outcome == "coalesced":
+            self.performance_stats["messages_coalesced"] += 1
+        elif outcome == "overflow":
+            self.performance_stats["messages_dropped"] += 1
+            if self.slow_consumer_policy == "disconnect":
+                self.performance_stats["slow_consumer_disconnects"] += 1
+                logger.warning(f"🐢 Disconnecting slow WebSocket consumer {connection.metadata['id']}")
+                asyncio.create_task(self._close_connection(connection.websocket, 1013, "Client too slow"))
+                return False
+        return outcome != "dropped"
+    
+    async def _connection_writer(self, connection: ClientConnection):
+        """Drain one client's queue, packing everything pending (up to batch_size) into a single frame"""
+        websocket = connection.websocket
+        limit = self.batch_size if self.message_batching else 1
         try:
-            if websocket in self.active_connections:
-                message_str = json.dumps(message, default=str)
-                await websocket.send_text(message_str)
-                
-                # Update metadata
-                if websocket in self.connection_metadata:
-                    self.connection_metadata[websocket]["messages_sent"] += 1
-                    self.connection_metadata[websocket]["last_activity"] = datetime.utcnow()
-                
-                # Update stats
-                self.performance_stats["messages_sent"] += 1
-                self.performance_stats["bytes_transferred"] += len(message_str)
+            while not connection.closed:
+                await connection.wakeup.wait()
+                batch = connection.take(limit)
+                if not batch:
+                    continue
+                messages = [slot[0] for slot in batch]
+                frame = self._build_frame(connection.encoding, messages)
+                if isinstance(frame, str):
+                    await asyncio.wait_for(websocket.send_text(frame), timeout=self.send_timeout)
+                else:
+                    await asyncio.wait_for(websocket.send_bytes(frame), timeout=self.send_timeout)
                 
-                return True
+                sent_at = time.perf_counter()
+                counters = self.encoding_stats[connection.encoding]
+                counters["frames_sent"] += 1
+                counters["bytes_sent"] += len(frame)
+                connection.metadata["messages_sent"] += len(messages)
+                connection.metadata["last_activity"] = datetime.utcnow()
+                connection.metadata["queue_delay_ms"] = (sent_at - batch[0][1]) * 1000
+                self.performance_stats["messages_sent"] += len(messages)
+                self.performance_stats["frames_sent"] += 1
+                self.performance_stats["bytes_transferred"] += len(frame)
+        except asyncio.TimeoutError:
+            self.performance_stats["slow_consumer_disconnects"] += 1
+            logger.warning(f"🐢 WebSocket send to {connection.metadata['id']} stalled for {self.send_timeout:g}s; dropping client")
+            await self._close_connection(websocket, 1013, "Send timeout")
         except WebSocketDisconnect:
             await self.disconnect(websocket)
-            return False
         except Exception as e:
             logger.error(f"❌ Failed to send WebSocket message: {e}")
-            return False
-        
-        return False
+            await self.disconnect(websocket)
     
-    async def _message_processor(self):
-        """Background task for processing queued messages"""
-        batch = []
-        last_batch_time = datetime.utcnow()
-        
-        while self.running:
-            try:
-                # Wait for messages with timeout for batching
-                try:
-                    message_item = await asyncio.wait_for(
-                        self.message_queue.get(), 
-                        timeout=self.batch_timeout
-                    )
-                    batch.append(message_item)
-                except asyncio.TimeoutError:
-                    pass
-                
-                # Process batch if full or timeout reached
-                current_time = datetime.utcnow()
-                should_process = (
-                    len(batch) >= self.batch_size or
-                    (batch and (current_time - last_batch_time).total_seconds() >= self.batch_timeout)
-                )
-                
-                if should_process and batch:
-                    await self._process_message_batch(batch)
-                    batch = []
-                    last_batch_time = current_time
-                
-            except Exception as e:
-                logger.error(f"❌ Message processor error: {e}")
-                await asyncio.sleep(1)
+    def _build_frame(self, encoding: str, messages: List[EncodedMessage]) -> Union[str, bytes]:
+        """A single message goes out as-is; several are spliced into one array frame from their cached encodings"""
+        if len(messages) == 1:
+            return messages[0].encode(encoding, self.encoding_stats)
+        if encoding == ENCODING_MSGPACK:
+            return msgpack_array_header(len(messages)) + b"".join(
+                m.encode(encoding, self.encoding_stats) for m in messages
+            )
+        frame = "[" + ",".join(m.encode(ENCODING_JSON, self.encoding_stats) for m in messages) + "]"
+        if encoding == ENCODING_DEFLATE:
+            started = time.process_time()
+            frame = deflate(frame.encode())
+            self.encoding_stats[ENCODING_DEFLATE]["encode_cpu_ms"] += (time.process_time() - started) * 1000
+        return frame
     
-    async def _process_message_batch(self, batch: List[Dict[str, Any]]):
-        """Process a batch of messages efficiently"""
-        for message_item in batch:
-            if message_item["type"] == "broadcast":
-                message = message_item["message"]
-                recipients = message_item["recipients"]
-                
-                # Send to all recipients concurrently
-                tasks = [
-                    self.send_to_websocket(websocket, message)
-                    for websocket in recipients
-                    if websocket in self.active_connections
-                ]
-                
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
+    async def _close_connection(self, websocket: WebSocket, code: int = 1000, reason: str = ""):
+        await self.disconnect(websocket)
+        try:
+            await websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+    
+    def _record_pong(self, connection: ClientConnection, ping_id: Optional[str]):
+        if ping_id is None or ping_id != connection.ping_id:
+            return
+        rtt_ms = (time.monotonic() - connection.ping_sent_at) * 1000
+        connection.ping_id = None
+        connection.pongs_received += 1
+        connection.last_rtt_ms = rtt_ms
+        connection.rtt_ms = rtt_ms if connection.rtt_ms is None else 0.8 * connection.rtt_ms + 0.2 * rtt_ms
     
-    async def _health_monitor(self):
-        """Background task for monitoring connection health"""
+    def _send_ping(self, connection: ClientConnection, now: float):
+        """Application-level ping; clients answer with {"action": "pong", "ping_id": ...}"""
+        connection.ping_id = uuid.uuid4().hex[:12]
+        connection.ping_sent_at = now
+        connection.pings_sent += 1
+        connection.push(EncodedMessage({
+            "type": "ping",
+            "ping_id": connection.ping_id,
+            "server_time": datetime.utcnow().isoformat()
+        }), urgent=True)
+    
+    def _check_heartbeat(self, connection: ClientConnection, now: float):
+        """Timer callback: ping a quiet client, reap one whose pong is overdue, otherwise re-arm lazily"""
+        if connection.closed or connection.websocket not in self.connections:
+            return
+        if connection.ping_id is not None:
+            overdue = now - connection.ping_sent_at
+            if overdue >= self.ping_timeout:
+                logger.warning(f"💔 WebSocket {connection.metadata['id']} missed heartbeat ({overdue:.0f}s without pong); closing")
+                self.performance_stats["heartbeat_timeouts"] += 1
+                asyncio.create_task(self._close_connection(connection.websocket, 1011, "Heartbeat timeout"))
+            else:
+                self.heartbeat_wheel.schedule(connection, self.ping_timeout - overdue)
+            return
+        idle = now - connection.last_seen
+        if idle >= self.heartbeat_interval:
+            self._send_ping(connection, now)
+            self.heartbeat_wheel.schedule(connection, self.ping_timeout)
+        else:
+            # Traffic arrived since the timer was set; sleep until the client has been quiet long enough
+            self.heartbeat_wheel.schedule(connection, self.heartbeat_interval - idle)
+    
+    async def _heartbeat_loop(self):
+        """Drive the heartbeat timer wheel; each tick only visits the connections whose timers expired"""
+        tick = self.heartbeat_wheel.tick
+        next_tick = time.monotonic() + tick
         while self.running:
             try:
-                current_time = datetime.utcnow()
-                stale_connections = []
-                
-                for websocket, metadata in self.connection_metadata.items():
-                    last_activity = metadata.get("last_activity")
-                    if last_activity:
-                        idle_time = (current_time - last_activity).total_seconds()
-                        if idle_time > self.heartbeat_interval * 3:
-                            stale_connections.append(websocket)
-                
-                # Clean up stale connections
-                for websocket in stale_connections:
-                    logger.warning(f"🔌 Cleaning up stale WebSocket connection")
-                    await self.disconnect(websocket)
-                    try:
-                        await websocket.close()
-                    except:
-                        pass
-                
-                await asyncio.sleep(self.heartbeat_interval)
-                
+                await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+                now = time.monotonic()
+                # Catch up on ticks missed while the loop was busy
+                while next_tick <= now:
+                    for connection in self.heartbeat_wheel.advance():
+                        self._check_heartbeat(connection, now)
+                    next_tick += tick
             except Exception as e:
-                logger.error(f"❌ Health monitor error: {e}")
-                await asyncio.sleep(30)
+                logger.error(f"❌ Heartbeat monitor error: {e}")
+                next_tick = time.monotonic() + tick
     
     async def _performance_monitor(self):
         """Background task for performance monitoring"""
@@ -253,9 +654,32 @@ class SuperchargedWebSocketManager:
                 logger.error(f"❌ Performance monitor error: {e}")
                 await asyncio.sleep(60)
     
-    def get_performance_stats(self) -> Dict[str, Any]:
+    def get_connection_stats(self) -> List[Dict[str, Any]]:
+        """Per-connection heartbeat and backlog figures"""
+        now = time.monotonic()
+        return [
+            {
+                "id": c.metadata["id"],
+                "encoding": c.encoding,
+                "topics": len(c.topics),
+                "rtt_ms": round(c.rtt_ms, 2) if c.rtt_ms is not None else None,
+                "last_rtt_ms": round(c.last_rtt_ms, 2) if c.last_rtt_ms is not None else None,
+                "idle_seconds": round(now - c.last_seen, 1),
+                "awaiting_pong": c.ping_id is not None,
+                "backlog": len(c.queue),
+                "dropped": c.dropped,
+                "coalesced": c.coalesced,
+                "messages_sent": c.metadata.get("messages_sent", 0),
+                "queue_delay_ms": c.metadata.get("queue_delay_ms")
+            }
+            for c in self.connections.values()
+        ]
+    
+    def get_performance_stats(self, include_connections: bool = True) -> Dict[str, Any]:
         """Get current performance statistics"""
         current_time = datetime.utcnow()
+        rtts = [c.rtt_ms for c in self.connections.values() if c.rtt_ms is not None]
+        self.performance_stats["average_latency_ms"] = sum(rtts) / len(rtts) if rtts else 0
         
         # Calculate average connection uptime
         total_uptime = 0
@@ -272,15 +696,25 @@ class SuperchargedWebSocketManager:
         return {
             **self.performance_stats,
             "average_uptime_seconds": avg_uptime,
-            "queue_size": self.message_queue.qsize(),
+            "queue_size": sum(len(c.queue) for c in self.connections.values()),
+            "max_connection_backlog": max((len(c.queue) for c in self.connections.values()), default=0),
             "compression_enabled": self.message_compression,
+            "fast_json": ORJSON_AVAILABLE,
+            "encoding_stats": {k: dict(v) for k, v in self.encoding_stats.items()},
             "batching_enabled": self.message_batching,
+            "topics": len(self.topic_subscribers),
+            "subscriptions": sum(len(c) for c in self.topic_subscribers.values()),
+            "firehose_connections": len(self.firehose),
+            "fanout_bus": self.fanout_bus.get_stats(),
+            "max_rtt_ms": max(rtts, default=0),
+            "heartbeat_timers": len(self.heartbeat_wheel),
+            "connections": self.get_connection_stats() if include_connections else None,
             "health_status": "optimal" if len(self.active_connections) > 0 else "idle"
         }
     
     async def send_performance_update(self):
-        """Send performance update to all connected clients"""
-        stats = self.get_performance_stats()
+        """Send performance update to system_metrics subscribers"""
+        stats = self.get_performance_stats(include_connections=False)
         await self.broadcast({
             "type": "performance_update",
             "stats": stats
@@ -289,8 +723,18 @@ class SuperchargedWebSocketManager:
     async def shutdown(self):
         """Graceful shutdown of WebSocket manager"""
         self.running = False
+        if self._bus_started:
+            self._bus_started = False
+            await self.fanout_bus.stop()
         
-        # Close all connections
+        # Stop writers, then close all connections
+        for connection in list(self.connections.values()):
+            connection.close()
+            if connection.writer is not None:
+                connection.writer.cancel()
+        self.connections.clear()
+        self.topic_subscribers.clear()
+        self.firehose.clear()
         for websocket in list(self.active_connections):
             try:
                 await websocket.close(code=1001, reason="Server shutdown")
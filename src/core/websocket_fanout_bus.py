@@ -0,0 +1,244 @@
+"""
+WebSocket Fan-out Bus - Cross-process pub/sub backplane for SuperchargedWebSocketManager
+Lets a broadcast published in one worker process reach sockets held by every other process,
+without an external broker
+"""
+
+import asyncio
+import json
+from abc import ABC, abstractmethod
+import struct
+import uuid
+from typing import Any, Callable, Dict, Optional, Set
+
+from loguru import logger
+
+try:
+    from ..config.settings import settings
+except ImportError:
+    from config.settings import settings
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+def _encode_envelope(envelope: Dict[str, Any]) -> bytes:
+    return orjson.dumps(envelope, default=str) if ORJSON_AVAILABLE else json.dumps(envelope, default=str).encode()
+
+
+def _decode_envelope(payload: bytes) -> Dict[str, Any]:
+    return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    (length,) = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Fan-out frame of {length} bytes exceeds limit")
+    return await reader.readexactly(length)
+
+
+class FanoutBus(ABC):
+    """Pub/sub backplane interface.
+
+    ``publish`` hands an envelope (``topic``, ``message_type``, ``message``) to every
+    process on the bus, including this one; each process receives envelopes through the
+    ``handler`` given to ``start``, in the same order for a given topic.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self.handler: Optional[Callable[[Dict[str, Any]], None]] = None
+        self.stats = {"published": 0, "received": 0, "errors": 0}
+
+    async def start(self, handler: Callable[[Dict[str, Any]], None]):
+        self.handler = handler
+
+    @abstractmethod
+    async def publish(self, envelope: Dict[str, Any]):
+        """Deliver ``envelope`` to every process on the bus, this one included"""
+
+    async def stop(self):
+        pass
+
+    def _deliver(self, envelope: Dict[str, Any]):
+        self.stats["received"] += 1
+        try:
+            self.handler(envelope)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"❌ Fan-out delivery failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"bus": self.name, "origin": self.origin, **self.stats}
+
+
+class InProcessBus(FanoutBus):
+    """Single-process bus: publishing delivers straight to the local handler"""
+
+    name = "inprocess"
+
+    async def publish(self, envelope: Dict[str, Any]):
+        self.stats["published"] += 1
+        self._deliver(envelope)
+
+
+class LocalSocketBus(FanoutBus):
+    """Broker-free bus over a loopback TCP port.
+
+    The first process to bind ``host:port`` becomes the hub; the others connect to it.
+    Every publish goes through the hub, which relays each frame to all members (the
+    publisher included) in arrival order, so every process sees one order per topic.
+    If the hub exits, the remaining processes race to take over the port and reconnect.
+    While a process is between hubs it delivers its own publishes locally only.
+    """
+
+    name = "socket"
+
+    def __init__(self, host: str = "127.0.0.1", port: Optional[int] = None, max_peer_buffer: int = 8 * 1024 * 1024):
+        super().__init__()
+        self.host = host
+        self.port = port or settings.WEBSOCKET_FANOUT_PORT
+        self.max_peer_buffer = max_peer_buffer
+        self.is_hub = False
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._peers: Set[asyncio.StreamWriter] = set()
+        self._hub_writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self._connected = asyncio.Event()
+        self.stats.update(local_fallbacks=0, reconnects=0, peers_dropped=0)
+
+    async def start(self, handler: Callable[[Dict[str, Any]], None]):
+        await super().start(handler)
+        self._running = True
+        self._task = asyncio.create_task(self._maintain())
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=2)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Fan-out bus not connected yet on {self.host}:{self.port}; publishing locally until it is")
+
+    async def publish(self, envelope: Dict[str, Any]):
+        self.stats["published"] += 1
+        payload = _encode_envelope(envelope)
+        if self.is_hub:
+            self._relay(payload)
+            return
+        writer = self._hub_writer
+        if writer is None or writer.is_closing():
+            self.stats["local_fallbacks"] += 1
+            self._deliver(envelope)
+            return
+        writer.write(_FRAME_HEADER.pack(len(payload)) + payload)
+        await writer.drain()
+
+    async def _maintain(self):
+        """Keep this process attached to the bus, as hub or as member"""
+        backoff = 0.1
+        while self._running:
+            try:
+                if await self._become_hub():
+                    self._connected.set()
+                    await self._server.wait_closed()
+                    continue
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+                self._hub_writer = writer
+                self._connected.set()
+                backoff = 0.1
+                logger.info(f"🔗 Joined WebSocket fan-out bus at {self.host}:{self.port}")
+                while self._running:
+                    self._deliver(_decode_envelope(await _read_frame(reader)))
+            except asyncio.CancelledError:
+                raise
+            except (ConnectionError, asyncio.IncompleteReadError, OSError) as e:
+                logger.debug(f"Fan-out bus connection lost: {e}")
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"❌ Fan-out bus error: {e}")
+            finally:
+                if self._hub_writer is not None:
+                    self._hub_writer.close()
+                    self._hub_writer = None
+            if self._running:
+                self._connected.clear()
+                self.stats["reconnects"] += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 5.0)
+
+    async def _become_hub(self) -> bool:
+        try:
+            self._server = await asyncio.start_server(self._serve_peer, self.host, self.port)
+        except OSError:
+            return False
+        self.is_hub = True
+        logger.info(f"🔗 WebSocket fan-out hub listening on {self.host}:{self.port}")
+        return True
+
+    async def _serve_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._peers.add(writer)
+        try:
+            while True:
+                self._relay(await _read_frame(reader))
+        except (ConnectionError, asyncio.IncompleteReadError, OSError):
+            pass
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"❌ Fan-out hub peer error: {e}")
+        finally:
+            self._peers.discard(writer)
+            writer.close()
+
+    def _relay(self, payload: bytes):
+        """Hub only: forward a frame to every member and deliver it locally, in one step"""
+        frame = _FRAME_HEADER.pack(len(payload)) + payload
+        for peer in tuple(self._peers):
+            if peer.transport.get_write_buffer_size() > self.max_peer_buffer:
+                # A member that stops reading is cut off rather than buffered without bound; it will rejoin
+                self.stats["peers_dropped"] += 1
+                self._peers.discard(peer)
+                peer.close()
+                continue
+            peer.write(frame)
+        self._deliver(_decode_envelope(payload))
+
+    async def stop(self):
+        self._running = False
+        if self._server is not None:
+            self._server.close()
+            for peer in tuple(self._peers):
+                peer.close()
+            self._peers.clear()
+        if self._hub_writer is not None:
+            self._hub_writer.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self.is_hub = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **super().get_stats(),
+            "address": f"{self.host}:{self.port}",
+            "role": "hub" if self.is_hub else ("member" if self._hub_writer is not None else "detached"),
+            "peers": len(self._peers),
+        }
+
+
+def create_fanout_bus(kind: Optional[str] = None) -> FanoutBus:
+    """Build the backplane named by ``WEBSOCKET_FANOUT_BUS`` ("inprocess" or "socket")"""
+    kind = (kind or settings.WEBSOCKET_FANOUT_BUS).lower()
+    if kind == "socket":
+        return LocalSocketBus()
+    if kind != "inprocess":
+        logger.warning(f"⚠️ Unknown WEBSOCKET_FANOUT_BUS {kind!r}; using in-process bus")
+    return InProcessBus()
@@ -5,19 +5,116 @@ Dual-database architecture with SQLite and ChromaDB
 """
 
 import os
+import time
+import json
+import base64
+import asyncio
+import atexit
+import threading
+from collections import defaultdict
+from contextlib import contextmanager, asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator, AsyncIterator, Sequence, Tuple
 
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON, Boolean, Float, ForeignKey
-from sqlalchemy.orm import sessionmaker, declarative_base, relationship
-# Removed unused imports: func, logger
+from loguru import logger
+from sqlalchemy import create_engine, event, select, bindparam, and_, or_, Index, Column, Integer, String, Text, DateTime, JSON, Boolean, Float, ForeignKey
+from sqlalchemy.orm import sessionmaker, declarative_base, relationship, Session
+from sqlalchemy.orm.attributes import flag_modified, set_committed_value
+
+from .migrations import run_migrations
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///../db/sentinel_missions.db")
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+# Connection pool tuning (ignored by backends that do not pool, e.g. in-memory SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# Write-behind buffer for progress/status updates and log rows
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "200"))
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", "1.0"))
+WRITE_BEHIND_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "10000"))
+TERMINAL_MISSION_STATUSES = ("completed", "failed")
+# Prompt text kept per performance metric for model replay
+MAX_METRIC_PROMPT_CHARS = 4000
+
+# SQLite production profile, applied to every new connection
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+
+def _to_async_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if url.startswith("postgresql://") or url.startswith("postgres://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    return url
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    """Pool and connect arguments for the given backend"""
+    if url.startswith("sqlite"):
+        options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+        if ":memory:" not in url:
+            options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+        return options
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL + relaxed fsync + larger page cache/mmap for every pooled SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        # Only takes effect on a new, empty file; existing ones are converted with
+        # `python -m src.models.retention --enable-incremental-vacuum`
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")  # negative = KiB
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _to_async_url(DATABASE_URL))
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+if DATABASE_URL.startswith("sqlite"):
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine for code running inside the event loop; optional so the sync
+# API keeps working when the async driver (aiosqlite/asyncpg) is not installed
+try:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options(ASYNC_DATABASE_URL))
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if ASYNC_DATABASE_URL.startswith("sqlite"):
+        event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    ASYNC_DB_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"⚠️ Async database driver not available: {e} - async repository will run the sync one in threads")
+    async_engine = None
+    AsyncSessionLocal = None
+    ASYNC_DB_AVAILABLE = False
+
 # Organization and User models are missing, add them:
 class Organization(Base):
     __tablename__ = "organizations"
@@ -76,6 +173,14 @@ class Mission(Base):
     prompt_analysis = Column(JSON, nullable=True)  # Guardian Protocol analysis
     risk_score = Column(Float, nullable=True)  # Risk assessment score
     
+    # Composite indexes (mirrored by migration 1 for existing databases)
+    __table_args__ = (
+        Index("ix_missions_status_created_at", "status", "created_at"),
+        Index("ix_missions_organization_created_at", "organization_id", "created_at"),
+        Index("ix_missions_owner_created_at", "owner_id", "created_at"),
+        Index("ix_missions_created_at_id", "created_at", "id"),
+    )
+    
     def as_dict(self):
         # Convert all columns to a dictionary, handling datetime objects
         d = {c.name: getattr(self, c.name) for c in self.__table__.columns}
@@ -115,6 +220,11 @@ class MissionUpdate(Base):
     data = Column(JSON, nullable=True)
     metadata = Column(JSON, nullable=True)
     timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    
+    __table_args__ = (
+        Index("ix_mission_updates_mission_timestamp", "mission_id_str", "timestamp"),
+        Index("ix_mission_updates_timestamp", "timestamp"),
+    )
 
 
 class SystemLog(Base):
@@ -126,12 +236,15 @@ class SystemLog(Base):
     source = Column(String)  # main, cognitive_engine, hybrid_engine
     message = Column(Text)
     log_metadata = Column(JSON, nullable=True)
-    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
 
 
 class PerformanceMetric(Base):
     """Performance tracking for hybrid system"""
     __tablename__ = "performance_metrics"
+    __table_args__ = (
+        Index("ix_performance_metrics_path_timestamp", "execution_path", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True)
     execution_path = Column(String)  # golden_path, full_workflow
@@ -139,15 +252,18 @@ class PerformanceMetric(Base):
     execution_time = Column(Float)
     success = Column(Boolean)
     user_satisfaction = Column(Float, nullable=True)
+    # What the per-prompt model trains on, so history can be replayed after a restart (migration 7)
+    task_id = Column(String, nullable=True)
+    prompt = Column(Text, nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
-    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
 
 class UserPreference(Base):
     """User preference learning"""
     __tablename__ = "user_preferences"
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(String, default="default")
+    user_id = Column(String, default="default", index=True)
     preferred_path = Column(String)  # golden_path, full_workflow
     speed_preference = Column(Float)  # 0.0 = quality, 1.0 = speed
     complexity_preference = Column(Float)  # 0.0 = simple, 1.0 = complex
@@ -156,6 +272,465 @@ class UserPreference(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
 
+class MissionJob(Base):
+    """Durable mission execution queue; a worker owns a job only while its lease is live"""
+    __tablename__ = "mission_jobs"
+    __table_args__ = (
+        Index("ix_mission_jobs_claim", "status", "priority_rank", "id"),
+        Index("ix_mission_jobs_lease", "status", "lease_expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    mission_id_str = Column(String, unique=True, index=True)
+    prompt = Column(Text)
+    agent_type = Column(String, default="developer")
+    priority_rank = Column(Integer, default=2)
+    status = Column(String, default="queued")  # queued, leased, completed, failed, cancelled
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    cancel_requested = Column(Boolean, default=False)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+
+class MissionResult(Base):
+    """Short-lived mission outcomes served by /mission/result; rows expire after MISSION_RESULT_TTL"""
+    __tablename__ = "mission_results"
+
+    mission_id_str = Column(String, primary_key=True)
+    status = Column(String)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(DateTime, index=True)
+
+
+# Lightweight columns for list views; prompt/result/plan/decision_metadata are left out
+MISSION_LIST_COLUMNS = (
+    "id", "mission_id_str", "title", "agent_type", "status", "progress", "priority",
+    "execution_path", "complexity_score", "execution_time", "is_healing", "risk_score",
+    "owner_id", "organization_id", "created_at", "updated_at", "completed_at",
+)
+
+
+def encode_mission_cursor(created_at: Optional[datetime], mission_id: int) -> str:
+    """Opaque keyset cursor for (created_at, id)"""
+    payload = json.dumps([created_at.isoformat() if created_at else None, mission_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_mission_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        created_at, mission_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (datetime.fromisoformat(created_at) if created_at else None), int(mission_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid mission cursor: {cursor}") from e
+
+
+def _mission_list_query(columns: Optional[Sequence[str]] = None, cursor: Optional[str] = None,
+                        status: Optional[str] = None, owner_id: Optional[int] = None,
+                        organization_id: Optional[int] = None, limit: int = 50):
+    """Projected SELECT ordered by (created_at DESC, id DESC), resuming after ``cursor``"""
+    table = Mission.__table__
+    names = list(columns or MISSION_LIST_COLUMNS)
+    unknown = [name for name in names if name not in table.c]
+    if unknown:
+        raise ValueError(f"Unknown mission columns: {unknown}")
+    for required in ("id", "created_at"):
+        if required not in names:
+            names.append(required)
+
+    stmt = select(*[table.c[name] for name in names])
+    if status is not None:
+        stmt = stmt.where(table.c.status == status)
+    if owner_id is not None:
+        stmt = stmt.where(table.c.owner_id == owner_id)
+    if organization_id is not None:
+        stmt = stmt.where(table.c.organization_id == organization_id)
+    if cursor:
+        created_at, mission_id = decode_mission_cursor(cursor)
+        stmt = stmt.where(or_(
+            table.c.created_at < created_at,
+            and_(table.c.created_at == created_at, table.c.id < mission_id)
+        ))
+    return stmt.order_by(table.c.created_at.desc(), table.c.id.desc()).limit(limit)
+
+
+def _mission_page(rows, limit: int) -> Dict[str, Any]:
+    items = []
+    for row in rows:
+        item = dict(row._mapping)
+        for key, value in item.items():
+            if isinstance(value, datetime):
+                item[key] = value.isoformat()
+        items.append(item)
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]._mapping
+        next_cursor = encode_mission_cursor(last["created_at"], last["id"])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+class MissionStatusCounter(Base):
+    """Materialized mission count per status, maintained by triggers (migration 2)"""
+    __tablename__ = "mission_status_counters"
+    
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class MissionFlagCounter(Base):
+    """Materialized mission count per boolean flag (e.g. is_healing), maintained by triggers (migration 8)"""
+    __tablename__ = "mission_flag_counters"
+    
+    flag = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ExecutionTimeBucket(Base):
+    """Histogram of completed-mission execution times, maintained by triggers (migration 2)"""
+    __tablename__ = "execution_time_buckets"
+    
+    bucket = Column(Integer, primary_key=True)
+    upper_bound = Column(Float, nullable=True)  # NULL = open-ended last bucket
+    count = Column(Integer, nullable=False, default=0)
+    total_time = Column(Float, nullable=False, default=0)
+
+
+def _histogram_percentile(buckets: List[ExecutionTimeBucket], total: int, q: float) -> float:
+    """Estimate a percentile by linear interpolation inside the matching bucket"""
+    target = q * total
+    cumulative = 0
+    lower = 0.0
+    for b in buckets:
+        if b.count and cumulative + b.count >= target:
+            if b.upper_bound is None:
+                return b.total_time / b.count if b.count else lower
+            return lower + (b.upper_bound - lower) * ((target - cumulative) / b.count)
+        cumulative += b.count
+        if b.upper_bound is not None:
+            lower = b.upper_bound
+    return lower
+
+
+def _build_system_stats(counters: List[MissionStatusCounter], buckets: List[ExecutionTimeBucket],
+                        flags: Sequence[MissionFlagCounter] = ()) -> Dict[str, Any]:
+    """System stats from the materialized tables: O(statuses + buckets), independent of mission count"""
+    status_counts = {c.status: c.count for c in counters if c.count}
+    flag_counts = {f.flag: f.count for f in flags}
+    total_missions = sum(status_counts.values())
+    completed_missions = status_counts.get("completed", 0)
+    timed = sum(b.count for b in buckets)
+    total_time = sum(b.total_time for b in buckets)
+    return {
+        "total_missions": total_missions,
+        "completed_missions": completed_missions,
+        "failed_missions": status_counts.get("failed", 0),
+        "healing_missions": flag_counts.get("healing", 0),
+        "status_counts": status_counts,
+        "avg_execution_time": total_time / timed if timed else 0.0,
+        "p50_execution_time": _histogram_percentile(buckets, timed, 0.50) if timed else 0.0,
+        "p95_execution_time": _histogram_percentile(buckets, timed, 0.95) if timed else 0.0,
+        "success_rate": completed_missions / max(total_missions, 1),
+        "active_optimizations": 0
+    }
+
+
+def _completion_fields(mission: Mission, status: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Stamp completed_at/execution_time when a mission reaches a terminal status"""
+    if status not in TERMINAL_MISSION_STATUSES:
+        return fields
+    now = datetime.now(timezone.utc)
+    fields.setdefault("completed_at", now)
+    if fields.get("execution_time") is None and mission.created_at is not None:
+        created_at = mission.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        fields["execution_time"] = max((now - created_at).total_seconds(), 0.0)
+    return fields
+
+
+class WriteBehindBuffer:
+    """Coalescing write-behind queue for high-frequency, low-value writes.
+
+    Mission progress/status fields are coalesced per ``mission_id_str`` (last value
+    wins) and ``MissionUpdate``/``SystemLog`` rows are appended; everything pending is
+    written in one transaction with executemany when ``batch_size`` rows are queued or
+    every ``flush_interval`` seconds, whichever comes first.
+    """
+
+    def __init__(self, session_factory=None, batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+                 flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL,
+                 max_pending: int = WRITE_BEHIND_MAX_PENDING):
+        self.session_factory = session_factory or SessionLocal
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._mission_fields: Dict[str, Dict[str, Any]] = {}
+        self._mission_updates: List[Dict[str, Any]] = []
+        self._system_logs: List[Dict[str, Any]] = []
+        self._performance_metrics: List[Dict[str, Any]] = []
+        self._user_preferences: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.metrics = {
+            "flushes": 0,
+            "failed_flushes": 0,
+            "rows_flushed": 0,
+            "coalesced_updates": 0,
+            "dropped_rows": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    # --- enqueue -----------------------------------------------------------
+    def enqueue_mission_fields(self, mission_id_str: str, **fields):
+        """Queue column updates for a mission; later values overwrite earlier ones"""
+        with self._lock:
+            pending = self._mission_fields.setdefault(mission_id_str, {})
+            if pending:
+                self.metrics["coalesced_updates"] += 1
+            pending.update(fields)
+        self._after_enqueue()
+
+    def enqueue_mission_update(self, mission_id_str: str, phase: str, message: str,
+                               metadata: Optional[dict] = None):
+        row = {
+            "mission_id_str": mission_id_str,
+            "phase": phase,
+            "message": message,
+            "data": metadata or {},
+            "timestamp": datetime.now(timezone.utc),
+        }
+        with self._lock:
+            self._mission_updates.append(row)
+            self._trim(self._mission_updates)
+        self._after_enqueue()
+
+    def enqueue_system_log(self, level: str, source: str, message: str,
+                           log_metadata: Optional[dict] = None):
+        row = {
+            "level": level,
+            "source": source,
+            "message": message,
+            "log_metadata": log_metadata or {},
+            "timestamp": datetime.now(timezone.utc),
+        }
+        with self._lock:
+            self._system_logs.append(row)
+            self._trim(self._system_logs)
+        self._after_enqueue()
+
+    def enqueue_performance_metric(self, execution_path: str, complexity_score: float,
+                                   execution_time: float, success: bool,
+                                   user_satisfaction: Optional[float] = None,
+                                   task_id: Optional[str] = None, prompt: Optional[str] = None):
+        row = {
+            "execution_path": execution_path,
+            "complexity_score": complexity_score,
+            "execution_time": execution_time,
+            "success": success,
+            "user_satisfaction": user_satisfaction,
+            "task_id": task_id,
+            "prompt": prompt[:MAX_METRIC_PROMPT_CHARS] if prompt else prompt,
+            "timestamp": datetime.now(timezone.utc),
+        }
+        with self._lock:
+            self._performance_metrics.append(row)
+            self._trim(self._performance_metrics)
+        self._after_enqueue()
+
+    def enqueue_user_preference(self, user_id: str, **fields):
+        """Queue a preference snapshot for a user; only the latest one is written"""
+        with self._lock:
+            if user_id in self._user_preferences:
+                self.metrics["coalesced_updates"] += 1
+            self._user_preferences[user_id] = {"user_id": user_id, **fields}
+        self._after_enqueue()
+
+    def peek_mission_fields(self, mission_id_str: str) -> Dict[str, Any]:
+        """Pending (not yet flushed) column values for a mission"""
+        with self._lock:
+            return dict(self._mission_fields.get(mission_id_str, {}))
+
+    def take_mission_fields(self, mission_id_str: str) -> Dict[str, Any]:
+        """Remove and return pending values so a direct write can supersede them"""
+        with self._lock:
+            return self._mission_fields.pop(mission_id_str, {})
+
+    def depth(self) -> int:
+        with self._lock:
+            return (len(self._mission_fields) + len(self._mission_updates) + len(self._system_logs)
+                    + len(self._performance_metrics) + len(self._user_preferences))
+
+    def _trim(self, rows: List[Dict[str, Any]]):
+        overflow = len(rows) - self.max_pending
+        if overflow > 0:
+            del rows[:overflow]
+            self.metrics["dropped_rows"] += overflow
+
+    def _after_enqueue(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._start()
+        if self.depth() >= self.batch_size:
+            self._wake.set()
+
+    # --- flushing ----------------------------------------------------------
+    def _start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write everything pending in a single transaction; returns rows written"""
+        with self._flush_lock:
+            with self._lock:
+                fields, self._mission_fields = self._mission_fields, {}
+                updates, self._mission_updates = self._mission_updates, []
+                logs, self._system_logs = self._system_logs, []
+                metrics, self._performance_metrics = self._performance_metrics, []
+                prefs, self._user_preferences = self._user_preferences, {}
+            written = len(fields) + len(updates) + len(logs) + len(metrics) + len(prefs)
+            if not written:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                with self.session_factory() as db:
+                    conn = db.connection()
+                    self._write_mission_fields(conn, fields)
+                    if updates:
+                        conn.execute(MissionUpdate.__table__.insert(), updates)
+                    if logs:
+                        conn.execute(SystemLog.__table__.insert(), logs)
+                    if metrics:
+                        conn.execute(PerformanceMetric.__table__.insert(), metrics)
+                    self._write_user_preferences(conn, prefs)
+                    db.commit()
+            except Exception as e:
+                self.metrics["failed_flushes"] += 1
+                logger.error(f"❌ Write-behind flush failed, requeueing {written} rows: {e}")
+                self._requeue(fields, updates, logs, metrics, prefs)
+                return 0
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.metrics["flushes"] += 1
+            self.metrics["rows_flushed"] += written
+            self.metrics["last_flush_ms"] = elapsed_ms
+            self.metrics["max_flush_ms"] = max(self.metrics["max_flush_ms"], elapsed_ms)
+            self.metrics["total_flush_ms"] += elapsed_ms
+            return written
+
+    @staticmethod
+    def _write_mission_fields(conn, fields: Dict[str, Dict[str, Any]]):
+        """executemany UPDATE, grouped by the set of columns being changed.
+
+        Rows already in a terminal state are skipped so a late flush can never
+        overwrite a completed/failed status written directly in the meantime.
+        """
+        groups: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+        for mission_id_str, values in fields.items():
+            columns = tuple(sorted(k for k in values if k in Mission.__table__.c))
+            if columns:
+                groups[columns].append({"b_mission_id_str": mission_id_str,
+                                        **{f"b_{k}": values[k] for k in columns}})
+        table = Mission.__table__
+        for columns, rows in groups.items():
+            stmt = (
+                table.update()
+                .where(table.c.mission_id_str == bindparam("b_mission_id_str"))
+                .where(table.c.status.notin_(TERMINAL_MISSION_STATUSES))
+                .values({k: bindparam(f"b_{k}") for k in columns})
+            )
+            conn.execute(stmt, rows)
+
+    @staticmethod
+    def _write_user_preferences(conn, prefs: Dict[str, Dict[str, Any]]):
+        """Upsert one row per user: executemany UPDATE for known users, INSERT for new ones"""
+        if not prefs:
+            return
+        table = UserPreference.__table__
+        existing = set(conn.execute(
+            select(table.c.user_id).where(table.c.user_id.in_(list(prefs)))
+        ).scalars())
+        updates = [{f"b_{k}": v for k, v in row.items()} for uid, row in prefs.items() if uid in existing]
+        inserts = [row for uid, row in prefs.items() if uid not in existing]
+        if updates:
+            columns = [k for k in next(iter(prefs.values())) if k != "user_id"]
+            stmt = (
+                table.update()
+                .where(table.c.user_id == bindparam("b_user_id"))
+                .values({k: bindparam(f"b_{k}") for k in columns})
+            )
+            conn.execute(stmt, updates)
+        if inserts:
+            conn.execute(table.insert(), inserts)
+
+    def _requeue(self, fields, updates, logs, metrics=(), prefs=None):
+        with self._lock:
+            for mission_id_str, values in fields.items():
+                # Anything queued since the failed flush is newer and wins
+                self._mission_fields[mission_id_str] = {**values, **self._mission_fields.get(mission_id_str, {})}
+            for user_id, row in (prefs or {}).items():
+                self._user_preferences.setdefault(user_id, row)
+            self._mission_updates[:0] = updates
+            self._system_logs[:0] = logs
+            self._performance_metrics[:0] = metrics
+            self._trim(self._mission_updates)
+            self._trim(self._system_logs)
+            self._trim(self._performance_metrics)
+
+    def close(self):
+        """Stop the flusher thread and drain the queue (flush-on-shutdown hook)"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            depth = {
+                "mission_fields": len(self._mission_fields),
+                "mission_updates": len(self._mission_updates),
+                "system_logs": len(self._system_logs),
+                "performance_metrics": len(self._performance_metrics),
+                "user_preferences": len(self._user_preferences),
+            }
+        flushes = self.metrics["flushes"]
+        return {
+            "queue_depth": sum(depth.values()),
+            "queue_depth_by_table": depth,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "avg_flush_ms": self.metrics["total_flush_ms"] / flushes if flushes else 0.0,
+            **self.metrics,
+        }
+
+
+write_buffer = WriteBehindBuffer()
+atexit.register(write_buffer.close)
+
+
 # (Removed duplicate and partial DatabaseManager class and stray __init__ function)
 
 class DatabaseManager:
@@ -163,6 +738,21 @@ class DatabaseManager:
         db_dir = Path("db")
         db_dir.mkdir(exist_ok=True)
         Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        self.write_buffer = write_buffer
+
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Single session for a unit of work: commit on success, rollback on error"""
+        db = SessionLocal()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
 
     def get_or_create_default_user_and_org(self):
         db = SessionLocal()
@@ -200,11 +790,17 @@ class DatabaseManager:
     def get_mission(self, mission_id_str: str) -> Optional[Mission]:
         db = SessionLocal()
         try:
-            return db.query(Mission).filter(Mission.mission_id_str == mission_id_str).first()
+            mission = db.query(Mission).filter(Mission.mission_id_str == mission_id_str).first()
         finally:
             db.close()
+        if mission:
+            # Overlay buffered progress so readers see the latest values (detached, not persisted)
+            for key, value in self.write_buffer.peek_mission_fields(mission_id_str).items():
+                setattr(mission, key, value)
+        return mission
     
     def get_mission_updates(self, mission_id_str: str) -> List[MissionUpdate]:
+        self.write_buffer.flush()
         db = SessionLocal()
         try:
             return db.query(MissionUpdate).filter(MissionUpdate.mission_id_str == mission_id_str).all()
@@ -212,24 +808,26 @@ class DatabaseManager:
             db.close()
     
     def add_mission_update(self, mission_id_str: str, phase: str, message: str, metadata: Optional[dict] = None):
-        db = SessionLocal()
-        try:
-            update = MissionUpdate(
-                mission_id_str=mission_id_str,
-                phase=phase,
-                message=message,
-                data=metadata or {}
-            )
-            db.add(update)
-            db.commit()
-        finally:
-            db.close()
+        """Buffered insert; rows are batched by the write-behind queue"""
+        self.write_buffer.enqueue_mission_update(mission_id_str, phase, message, metadata)
+    
+    def add_system_log(self, level: str, source: str, message: str, log_metadata: Optional[dict] = None):
+        """Buffered insert; rows are batched by the write-behind queue"""
+        self.write_buffer.enqueue_system_log(level, source, message, log_metadata)
+    
+    def update_mission_progress(self, mission_id_str: str, progress: int, status: str = "running", **kwargs):
+        """Write-behind progress update, coalesced per mission (last value wins)"""
+        self.write_buffer.enqueue_mission_fields(mission_id_str, status=status, progress=progress, **kwargs)
     
     def update_mission_status(self, mission_id_str: str, status: str, **kwargs):
         db = SessionLocal()
         try:
             mission = db.query(Mission).filter(Mission.mission_id_str == mission_id_str).first()
             if mission:
+                # Direct writes supersede any buffered progress for this mission
+                pending = self.write_buffer.take_mission_fields(mission_id_str)
+                pending.pop("status", None)
+                kwargs = _completion_fields(mission, status, {**pending, **kwargs})
                 setattr(mission, 'status', status)
                 for key, value in kwargs.items():
                     if hasattr(mission, key):
@@ -238,6 +836,14 @@ class DatabaseManager:
         finally:
             db.close()
     
+    def increment_phoenix_retry(self, mission_id_str: str) -> int:
+        with self.session_scope() as db:
+            mission = db.query(Mission).filter(Mission.mission_id_str == mission_id_str).first()
+            if not mission:
+                return 0
+            mission.phoenix_retries = (mission.phoenix_retries or 0) + 1
+            return mission.phoenix_retries
+    
     def get_pending_proposals(self) -> List[OptimizationProposal]:
         db = SessionLocal()
         try:
@@ -259,32 +865,93 @@ class DatabaseManager:
     def get_system_stats(self) -> Dict[str, Any]:
         db = SessionLocal()
         try:
-            total_missions = db.query(Mission).count()
-            completed_missions = db.query(Mission).filter(Mission.status == "completed").count()
-            failed_missions = db.query(Mission).filter(Mission.status == "failed").count()
-            
-            return {
-                "total_missions": total_missions,
-                "completed_missions": completed_missions,
-                "failed_missions": failed_missions,
-                "healing_missions": 0,
-                "avg_execution_time": 30,
-                "success_rate": completed_missions / max(total_missions, 1),
-                "active_optimizations": 0
-            }
+            counters = db.query(MissionStatusCounter).all()
+            buckets = db.query(ExecutionTimeBucket).order_by(ExecutionTimeBucket.bucket).all()
+            flags = db.query(MissionFlagCounter).all()
+            return _build_system_stats(counters, buckets, flags)
         finally:
             db.close()
     
+    def record_performance_metric(self, execution_path: str, complexity_score: float,
+                                  execution_time: float, success: bool,
+                                  user_satisfaction: Optional[float] = None,
+                                  task_id: Optional[str] = None, prompt: Optional[str] = None):
+        """Buffered insert; rows are batched by the write-behind queue"""
+        self.write_buffer.enqueue_performance_metric(
+            execution_path, complexity_score, execution_time, success, user_satisfaction, task_id, prompt
+        )
+    
+    def save_user_preference(self, user_id: str, preferred_path: str, speed_preference: float,
+                             complexity_preference: float, satisfaction_history: List[float]):
+        """Buffered upsert of a user's learned preferences (one row per user)"""
+        self.write_buffer.enqueue_user_preference(
+            user_id,
+            preferred_path=preferred_path,
+            speed_preference=speed_preference,
+            complexity_preference=complexity_preference,
+            satisfaction_history=list(satisfaction_history),
+        )
+    
+    def get_recent_performance_metrics(self, execution_path: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Most recent metrics for a path, oldest first so they can be replayed in order"""
+        self.write_buffer.flush()
+        table = PerformanceMetric.__table__
+        stmt = (
+            select(table)
+            .where(table.c.execution_path == execution_path)
+            .order_by(table.c.timestamp.desc(), table.c.id.desc())
+            .limit(limit)
+        )
+        with engine.connect() as conn:
+            rows = conn.execute(stmt).mappings().all()
+        return [dict(row) for row in reversed(rows)]
+    
+    def get_user_preferences(self) -> List[Dict[str, Any]]:
+        """Latest persisted preference row for every user"""
+        self.write_buffer.flush()
+        table = UserPreference.__table__
+        with engine.connect() as conn:
+            rows = conn.execute(select(table).order_by(table.c.id)).mappings().all()
+        # Later rows win should a user ever have more than one
+        return list({row["user_id"]: dict(row) for row in rows}.values())
+    
     def get_performance_data_for_analytics(self, org_id: int = 1) -> List[Dict[str, Any]]:
         # org_id parameter is currently unused
         return []
-    def list_missions(self, limit: int = 50) -> List[Mission]:
+    def list_missions(self, limit: int = 50, status: Optional[str] = None,
+                      owner_id: Optional[int] = None, organization_id: Optional[int] = None) -> List[Mission]:
         db = SessionLocal()
         try:
-            return db.query(Mission).order_by(Mission.created_at.desc()).limit(limit).all()
+            query = db.query(Mission)
+            if status is not None:
+                query = query.filter(Mission.status == status)
+            if owner_id is not None:
+                query = query.filter(Mission.owner_id == owner_id)
+            if organization_id is not None:
+                query = query.filter(Mission.organization_id == organization_id)
+            return query.order_by(Mission.created_at.desc(), Mission.id.desc()).limit(limit).all()
         finally:
             db.close()
     
+    def list_missions_page(self, limit: int = 50, cursor: Optional[str] = None,
+                           columns: Optional[Sequence[str]] = None, **filters) -> Dict[str, Any]:
+        """Keyset-paginated, column-projected listing: {"items": [...], "next_cursor": str | None}"""
+        stmt = _mission_list_query(columns, cursor, limit=limit, **filters)
+        with engine.connect() as conn:
+            rows = conn.execute(stmt).all()
+        return _mission_page(rows, limit)
+    
+    def iter_missions(self, batch_size: int = 500, columns: Optional[Sequence[str]] = None,
+                      **filters) -> Iterator[Dict[str, Any]]:
+        """Stream every matching mission page by page in constant memory"""
+        cursor = None
+        while True:
+            page = self.list_missions_page(batch_size, cursor, columns, **filters)
+            yield from page["items"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return
+    
     def create_optimization_proposal(self, proposal_type: str, description: str, rationale: str) -> OptimizationProposal:
         db = SessionLocal()
         try:
@@ -301,5 +968,310 @@ class DatabaseManager:
             db.close()
 
 
+class MissionSession:
+    """Unit of work bound to one mission for the lifetime of its execution.
+
+    Holds the loaded ``Mission`` so status updates and ``as_dict`` payloads do not
+    re-query the row; the pooled connection is only held while a transaction is open.
+    """
+
+    def __init__(self, session: "AsyncSession", mission_id_str: str):
+        self.session = session
+        self.mission_id_str = mission_id_str
+        self.mission: Optional[Mission] = None
+
+    async def load(self) -> Optional[Mission]:
+        result = await self.session.execute(
+            select(Mission).where(Mission.mission_id_str == self.mission_id_str)
+        )
+        self.mission = result.scalars().first()
+        return self.mission
+
+    async def rollback(self):
+        """Discard a failed transaction and reload the mission row"""
+        await self.session.rollback()
+        await self.load()
+
+    async def update_status(self, status: str, **kwargs) -> Optional[Mission]:
+        if self.mission is None and await self.load() is None:
+            return None
+        self._apply_status(status, kwargs)
+        await self.session.commit()
+        return self.mission
+
+    def _apply_status(self, status: str, fields: Dict[str, Any]):
+        """Assign the status, buffered progress and ``fields``, flagged so every one is written"""
+        # Direct writes supersede any buffered progress for this mission
+        pending = write_buffer.take_mission_fields(self.mission_id_str)
+        pending.pop("status", None)
+        fields = _completion_fields(self.mission, status, {**pending, **fields})
+        fields["status"] = status
+        for key, value in fields.items():
+            if hasattr(self.mission, key):
+                setattr(self.mission, key, value)
+                # update_progress marks buffered values as committed; without this an equal
+                # value would be skipped by the UPDATE after being taken out of the buffer
+                flag_modified(self.mission, key)
+
+    async def update_progress(self, progress: int, status: str = "running") -> Optional[Mission]:
+        """Write-behind progress update; the loaded row reflects it without a commit"""
+        if self.mission is None and await self.load() is None:
+            return None
+        write_buffer.enqueue_mission_fields(self.mission_id_str, status=status, progress=progress)
+        set_committed_value(self.mission, "status", status)
+        set_committed_value(self.mission, "progress", progress)
+        return self.mission
+
+    async def add_update(self, phase: str, message: str, metadata: Optional[dict] = None):
+        write_buffer.enqueue_mission_update(self.mission_id_str, phase, message, metadata)
+
+    async def increment_phoenix_retry(self) -> int:
+        if self.mission is None and await self.load() is None:
+            return 0
+        self.mission.phoenix_retries = (self.mission.phoenix_retries or 0) + 1
+        await self.session.commit()
+        return self.mission.phoenix_retries
+
+    def as_dict(self) -> Dict[str, Any]:
+        if self.mission is None:
+            return {"mission_id_str": self.mission_id_str}
+        return self.mission.as_dict()
+
+
+class AsyncDatabaseManager:
+    """Non-blocking repository on SQLAlchemy's async engine (aiosqlite or asyncpg)"""
+
+    def __init__(self, session_factory=None):
+        self.session_factory = session_factory or AsyncSessionLocal
+        if self.session_factory is None:
+            raise RuntimeError("Async database driver is not installed (pip install aiosqlite)")
+
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncIterator["AsyncSession"]:
+        """Single session for a unit of work: commit on success, rollback on error"""
+        async with self.session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    @asynccontextmanager
+    async def mission_scope(self, mission_id_str: str) -> AsyncIterator[MissionSession]:
+        """Session-per-mission context used by the engine while a mission runs"""
+        async with self.session_scope() as session:
+            mission_session = MissionSession(session, mission_id_str)
+            await mission_session.load()
+            yield mission_session
+
+    async def create_mission(self, **kwargs) -> Mission:
+        kwargs.setdefault('progress', 0)
+        kwargs.setdefault('organization_id', 1)
+        async with self.session_scope() as session:
+            mission = Mission(**kwargs)
+            session.add(mission)
+            await session.flush()
+            return mission
+
+    async def get_mission(self, mission_id_str: str) -> Optional[Mission]:
+        async with self.session_scope() as session:
+            result = await session.execute(select(Mission).where(Mission.mission_id_str == mission_id_str))
+            mission = result.scalars().first()
+        if mission:
+            # Overlay buffered progress after the session closes so the commit cannot persist it
+            for key, value in write_buffer.peek_mission_fields(mission_id_str).items():
+                setattr(mission, key, value)
+        return mission
+
+    async def get_mission_updates(self, mission_id_str: str) -> List[MissionUpdate]:
+        await asyncio.to_thread(write_buffer.flush)
+        async with self.session_scope() as session:
+            result = await session.execute(
+                select(MissionUpdate).where(MissionUpdate.mission_id_str == mission_id_str)
+            )
+            return list(result.scalars().all())
+
+    async def add_mission_update(self, mission_id_str: str, phase: str, message: str, metadata: Optional[dict] = None):
+        write_buffer.enqueue_mission_update(mission_id_str, phase, message, metadata)
+
+    async def update_mission_status(self, mission_id_str: str, status: str, **kwargs) -> Optional[Mission]:
+        async with self.mission_scope(mission_id_str) as mission_session:
+            return await mission_session.update_status(status, **kwargs)
+
+    async def increment_phoenix_retry(self, mission_id_str: str) -> int:
+        async with self.mission_scope(mission_id_str) as mission_session:
+            return await mission_session.increment_phoenix_retry()
+
+    async def list_missions(self, limit: int = 50, status: Optional[str] = None,
+                            owner_id: Optional[int] = None, organization_id: Optional[int] = None) -> List[Mission]:
+        stmt = select(Mission)
+        if status is not None:
+            stmt = stmt.where(Mission.status == status)
+        if owner_id is not None:
+            stmt = stmt.where(Mission.owner_id == owner_id)
+        if organization_id is not None:
+            stmt = stmt.where(Mission.organization_id == organization_id)
+        async with self.session_scope() as session:
+            result = await session.execute(stmt.order_by(Mission.created_at.desc(), Mission.id.desc()).limit(limit))
+            return list(result.scalars().all())
+
+    async def list_missions_page(self, limit: int = 50, cursor: Optional[str] = None,
+                                 columns: Optional[Sequence[str]] = None, **filters) -> Dict[str, Any]:
+        """Keyset-paginated, column-projected listing: {"items": [...], "next_cursor": str | None}"""
+        stmt = _mission_list_query(columns, cursor, limit=limit, **filters)
+        async with self.session_scope() as session:
+            rows = (await session.execute(stmt)).all()
+        return _mission_page(rows, limit)
+
+    async def iter_missions(self, batch_size: int = 500, columns: Optional[Sequence[str]] = None,
+                            **filters) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every matching mission page by page in constant memory"""
+        cursor = None
+        while True:
+            page = await self.list_missions_page(batch_size, cursor, columns, **filters)
+            for item in page["items"]:
+                yield item
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return
+
+    async def get_system_stats(self) -> Dict[str, Any]:
+        async with self.session_scope() as session:
+            counters = (await session.execute(select(MissionStatusCounter))).scalars().all()
+            buckets = (await session.execute(
+                select(ExecutionTimeBucket).order_by(ExecutionTimeBucket.bucket)
+            )).scalars().all()
+            flags = (await session.execute(select(MissionFlagCounter))).scalars().all()
+            return _build_system_stats(list(counters), list(buckets), list(flags))
+
+    async def create_optimization_proposal(self, proposal_type: str, description: str, rationale: str) -> OptimizationProposal:
+        async with self.session_scope() as session:
+            proposal = OptimizationProposal(
+                proposal_type=proposal_type,
+                description=description,
+                rationale=rationale
+            )
+            session.add(proposal)
+            await session.flush()
+            return proposal
+
+    async def dispose(self):
+        """Drain the write-behind queue and close pooled connections (call on shutdown)"""
+        await asyncio.to_thread(write_buffer.close)
+        if async_engine is not None:
+            await async_engine.dispose()
+
+
+class SyncMissionSession(MissionSession):
+    """``MissionSession`` over a sync ``Session``; each database round trip runs in a worker thread"""
+
+    def __init__(self, session: Session, mission_id_str: str):
+        super().__init__(session, mission_id_str)
+
+    async def load(self) -> Optional[Mission]:
+        self.mission = await asyncio.to_thread(
+            lambda: self.session.query(Mission).filter(Mission.mission_id_str == self.mission_id_str).first()
+        )
+        return self.mission
+
+    async def rollback(self):
+        await asyncio.to_thread(self.session.rollback)
+        await self.load()
+
+    async def update_status(self, status: str, **kwargs) -> Optional[Mission]:
+        if self.mission is None and await self.load() is None:
+            return None
+        self._apply_status(status, kwargs)
+        await asyncio.to_thread(self.session.commit)
+        return self.mission
+
+    async def increment_phoenix_retry(self) -> int:
+        if self.mission is None and await self.load() is None:
+            return 0
+        self.mission.phoenix_retries = (self.mission.phoenix_retries or 0) + 1
+        await asyncio.to_thread(self.session.commit)
+        return self.mission.phoenix_retries
+
+
+class ThreadedDatabaseManager:
+    """Async repository interface over ``DatabaseManager``, used when no async driver is installed.
+
+    Every call runs the sync implementation in a worker thread so the event loop never blocks.
+    """
+
+    def __init__(self, sync_manager: DatabaseManager):
+        self.sync_manager = sync_manager
+
+    @asynccontextmanager
+    async def mission_scope(self, mission_id_str: str) -> AsyncIterator[MissionSession]:
+        """Session-per-mission context used by the engine while a mission runs"""
+        session = SessionLocal(expire_on_commit=False)
+        try:
+            mission_session = SyncMissionSession(session, mission_id_str)
+            await mission_session.load()
+            yield mission_session
+            await asyncio.to_thread(session.commit)
+        except Exception:
+            await asyncio.to_thread(session.rollback)
+            raise
+        finally:
+            await asyncio.to_thread(session.close)
+
+    async def create_mission(self, **kwargs) -> Mission:
+        return await asyncio.to_thread(self.sync_manager.create_mission, **kwargs)
+
+    async def get_mission(self, mission_id_str: str) -> Optional[Mission]:
+        return await asyncio.to_thread(self.sync_manager.get_mission, mission_id_str)
+
+    async def get_mission_updates(self, mission_id_str: str) -> List[MissionUpdate]:
+        return await asyncio.to_thread(self.sync_manager.get_mission_updates, mission_id_str)
+
+    async def add_mission_update(self, mission_id_str: str, phase: str, message: str, metadata: Optional[dict] = None):
+        write_buffer.enqueue_mission_update(mission_id_str, phase, message, metadata)
+
+    async def update_mission_status(self, mission_id_str: str, status: str, **kwargs) -> Optional[Mission]:
+        async with self.mission_scope(mission_id_str) as mission_session:
+            return await mission_session.update_status(status, **kwargs)
+
+    async def increment_phoenix_retry(self, mission_id_str: str) -> int:
+        return await asyncio.to_thread(self.sync_manager.increment_phoenix_retry, mission_id_str)
+
+    async def list_missions(self, limit: int = 50, status: Optional[str] = None,
+                            owner_id: Optional[int] = None, organization_id: Optional[int] = None) -> List[Mission]:
+        return await asyncio.to_thread(self.sync_manager.list_missions, limit, status, owner_id, organization_id)
+
+    async def list_missions_page(self, limit: int = 50, cursor: Optional[str] = None,
+                                 columns: Optional[Sequence[str]] = None, **filters) -> Dict[str, Any]:
+        """Keyset-paginated, column-projected listing: {"items": [...], "next_cursor": str | None}"""
+        return await asyncio.to_thread(self.sync_manager.list_missions_page, limit, cursor, columns, **filters)
+
+    async def iter_missions(self, batch_size: int = 500, columns: Optional[Sequence[str]] = None,
+                            **filters) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every matching mission page by page in constant memory"""
+        cursor = None
+        while True:
+            page = await self.list_missions_page(batch_size, cursor, columns, **filters)
+            for item in page["items"]:
+                yield item
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return
+
+    async def get_system_stats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.sync_manager.get_system_stats)
+
+    async def create_optimization_proposal(self, proposal_type: str, description: str, rationale: str) -> OptimizationProposal:
+        return await asyncio.to_thread(
+            self.sync_manager.create_optimization_proposal, proposal_type, description, rationale
+        )
+
+    async def dispose(self):
+        """Drain the write-behind queue (call on shutdown)"""
+        await asyncio.to_thread(write_buffer.close)
+
+
 # Global database manager instance
 db_manager = DatabaseManager()
+# Callers always get an async repository; without an async driver it runs the sync one in threads
+async_db_manager = AsyncDatabaseManager() if ASYNC_DB_AVAILABLE else ThreadedDatabaseManager(db_manager)
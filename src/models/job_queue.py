@@ -0,0 +1,342 @@
+"""
+Durable mission job queue and TTL result store
+Jobs live in mission_jobs and are owned by a worker only while its lease is live,
+so any process sharing the database can claim them and a crashed worker's jobs are requeued
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.exc import IntegrityError
+
+try:
+    from ..config.settings import settings
+    from .advanced_database import SessionLocal, MissionJob, MissionResult
+except ImportError:
+    from config.settings import settings
+    from models.advanced_database import SessionLocal, MissionJob, MissionResult
+
+
+ACTIVE_JOB_STATUSES = ("queued", "leased")
+FINISHED_JOB_STATUSES = ("completed", "failed", "cancelled")
+
+
+def _utcnow() -> datetime:
+    # Timestamps are stored as naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _job_dict(job: MissionJob) -> Dict[str, Any]:
+    d = {c.name: getattr(job, c.name) for c in MissionJob.__table__.columns}
+    for key, value in d.items():
+        if isinstance(value, datetime):
+            d[key] = value.isoformat()
+    return d
+
+
+class JobQueueFullError(Exception):
+    """Raised by ``enqueue`` when the backlog is at JOB_QUEUE_MAX_PENDING"""
+    status_code = 429
+
+
+class ResultStore:
+    """Mission outcomes with a time-to-live, shared by every process on the database"""
+
+    def __init__(self, ttl: Optional[int] = None):
+        self.ttl = ttl or settings.MISSION_RESULT_TTL
+
+    def put(self, mission_id: str, status: str, result: Any = None, error: Optional[str] = None,
+            db=None):
+        """Insert or replace the outcome; pass ``db`` to write inside an open transaction"""
+        now = _utcnow()
+        row = MissionResult(
+            mission_id_str=mission_id,
+            status=status,
+            # Round-trip through json so arbitrary engine output fits the JSON column
+            result=json.loads(json.dumps(result, default=str)) if result is not None else None,
+            error=error,
+            created_at=now,
+            expires_at=now + timedelta(seconds=self.ttl),
+        )
+        if db is not None:
+            db.merge(row)
+            return
+        with SessionLocal() as session:
+            session.merge(row)
+            session.commit()
+
+    def get(self, mission_id: str) -> Optional[Dict[str, Any]]:
+        with SessionLocal() as session:
+            row = session.get(MissionResult, mission_id)
+            if row is None or (row.expires_at and row.expires_at < _utcnow()):
+                return None
+            return {
+                "status": row.status,
+                "result": row.result,
+                "error": row.error,
+                "timestamp": row.created_at.isoformat() if row.created_at else None,
+            }
+
+    def delete(self, mission_id: str):
+        with SessionLocal() as session:
+            session.execute(delete(MissionResult).where(MissionResult.mission_id_str == mission_id))
+            session.commit()
+
+    def purge_expired(self) -> int:
+        with SessionLocal() as session:
+            deleted = session.execute(
+                delete(MissionResult).where(MissionResult.expires_at < _utcnow())
+            ).rowcount
+            session.commit()
+        return deleted or 0
+
+
+class JobQueue:
+    """Lease-based job queue on the mission database.
+
+    ``claim`` is a compare-and-set from ``queued`` to ``leased``, so two workers can
+    never own the same job; completion and failure are fenced on the lease owner, so
+    a worker whose lease expired cannot overwrite the outcome of the job's next run.
+    """
+
+    def __init__(self, results: Optional[ResultStore] = None, lease_seconds: Optional[int] = None,
+                 max_pending: Optional[int] = None):
+        self.results = results or ResultStore()
+        self.lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        self.max_pending = max_pending or settings.JOB_QUEUE_MAX_PENDING
+
+    # --- Producers ---
+
+    def enqueue(self, mission_id: str, prompt: str, agent_type: str = "developer", priority_rank: int = 2,
+                max_attempts: Optional[int] = None) -> Tuple[Dict[str, Any], bool]:
+        """Queue a mission; returns (job, created). Re-submitting an active mission is a no-op"""
+        with SessionLocal() as db:
+            job = db.execute(select(MissionJob).where(MissionJob.mission_id_str == mission_id)).scalars().first()
+            if job is not None and job.status in ACTIVE_JOB_STATUSES:
+                return _job_dict(job), False
+
+            pending = db.execute(
+                select(func.count()).select_from(MissionJob).where(MissionJob.status == "queued")
+            ).scalar()
+            if pending >= self.max_pending:
+                raise JobQueueFullError(f"Mission job queue is full ({pending} pending)")
+
+            if job is None:
+                job = MissionJob(mission_id_str=mission_id)
+                db.add(job)
+            # A finished mission submitted again starts over as a fresh job
+            job.prompt = prompt
+            job.agent_type = agent_type
+            job.priority_rank = priority_rank
+            job.status = "queued"
+            job.attempts = 0
+            job.max_attempts = max_attempts or settings.JOB_MAX_ATTEMPTS
+            job.lease_owner = None
+            job.lease_expires_at = None
+            job.cancel_requested = False
+            job.error_message = None
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another producer inserted this mission between our check and insert; theirs wins
+                db.rollback()
+                job = db.execute(select(MissionJob).where(MissionJob.mission_id_str == mission_id)).scalars().first()
+                if job is None:
+                    raise
+                return _job_dict(job), False
+            return _job_dict(job), True
+
+    def cancel(self, mission_id: str) -> Optional[str]:
+        """Cancel a queued job outright, or flag a leased one for its worker; returns the prior status"""
+        with SessionLocal() as db:
+            job = db.execute(select(MissionJob).where(MissionJob.mission_id_str == mission_id)).scalars().first()
+            if job is None or job.status not in ACTIVE_JOB_STATUSES:
+                return None
+            previous = job.status
+            if previous == "queued":
+                job.status = "cancelled"
+                self.results.put(mission_id, "cancelled", error="Mission was cancelled", db=db)
+            else:
+                # The owning worker sees this on its next heartbeat
+                job.cancel_requested = True
+            db.commit()
+            return previous
+
+    # --- Workers ---
+
+    def claim(self, worker_id: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """Lease up to ``limit`` queued jobs, highest priority first"""
+        if limit <= 0:
+            return []
+        claimed = []
+        with SessionLocal() as db:
+            query = (
+                select(MissionJob.id)
+                .where(MissionJob.status == "queued")
+                .order_by(MissionJob.priority_rank, MissionJob.id)
+                .limit(limit)
+            )
+            if db.bind.dialect.name == "postgresql":
+                query = query.with_for_update(skip_locked=True)
+            candidates = db.execute(query).scalars().all()
+            now = _utcnow()
+            for job_id in candidates:
+                won = db.execute(
+                    update(MissionJob)
+                    .where(MissionJob.id == job_id, MissionJob.status == "queued")
+                    .values(
+                        status="leased",
+                        lease_owner=worker_id,
+                        lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                        heartbeat_at=now,
+                        attempts=MissionJob.attempts + 1,
+                    )
+                ).rowcount
+                if won:
+                    claimed.append(job_id)
+            db.commit()
+            if not claimed:
+                return []
+            jobs = db.execute(select(MissionJob).where(MissionJob.id.in_(claimed))).scalars().all()
+            jobs = sorted(jobs, key=lambda j: (j.priority_rank, j.id))
+            return [_job_dict(job) for job in jobs]
+
+    def heartbeat(self, job_id: int, worker_id: str) -> str:
+        """Extend the lease; returns "ok", "cancel" (cancellation requested) or "lost" (lease gone)"""
+        with SessionLocal() as db:
+            renewed = db.execute(
+                update(MissionJob)
+                .where(MissionJob.id == job_id, MissionJob.lease_owner == worker_id, MissionJob.status == "leased")
+                .values(lease_expires_at=_utcnow() + timedelta(seconds=self.lease_seconds), heartbeat_at=_utcnow())
+            ).rowcount
+            cancel = db.execute(select(MissionJob.cancel_requested).where(MissionJob.id == job_id)).scalar()
+            db.commit()
+        if not renewed:
+            return "lost"
+        return "cancel" if cancel else "ok"
+
+    def complete(self, job_id: int, worker_id: str, result: Any = None) -> bool:
+        return self._finish(job_id, worker_id, "completed", result=result)
+
+    def fail(self, job_id: int, worker_id: str, error: str, retry: bool = False) -> bool:
+        """Record a failure; with ``retry`` the job is requeued while attempts remain"""
+        if retry:
+            with SessionLocal() as db:
+                requeued = db.execute(
+                    update(MissionJob)
+                    .where(MissionJob.id == job_id, MissionJob.lease_owner == worker_id,
+                           MissionJob.status == "leased", MissionJob.attempts < MissionJob.max_attempts,
+                           MissionJob.cancel_requested.is_not(True))
+                    .values(status="queued", lease_owner=None, lease_expires_at=None, error_message=error)
+                ).rowcount
+                db.commit()
+            if requeued:
+                return True
+        return self._finish(job_id, worker_id, "failed", error=error)
+
+    def mark_cancelled(self, job_id: int, worker_id: str) -> bool:
+        return self._finish(job_id, worker_id, "cancelled", error="Mission was cancelled")
+
+    def release(self, job_id: int, worker_id: str) -> bool:
+        """Hand a leased job back (worker shutdown) without charging it an attempt"""
+        with SessionLocal() as db:
+            released = db.execute(
+                update(MissionJob)
+                .where(MissionJob.id == job_id, MissionJob.lease_owner == worker_id, MissionJob.status == "leased")
+                .values(status="queued", lease_owner=None, lease_expires_at=None,
+                        attempts=MissionJob.attempts - 1)
+            ).rowcount
+            db.commit()
+        return bool(released)
+
+    def _finish(self, job_id: int, worker_id: str, status: str, result: Any = None,
+                error: Optional[str] = None) -> bool:
+        with SessionLocal() as db:
+            job = db.get(MissionJob, job_id)
+            if job is None or job.status != "leased" or job.lease_owner != worker_id:
+                logger.warning(f"⚠️ Job {job_id} is no longer leased by {worker_id}; dropping its {status} outcome")
+                return False
+            job.status = status
+            job.lease_owner = None
+            job.lease_expires_at = None
+            job.error_message = error
+            self.results.put(job.mission_id_str, status, result=result, error=error, db=db)
+            db.commit()
+        return True
+
+    # --- Recovery & housekeeping ---
+
+    def requeue_expired(self) -> Dict[str, int]:
+        """Return jobs whose lease ran out (crashed or stalled worker) to the queue, or fail them when out of attempts"""
+        now = _utcnow()
+        with SessionLocal() as db:
+            expired = (MissionJob.status == "leased", MissionJob.lease_expires_at < now)
+            dead = db.execute(
+                select(MissionJob).where(*expired, MissionJob.attempts >= MissionJob.max_attempts)
+            ).scalars().all()
+            for job in dead:
+                job.status = "failed"
+                job.lease_owner = None
+                job.lease_expires_at = None
+                job.error_message = f"Lease expired after {job.attempts} attempts"
+                self.results.put(job.mission_id_str, "failed", error=job.error_message, db=db)
+            requeued = db.execute(
+                update(MissionJob)
+                .where(*expired, MissionJob.attempts < MissionJob.max_attempts)
+                .values(status="queued", lease_owner=None, lease_expires_at=None)
+            ).rowcount
+            db.commit()
+        if requeued or dead:
+            logger.warning(f"♻️ Recovered expired job leases: {requeued} requeued, {len(dead)} failed")
+        return {"requeued": requeued or 0, "failed": len(dead)}
+
+    def purge(self) -> Dict[str, int]:
+        """Drop expired results and finished jobs older than the result TTL"""
+        horizon = _utcnow() - timedelta(seconds=self.results.ttl)
+        with SessionLocal() as db:
+            jobs = db.execute(
+                delete(MissionJob).where(MissionJob.status.in_(FINISHED_JOB_STATUSES), MissionJob.updated_at < horizon)
+            ).rowcount
+            db.commit()
+        return {"jobs": jobs or 0, "results": self.results.purge_expired()}
+
+    # --- Reporting ---
+
+    def get(self, mission_id: str) -> Optional[Dict[str, Any]]:
+        with SessionLocal() as db:
+            job = db.execute(select(MissionJob).where(MissionJob.mission_id_str == mission_id)).scalars().first()
+            return _job_dict(job) if job else None
+
+    def position(self, mission_id: str) -> Optional[int]:
+        """Queued jobs ahead of this one, None if it is not queued"""
+        with SessionLocal() as db:
+            job = db.execute(select(MissionJob).where(MissionJob.mission_id_str == mission_id)).scalars().first()
+            if job is None or job.status != "queued":
+                return None
+            return db.execute(
+                select(func.count()).select_from(MissionJob).where(
+                    MissionJob.status == "queued",
+                    (MissionJob.priority_rank < job.priority_rank)
+                    | ((MissionJob.priority_rank == job.priority_rank) & (MissionJob.id < job.id))
+                )
+            ).scalar()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with SessionLocal() as db:
+            counts = dict(db.execute(
+                select(MissionJob.status, func.count()).group_by(MissionJob.status)
+            ).all())
+        return {
+            "jobs_by_status": counts,
+            "max_pending": self.max_pending,
+            "lease_seconds": self.lease_seconds,
+            "result_ttl_seconds": self.results.ttl,
+        }
+
+
+# Global job queue and result store instances
+result_store = ResultStore()
+job_queue = JobQueue(results=result_store)
@@ -0,0 +1,346 @@
+"""
+Lightweight schema migrations for the Sentinel mission database
+Upgrades existing database files in place; applied versions are tracked in schema_migrations
+"""
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, List
+
+from loguru import logger
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+
+@dataclass
+class Migration:
+    """A single forward-only schema change"""
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, description: str):
+    """Register a migration function under a unique, increasing version number"""
+    def decorator(func: Callable[[Connection], None]) -> Callable[[Connection], None]:
+        if any(m.version == version for m in MIGRATIONS):
+            raise ValueError(f"Duplicate migration version: {version}")
+        MIGRATIONS.append(Migration(version, description, func))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return func
+    return decorator
+
+
+# --- Helpers -----------------------------------------------------------------
+
+def _table_exists(conn: Connection, table: str) -> bool:
+    return inspect(conn).has_table(table)
+
+
+def _column_exists(conn: Connection, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+
+def add_column_if_missing(conn: Connection, table: str, column: str, ddl_type: str):
+    """ALTER TABLE ... ADD COLUMN, skipped when the column already exists"""
+    if _table_exists(conn, table) and not _column_exists(conn, table, column):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
+def create_index_if_missing(conn: Connection, name: str, table: str, columns: List[str]):
+    """CREATE INDEX IF NOT EXISTS (supported by both SQLite and PostgreSQL)"""
+    if _table_exists(conn, table):
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+
+# --- Migrations --------------------------------------------------------------
+
+@migration(1, "Composite indexes for mission listing, stats and update timelines")
+def _composite_indexes(conn: Connection):
+    create_index_if_missing(conn, "ix_missions_status_created_at", "missions", ["status", "created_at"])
+    create_index_if_missing(conn, "ix_missions_organization_created_at", "missions", ["organization_id", "created_at"])
+    create_index_if_missing(conn, "ix_mission_updates_mission_timestamp", "mission_updates", ["mission_id_str", "timestamp"])
+
+
+# Upper bounds (seconds) of the execution-time histogram; the last bucket is open-ended
+EXECUTION_TIME_BUCKETS = [
+    0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 45, 60, 90, 120, 180,
+    300, 450, 600, 900, 1200, 1800, 2700, 3600, 5400, 7200, None,
+]
+
+_BUCKET_FOR = (
+    "(SELECT MIN(bucket) FROM execution_time_buckets "
+    "WHERE upper_bound IS NULL OR upper_bound >= {row}.execution_time)"
+)
+
+_SQLITE_COUNTER_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_missions_counters_insert AFTER INSERT ON missions
+    BEGIN
+        INSERT INTO mission_status_counters (status, count) VALUES (COALESCE(NEW.status, 'pending'), 1)
+            ON CONFLICT(status) DO UPDATE SET count = count + 1;
+        UPDATE execution_time_buckets SET count = count + 1, total_time = total_time + NEW.execution_time
+            WHERE NEW.status = 'completed' AND NEW.execution_time IS NOT NULL AND bucket = {_BUCKET_FOR.format(row="NEW")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_missions_counters_update AFTER UPDATE OF status, execution_time ON missions
+    WHEN OLD.status IS NOT NEW.status OR OLD.execution_time IS NOT NEW.execution_time
+    BEGIN
+        UPDATE mission_status_counters SET count = count - 1 WHERE status = COALESCE(OLD.status, 'pending');
+        INSERT INTO mission_status_counters (status, count) VALUES (COALESCE(NEW.status, 'pending'), 1)
+            ON CONFLICT(status) DO UPDATE SET count = count + 1;
+        UPDATE execution_time_buckets SET count = count - 1, total_time = total_time - OLD.execution_time
+            WHERE OLD.status = 'completed' AND OLD.execution_time IS NOT NULL AND bucket = {_BUCKET_FOR.format(row="OLD")};
+        UPDATE execution_time_buckets SET count = count + 1, total_time = total_time + NEW.execution_time
+            WHERE NEW.status = 'completed' AND NEW.execution_time IS NOT NULL AND bucket = {_BUCKET_FOR.format(row="NEW")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_missions_counters_delete AFTER DELETE ON missions
+    BEGIN
+        UPDATE mission_status_counters SET count = count - 1 WHERE status = COALESCE(OLD.status, 'pending');
+        UPDATE execution_time_buckets SET count = count - 1, total_time = total_time - OLD.execution_time
+            WHERE OLD.status = 'completed' AND OLD.execution_time IS NOT NULL AND bucket = {_BUCKET_FOR.format(row="OLD")};
+    END
+    """,
+]
+
+_POSTGRES_COUNTER_TRIGGERS = [
+    f"""
+    CREATE OR REPLACE FUNCTION sentinel_mission_counters() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE mission_status_counters SET count = count - 1 WHERE status = COALESCE(OLD.status, 'pending');
+            IF OLD.status = 'completed' AND OLD.execution_time IS NOT NULL THEN
+                UPDATE execution_time_buckets SET count = count - 1, total_time = total_time - OLD.execution_time
+                    WHERE bucket = {_BUCKET_FOR.format(row="OLD")};
+            END IF;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO mission_status_counters (status, count) VALUES (COALESCE(NEW.status, 'pending'), 1)
+                ON CONFLICT (status) DO UPDATE SET count = mission_status_counters.count + 1;
+            IF NEW.status = 'completed' AND NEW.execution_time IS NOT NULL THEN
+                UPDATE execution_time_buckets SET count = count + 1, total_time = total_time + NEW.execution_time
+                    WHERE bucket = {_BUCKET_FOR.format(row="NEW")};
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_missions_counters_insert_delete ON missions",
+    "CREATE TRIGGER trg_missions_counters_insert_delete AFTER INSERT OR DELETE ON missions "
+    "FOR EACH ROW EXECUTE FUNCTION sentinel_mission_counters()",
+    "DROP TRIGGER IF EXISTS trg_missions_counters_update ON missions",
+    "CREATE TRIGGER trg_missions_counters_update AFTER UPDATE OF status, execution_time ON missions "
+    "FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status OR OLD.execution_time IS DISTINCT FROM NEW.execution_time) "
+    "EXECUTE FUNCTION sentinel_mission_counters()",
+]
+
+
+@migration(2, "Materialized mission status counters and execution-time histogram")
+def _materialized_counters(conn: Connection):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS mission_status_counters ("
+        "status VARCHAR PRIMARY KEY, "
+        "count INTEGER NOT NULL DEFAULT 0)"
+    ))
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS execution_time_buckets ("
+        "bucket INTEGER PRIMARY KEY, "
+        "upper_bound FLOAT, "
+        "count INTEGER NOT NULL DEFAULT 0, "
+        "total_time FLOAT NOT NULL DEFAULT 0)"
+    ))
+
+    # Seed buckets and backfill both tables from the rows that already exist
+    conn.execute(text("DELETE FROM execution_time_buckets"))
+    conn.execute(
+        text("INSERT INTO execution_time_buckets (bucket, upper_bound, count, total_time) VALUES (:b, :u, 0, 0)"),
+        [{"b": i, "u": bound} for i, bound in enumerate(EXECUTION_TIME_BUCKETS)]
+    )
+    conn.execute(text("DELETE FROM mission_status_counters"))
+    if not _table_exists(conn, "missions"):
+        return
+    conn.execute(text(
+        "INSERT INTO mission_status_counters (status, count) "
+        "SELECT COALESCE(status, 'pending'), COUNT(*) FROM missions GROUP BY COALESCE(status, 'pending')"
+    ))
+    conn.execute(text(
+        "UPDATE execution_time_buckets SET "
+        "count = (SELECT COUNT(*) FROM missions m WHERE m.status = 'completed' AND m.execution_time IS NOT NULL "
+        f"AND {_BUCKET_FOR.format(row='m')} = execution_time_buckets.bucket), "
+        "total_time = COALESCE((SELECT SUM(m.execution_time) FROM missions m WHERE m.status = 'completed' "
+        f"AND m.execution_time IS NOT NULL AND {_BUCKET_FOR.format(row='m')} = execution_time_buckets.bucket), 0)"
+    ))
+
+    triggers = _POSTGRES_COUNTER_TRIGGERS if conn.dialect.name == "postgresql" else _SQLITE_COUNTER_TRIGGERS
+    for ddl in triggers:
+        conn.execute(text(ddl))
+
+
+@migration(3, "Keyset pagination indexes for mission listing")
+def _keyset_indexes(conn: Connection):
+    create_index_if_missing(conn, "ix_missions_owner_created_at", "missions", ["owner_id", "created_at"])
+    create_index_if_missing(conn, "ix_missions_created_at_id", "missions", ["created_at", "id"])
+
+
+@migration(4, "Timestamp indexes for retention scans")
+def _retention_indexes(conn: Connection):
+    create_index_if_missing(conn, "ix_mission_updates_timestamp", "mission_updates", ["timestamp"])
+    create_index_if_missing(conn, "ix_system_logs_timestamp", "system_logs", ["timestamp"])
+    create_index_if_missing(conn, "ix_performance_metrics_timestamp", "performance_metrics", ["timestamp"])
+
+
+@migration(5, "Indexes for performance metric replay and user preference upserts")
+def _learning_indexes(conn: Connection):
+    create_index_if_missing(conn, "ix_performance_metrics_path_timestamp", "performance_metrics", ["execution_path", "timestamp"])
+    create_index_if_missing(conn, "ix_user_preferences_user_id", "user_preferences", ["user_id"])
+
+
+@migration(6, "Claim and lease indexes for the durable mission job queue")
+def _job_queue_indexes(conn: Connection):
+    # The tables themselves come from create_all; this only backfills their indexes
+    create_index_if_missing(conn, "ix_mission_jobs_claim", "mission_jobs", ["status", "priority_rank", "id"])
+    create_index_if_missing(conn, "ix_mission_jobs_lease", "mission_jobs", ["status", "lease_expires_at"])
+
+
+@migration(7, "Prompt and task id on performance metrics for model replay")
+def _performance_metric_inputs(conn: Connection):
+    # Older rows keep NULLs and only feed the EWMA baseline when replayed
+    add_column_if_missing(conn, "performance_metrics", "task_id", "VARCHAR")
+    add_column_if_missing(conn, "performance_metrics", "prompt", "TEXT")
+
+
+_HEALING_DELTA = "(CASE WHEN {row}.is_healing THEN 1 ELSE 0 END)"
+
+_SQLITE_FLAG_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_missions_flags_insert AFTER INSERT ON missions
+    WHEN NEW.is_healing
+    BEGIN
+        UPDATE mission_flag_counters SET count = count + 1 WHERE flag = 'healing';
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_missions_flags_update AFTER UPDATE OF is_healing ON missions
+    WHEN {_HEALING_DELTA.format(row="OLD")} IS NOT {_HEALING_DELTA.format(row="NEW")}
+    BEGIN
+        UPDATE mission_flag_counters
+            SET count = count - {_HEALING_DELTA.format(row="OLD")} + {_HEALING_DELTA.format(row="NEW")}
+            WHERE flag = 'healing';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_missions_flags_delete AFTER DELETE ON missions
+    WHEN OLD.is_healing
+    BEGIN
+        UPDATE mission_flag_counters SET count = count - 1 WHERE flag = 'healing';
+    END
+    """,
+]
+
+_POSTGRES_FLAG_TRIGGERS = [
+    f"""
+    CREATE OR REPLACE FUNCTION sentinel_mission_flags() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE mission_flag_counters SET count = count - {_HEALING_DELTA.format(row="OLD")} WHERE flag = 'healing';
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE mission_flag_counters SET count = count + {_HEALING_DELTA.format(row="NEW")} WHERE flag = 'healing';
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_missions_flags_insert_delete ON missions",
+    "CREATE TRIGGER trg_missions_flags_insert_delete AFTER INSERT OR DELETE ON missions "
+    "FOR EACH ROW EXECUTE FUNCTION sentinel_mission_flags()",
+    "DROP TRIGGER IF EXISTS trg_missions_flags_update ON missions",
+    "CREATE TRIGGER trg_missions_flags_update AFTER UPDATE OF is_healing ON missions "
+    "FOR EACH ROW WHEN (OLD.is_healing IS DISTINCT FROM NEW.is_healing) "
+    "EXECUTE FUNCTION sentinel_mission_flags()",
+]
+
+
+@migration(8, "Materialized counter of missions that entered self-healing")
+def _materialized_flag_counters(conn: Connection):
+    # Healing is recorded in missions.is_healing; the "healing" status only lasts while a retry runs
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS mission_flag_counters ("
+        "flag VARCHAR PRIMARY KEY, "
+        "count INTEGER NOT NULL DEFAULT 0)"
+    ))
+    conn.execute(text("DELETE FROM mission_flag_counters"))
+    conn.execute(text("INSERT INTO mission_flag_counters (flag, count) VALUES ('healing', 0)"))
+    if not _table_exists(conn, "missions"):
+        return
+    conn.execute(text(
+        "UPDATE mission_flag_counters SET count = "
+        f"(SELECT COALESCE(SUM({_HEALING_DELTA.format(row='missions')}), 0) FROM missions) WHERE flag = 'healing'"
+    ))
+
+    triggers = _POSTGRES_FLAG_TRIGGERS if conn.dialect.name == "postgresql" else _SQLITE_FLAG_TRIGGERS
+    for ddl in triggers:
+        conn.execute(text(ddl))
+
+
+# --- Runner ------------------------------------------------------------------
+
+def _ensure_version_table(engine: Engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, "
+            "description VARCHAR, "
+            "applied_at VARCHAR)"
+        ))
+
+
+def current_version(engine: Engine) -> int:
+    _ensure_version_table(engine)
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")).scalar() or 0
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """Apply every pending migration in version order; each runs in its own transaction"""
+    applied = []
+    version = current_version(engine)
+    for m in MIGRATIONS:
+        if m.version <= version:
+            continue
+        with engine.begin() as conn:
+            m.apply(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)"),
+                {"v": m.version, "d": m.description, "t": datetime.now(timezone.utc).isoformat()}
+            )
+        logger.info(f"🗄️ Applied schema migration {m.version}: {m.description}")
+        applied.append(m.version)
+    return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upgrade a Sentinel mission database in place")
+    parser.add_argument("database_url", nargs="?", default="sqlite:///db/sentinel_missions.db")
+    parser.add_argument("--status", action="store_true", help="Show the current schema version and exit")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if args.status:
+        pending = [m.version for m in MIGRATIONS if m.version > current_version(engine)]
+        print(f"Schema version: {current_version(engine)} (pending: {pending or 'none'})")
+        return
+    applied = run_migrations(engine)
+    print(f"Applied migrations: {applied or 'none'} - schema version {current_version(engine)}")
+
+
+if __name__ == "__main__":
+    main()
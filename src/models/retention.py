@@ -0,0 +1,211 @@
+"""
+Retention, archival and compaction for the hot mission database
+Moves aged rows into date-partitioned gzip JSONL archives and keeps the SQLite file compact
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from loguru import logger
+from sqlalchemy import and_, or_, select, text
+
+try:
+    from ..config.settings import settings
+    from .advanced_database import engine, SessionLocal, MissionUpdate, SystemLog, PerformanceMetric
+except ImportError:
+    from config.settings import settings
+    from models.advanced_database import engine, SessionLocal, MissionUpdate, SystemLog, PerformanceMetric
+
+
+class RetentionManager:
+    """Archives rows past their retention horizon and deletes them in bounded batches"""
+
+    def __init__(self, archive_dir: Optional[str] = None, batch_size: Optional[int] = None):
+        self.archive_dir = Path(archive_dir or settings.ARCHIVE_DIR)
+        self.batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+        self.last_run: Dict[str, Any] = {}
+
+    def policies(self) -> List[Dict[str, Any]]:
+        """Per-table policies derived from settings: an age ``horizon``, or a row bound ``keep`` per ``group_by`` value"""
+        memory_horizon = timedelta(days=settings.MEMORY_RETENTION_DAYS)
+        return [
+            {"model": MissionUpdate, "horizon": memory_horizon},
+            {"model": SystemLog, "horizon": memory_horizon},
+            # Bounded by count, not age: the learning system replays the newest rows per path on startup
+            {"model": PerformanceMetric, "group_by": "execution_path",
+             "keep": max(settings.PERFORMANCE_METRICS_MAX_ROWS, settings.PERFORMANCE_REHYDRATE_WINDOW)},
+        ]
+
+    def run_once(self) -> Dict[str, Any]:
+        """Archive and purge every table, then compact; returns a per-table summary"""
+        start = time.perf_counter()
+        summary: Dict[str, Any] = {"tables": {}}
+        for policy in self.policies():
+            model = policy["model"]
+            try:
+                if "horizon" in policy:
+                    result = self.archive_table(model, policy["horizon"])
+                else:
+                    result = self.archive_excess(model, policy["group_by"], policy["keep"])
+                summary["tables"][model.__tablename__] = result
+            except Exception as e:
+                logger.error(f"❌ Retention failed for {model.__tablename__}: {e}")
+                summary["tables"][model.__tablename__] = {"error": str(e)}
+
+        archived = sum(t.get("archived", 0) for t in summary["tables"].values())
+        if archived:
+            try:
+                summary["compaction"] = self.compact()
+            except Exception as e:
+                logger.error(f"❌ Compaction failed: {e}")
+                summary["compaction"] = {"error": str(e)}
+        summary["duration_ms"] = (time.perf_counter() - start) * 1000
+        summary["finished_at"] = datetime.now(timezone.utc).isoformat()
+        self.last_run = summary
+        logger.info(f"🧹 Retention pass archived {archived} rows in {summary['duration_ms']:.0f}ms")
+        return summary
+
+    def archive_table(self, model, horizon: timedelta) -> Dict[str, Any]:
+        """Move rows older than ``horizon`` to the archive"""
+        table = model.__table__
+        # Timestamps are stored as naive UTC
+        cutoff = (datetime.now(timezone.utc) - horizon).replace(tzinfo=None)
+        archived, partitions = self._archive_where(table, table.c.timestamp < cutoff)
+        return {"archived": archived, "cutoff": cutoff.isoformat(), "partitions": sorted(partitions)}
+
+    def archive_excess(self, model, group_by: str, keep: int) -> Dict[str, Any]:
+        """Move all but the newest ``keep`` rows of each ``group_by`` value to the archive"""
+        table = model.__table__
+        column = table.c[group_by]
+        with engine.connect() as conn:
+            groups = conn.execute(select(column).distinct()).scalars().all()
+            # Newest row that falls outside the window, in the same order the learning system replays
+            boundaries = {
+                group: conn.execute(
+                    select(table.c.timestamp, table.c.id)
+                    .where(column == group)
+                    .order_by(table.c.timestamp.desc(), table.c.id.desc())
+                    .offset(keep)
+                    .limit(1)
+                ).first()
+                for group in groups
+            }
+
+        archived = 0
+        partitions = set()
+        for group, boundary in boundaries.items():
+            if boundary is None:
+                continue
+            ts, row_id = boundary
+            count, written = self._archive_where(table, and_(
+                column == group,
+                or_(table.c.timestamp < ts, and_(table.c.timestamp == ts, table.c.id <= row_id))
+            ))
+            archived += count
+            partitions.update(written)
+        return {"archived": archived, "kept_per_group": keep, "partitions": sorted(partitions)}
+
+    def _archive_where(self, table, condition):
+        """Archive and delete rows matching ``condition``, one bounded batch per transaction"""
+        archived = 0
+        partitions = set()
+        while True:
+            with SessionLocal() as db:
+                rows = db.execute(
+                    table.select()
+                    .where(condition)
+                    .order_by(table.c.id)
+                    .limit(self.batch_size)
+                ).mappings().all()
+                if not rows:
+                    break
+                # Write before deleting: a crash in between re-archives the batch, never loses it
+                partitions.update(self._write_archive(table.name, rows))
+                db.execute(table.delete().where(table.c.id.in_([row["id"] for row in rows])))
+                db.commit()
+            archived += len(rows)
+            if len(rows) < self.batch_size:
+                break
+        return archived, partitions
+
+    def _write_archive(self, table_name: str, rows) -> List[str]:
+        by_day: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            ts = row["timestamp"]
+            by_day[ts.strftime("%Y-%m-%d") if ts else "undated"].append(dict(row))
+
+        written = []
+        for day, day_rows in by_day.items():
+            path = self.archive_dir / table_name / f"{day}.jsonl.gz"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Appending adds a new gzip member; concatenated members read back as one stream
+            with gzip.open(path, "at", encoding="utf-8") as f:
+                for row in day_rows:
+                    f.write(json.dumps(row, default=str) + "\n")
+            written.append(str(path))
+        return written
+
+    def compact(self) -> Dict[str, Any]:
+        """Return freed pages to the OS (SQLite only); PostgreSQL relies on autovacuum"""
+        if engine.dialect.name != "sqlite":
+            return {"skipped": engine.dialect.name}
+
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if conn.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+                # Converting needs a full VACUUM, which is never run on the live database from here
+                return {"skipped": "auto_vacuum is not incremental (run --enable-incremental-vacuum)"}
+            freelist_before = conn.execute(text("PRAGMA freelist_count")).scalar()
+            conn.execute(text("PRAGMA incremental_vacuum"))
+            conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+            freelist_after = conn.execute(text("PRAGMA freelist_count")).scalar()
+        return {"pages_freed": (freelist_before or 0) - (freelist_after or 0)}
+
+    def enable_incremental_vacuum(self) -> bool:
+        """One-time switch to incremental auto_vacuum; rewrites the whole file, so run it offline"""
+        if engine.dialect.name != "sqlite":
+            return False
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2:
+                return False
+            logger.info("🧹 Enabling incremental auto_vacuum (full VACUUM)")
+            conn.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+            conn.execute(text("VACUUM"))
+        return True
+
+    async def run_periodic(self, interval: Optional[int] = None):
+        """Background loop; the work runs in a thread so the event loop is never blocked"""
+        interval = interval or settings.RETENTION_INTERVAL
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"❌ Retention cycle failed: {e}")
+            await asyncio.sleep(interval)
+
+
+# Global retention manager instance
+retention_manager = RetentionManager()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive, purge and compact the Sentinel mission database")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="Convert the SQLite file to incremental auto_vacuum (full VACUUM; stop the service first)")
+    args = parser.parse_args()
+
+    if args.enable_incremental_vacuum:
+        converted = retention_manager.enable_incremental_vacuum()
+        print("Incremental auto_vacuum enabled" if converted else "Nothing to convert")
+        return
+    print(json.dumps(retention_manager.run_once(), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
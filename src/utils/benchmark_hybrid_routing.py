@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark for batch hybrid routing
+Compares per-prompt cost of make_hybrid_decision vs make_hybrid_decisions
+
+Run from the repository root: python -m src.utils.benchmark_hybrid_routing
+"""
+
+import random
+import time
+
+from loguru import logger
+
+from src.core.hybrid_decision_engine import HybridDecisionEngine
+
+BATCH_SIZES = (1, 100, 10_000)
+
+TEMPLATES = [
+    "write a python function to {verb} a list of {noun}",
+    "design a distributed {noun} architecture with an api gateway and database sharding",
+    "print hello world",
+    "build an app that lets users {verb} their {noun} and share them with a team, "
+    "including authentication, notifications, search and an admin dashboard",
+    "quick check: {verb} the {noun} and show the result",
+    "implement a machine learning pipeline to {verb} {noun} with neural network optimization",
+]
+VERBS = ["sort", "filter", "convert", "analyze", "format", "track", "deploy", "refactor"]
+NOUNS = ["invoices", "photos", "tasks", "sensors", "orders", "messages", "logs", "users"]
+
+
+def make_prompts(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(verb=rng.choice(VERBS), noun=rng.choice(NOUNS)) + f" #{seed}-{i}"
+        for i in range(count)
+    ]
+
+
+def run_benchmark():
+    logger.remove()  # per-decision log lines would dominate the sequential timings
+    engine = HybridDecisionEngine()
+    engine.cache.max_size = 20_000
+
+    print("🚀 Hybrid routing benchmark (unique prompts, cold cache)")
+    print(f"{'batch':>8} {'sequential us/prompt':>22} {'batched us/prompt':>19} {'speedup':>8}")
+    for seed, size in enumerate(BATCH_SIZES):
+        prompts = make_prompts(size, seed)
+
+        engine.cache.clear()
+        start = time.perf_counter()
+        sequential = [engine.make_hybrid_decision(p) for p in prompts]
+        sequential_us = (time.perf_counter() - start) / size * 1e6
+
+        engine.cache.clear()
+        start = time.perf_counter()
+        batched = engine.make_hybrid_decisions(prompts)
+        batched_us = (time.perf_counter() - start) / size * 1e6
+
+        mismatches = sum(1 for a, b in zip(sequential, batched)
+                         if (a["path"], a["reason"]) != (b["path"], b["reason"]))
+        print(f"{size:>8} {sequential_us:>22.1f} {batched_us:>19.1f} {sequential_us / batched_us:>7.1f}x"
+              + (f"  ⚠️ {mismatches} mismatched decisions" if mismatches else ""))
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,127 @@
+"""
+Blocking Executor - Sized thread pool for synchronous agent and LLM calls
+Keeps crew.kickoff(), llm.invoke() and similar calls off the event loop, with per-call
+timeouts and cooperative cancellation
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+try:
+    from ..config.settings import settings
+except ImportError:
+    from config.settings import settings
+
+
+# Cancellation flag of the call running on the current pool thread
+_cancel_event: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "blocking_call_cancel_event", default=None
+)
+
+
+class BlockingCallCancelled(Exception):
+    """Raised by ``raise_if_cancelled`` once the awaiting coroutine has given up on the call"""
+
+
+def cancellation_requested() -> bool:
+    event = _cancel_event.get()
+    return event is not None and event.is_set()
+
+
+def raise_if_cancelled(*_):
+    """Checkpoint for long blocking work (usable directly as a step/task callback)"""
+    if cancellation_requested():
+        raise BlockingCallCancelled("Blocking call was cancelled or timed out")
+
+
+class BlockingExecutor:
+    """Runs blocking callables on a bounded pool of threads.
+
+    Threads cannot be interrupted, so a timeout or cancellation returns control to the
+    awaiting coroutine immediately and flags the call; code that calls
+    ``raise_if_cancelled`` between steps then stops early and frees its thread.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, default_timeout: Optional[float] = None):
+        self.max_workers = max_workers or settings.BLOCKING_EXECUTOR_WORKERS
+        self.default_timeout = default_timeout or settings.LLM_CALL_TIMEOUT
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sentinel-blocking")
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "started": 0, "completed": 0, "failed": 0, "timed_out": 0, "cancelled": 0}
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    def _call(self, cancel_event: threading.Event, submitted_at: float, func: Callable, args, kwargs):
+        started_at = time.perf_counter()
+        with self._lock:
+            self.stats["started"] += 1
+            self._total_wait += started_at - submitted_at
+        if cancel_event.is_set():
+            raise BlockingCallCancelled("Blocking call was cancelled before it started")
+        token = _cancel_event.set(cancel_event)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _cancel_event.reset(token)
+            with self._lock:
+                self._total_run += time.perf_counter() - started_at
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None, name: Optional[str] = None,
+                  **kwargs) -> Any:
+        """Await ``func(*args, **kwargs)`` on the pool; raises asyncio.TimeoutError after ``timeout`` seconds"""
+        loop = asyncio.get_running_loop()
+        cancel_event = threading.Event()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._call, cancel_event, time.perf_counter(), func, args, kwargs)
+        timeout = self.default_timeout if timeout is None else timeout
+        name = name or getattr(func, "__qualname__", repr(func))
+
+        with self._lock:
+            self.stats["submitted"] += 1
+        future = loop.run_in_executor(self._pool, call)
+        try:
+            result = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            cancel_event.set()
+            self._count("timed_out")
+            logger.warning(f"⏱️ Blocking call {name} exceeded {timeout:g}s; abandoning it")
+            raise asyncio.TimeoutError(f"{name} exceeded {timeout:g}s")
+        except asyncio.CancelledError:
+            cancel_event.set()
+            self._count("cancelled")
+            raise
+        except Exception:
+            self._count("failed")
+            raise
+        self._count("completed")
+        return result
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            started = max(stats["started"], 1)
+            stats.update(
+                max_workers=self.max_workers,
+                queued=stats["submitted"] - stats["started"],
+                avg_wait_ms=self._total_wait / started * 1000,
+                avg_run_ms=self._total_run / started * 1000,
+            )
+        return stats
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global blocking executor instance
+blocking_executor = BlockingExecutor()
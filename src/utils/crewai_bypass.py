@@ -6,10 +6,18 @@ Eliminates LiteLLM dependency and uses Google AI wrapper directly
 
 import os
 import json
+import asyncio
 from typing import Any, Dict, List, Optional
 from loguru import logger
 from pathlib import Path
 
+try:
+    from ..config.settings import settings
+    from .blocking_executor import blocking_executor, raise_if_cancelled, BlockingCallCancelled
+except ImportError:
+    from config.settings import settings
+    from utils.blocking_executor import blocking_executor, raise_if_cancelled, BlockingCallCancelled
+
 
 class DirectAIAgent:
     """Direct AI agent that bypasses CrewAI/LiteLLM entirely"""
@@ -31,11 +39,9 @@ class DirectAIAgent:
             return getattr(self, key)
         return default
         
-    def execute_task(self, task_description: str, expected_output: str = "") -> str:
-        """Execute a task directly using our Google AI wrapper"""
-        try:
-            # Create a comprehensive prompt
-            prompt = f"""You are {self.role}.
+    def _build_messages(self, task_description: str, expected_output: str = "") -> list:
+        """Role/goal/backstory prompt in LangChain message format"""
+        prompt = f"""You are {self.role}.
 
 GOAL: {self.goal}
 
@@ -46,15 +52,36 @@ TASK: {task_description}
 {expected_output if expected_output else "Provide a clear, actionable response."}
 
 RESPONSE:"""
-            
-            # Convert to LangChain message format
-            from langchain_core.messages import HumanMessage
-            messages = [HumanMessage(content=prompt)]
-            
-            # Use our Google AI wrapper directly with proper message format
-            response = self.llm.invoke(messages)
+        from langchain_core.messages import HumanMessage
+        return [HumanMessage(content=prompt)]
+
+    def execute_task(self, task_description: str, expected_output: str = "") -> str:
+        """Execute a task directly using our Google AI wrapper (blocking; use aexecute_task from async code)"""
+        try:
+            raise_if_cancelled()
+            response = self.llm.invoke(self._build_messages(task_description, expected_output))
             return response.content if hasattr(response, 'content') else str(response)
-            
+        except BlockingCallCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Direct AI execution failed: {e}")
+            return f"Fallback response: {task_description[:100]}..."
+
+    async def aexecute_task(self, task_description: str, expected_output: str = "",
+                            timeout: Optional[float] = None) -> str:
+        """Non-blocking execute_task: native ainvoke when the LLM has one, else the bounded executor"""
+        timeout = timeout or settings.LLM_CALL_TIMEOUT
+        try:
+            messages = self._build_messages(task_description, expected_output)
+            if hasattr(self.llm, "ainvoke"):
+                response = await asyncio.wait_for(self.llm.ainvoke(messages), timeout=timeout)
+            else:
+                response = await blocking_executor.run(self.llm.invoke, messages, timeout=timeout,
+                                                       name=f"{self.role}.invoke")
+            return response.content if hasattr(response, 'content') else str(response)
+        except asyncio.TimeoutError:
+            logger.error(f"Direct AI execution timed out after {timeout}s")
+            return f"Fallback response: {task_description[:100]}..."
         except Exception as e:
             logger.error(f"Direct AI execution failed: {e}")
             return f"Fallback response: {task_description[:100]}..."
@@ -98,6 +125,20 @@ class DirectAICrew:
             
         return results[-1] if results else "No tasks executed"
 
+    async def aexecute(self) -> str:
+        """Execute all tasks sequentially without blocking the event loop"""
+        results = []
+        
+        for i, task in enumerate(self.tasks):
+            logger.info(f"Executing task {i+1}/{len(self.tasks)}")
+            result = await task["agent"].aexecute_task(
+                task["description"],
+                task["expected_output"]
+            )
+            results.append(result)
+            
+        return results[-1] if results else "No tasks executed"
+
 
 def create_direct_ai_crew(llm) -> DirectAICrew:
     """Create a direct AI crew that bypasses CrewAI/LiteLLM"""
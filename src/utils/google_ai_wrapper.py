@@ -16,7 +16,6 @@ from langchain_core.callbacks.manager import AsyncCallbackManagerForLLMRun, Call
 from google.generativeai.generative_models import GenerativeModel
 from loguru import logger
 from dotenv import load_dotenv
-import asyncio
 
 # Load .env
 env_path = os.path.join(os.path.dirname(__file__), '..', '..', '.env')
@@ -32,6 +31,13 @@ if not GOOGLE_API_KEY:
 else:
     logger.success("Google Generative AI API key loaded successfully.")
 
+SAFETY_SETTINGS = {
+    'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
+    'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
+    'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
+    'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
+}
+
 class GoogleGenerativeAIWrapper(BaseChatModel):
     @property
     def _llm_type(self) -> str:
@@ -74,8 +80,15 @@ class GoogleGenerativeAIWrapper(BaseChatModel):
         run_manager: Optional[CallbackManagerForLLMRun] = None,
         **kwargs: Any
     ) -> ChatResult:
-        # Only pass run_manager if it's of correct type
-        return asyncio.run(self._agenerate(messages, stop=stop, run_manager=None, **kwargs))
+        # Native sync call: asyncio.run() here raised inside a running loop (and blocked it otherwise)
+        try:
+            prompt = self._convert_messages_to_prompt(messages)
+            response = self.model.generate_content(prompt, safety_settings=SAFETY_SETTINGS)
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response.text))])
+        except Exception as e:
+            logger.error(f"Error during Google AI generation: {e}")
+            fallback_message = AIMessage(content=f"An error occurred: {e}")
+            return ChatResult(generations=[ChatGeneration(message=fallback_message)])
 
     async def _agenerate(
         self,
@@ -86,15 +99,9 @@ class GoogleGenerativeAIWrapper(BaseChatModel):
     ) -> ChatResult:
         try:
             prompt = self._convert_messages_to_prompt(messages)
-            safety_settings = {
-                'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
-                'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
-                'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
-                'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
-            }
             response = await self.model.generate_content_async(
                 prompt,
-                safety_settings=safety_settings
+                safety_settings=SAFETY_SETTINGS
             )
             content = response.text
             ai_message = AIMessage(content=content)
@@ -114,16 +121,10 @@ class GoogleGenerativeAIWrapper(BaseChatModel):
     ) -> Iterator[ChatGenerationChunk]:
         try:
             prompt = self._convert_messages_to_prompt(messages)
-            safety_settings = {
-                'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
-                'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
-                'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
-                'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
-            }
             stream = self.model.generate_content(
                 prompt,
                 stream=True,
-                safety_settings=safety_settings
+                safety_settings=SAFETY_SETTINGS
             )
             for chunk in stream:
                 if chunk.text:
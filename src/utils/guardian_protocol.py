@@ -7,6 +7,11 @@ from loguru import logger
 from typing import Dict, Any, List
 import re
 
+try:
+    from .keyword_matcher import keyword_matcher
+except ImportError:
+    from utils.keyword_matcher import keyword_matcher
+
 class GuardianProtocol:
     """Guardian Protocol for predictive intelligence and risk assessment"""
     
@@ -14,6 +19,7 @@ class GuardianProtocol:
         self.llm = llm
         self.risk_patterns = self._initialize_risk_patterns()
         self.clarity_indicators = self._initialize_clarity_indicators()
+        keyword_matcher.register_all({**self.risk_patterns, **self.clarity_indicators})
         
     def _initialize_risk_patterns(self) -> Dict[str, List[str]]:
         """Initialize risk assessment patterns"""
@@ -70,13 +76,15 @@ class GuardianProtocol:
         }
 
         prompt_lower = prompt.lower()
+        # Single pass over the prompt for every risk and clarity pattern
+        keyword_hits = keyword_matcher.scan(prompt_lower)
         
         # Calculate Clarity Score
-        clarity_score = self._calculate_clarity_score(prompt_lower)
+        clarity_score = self._calculate_clarity_score(prompt_lower, keyword_hits)
         analysis["clarity_score"] = clarity_score
         
         # Calculate Risk Score
-        risk_score = self._calculate_risk_score(prompt_lower)
+        risk_score = self._calculate_risk_score(prompt_lower, keyword_hits)
         analysis["risk_score"] = risk_score
         
         # Determine clarity level
@@ -103,19 +111,18 @@ class GuardianProtocol:
         logger.info(f"🛡️ Guardian Protocol: Pre-flight check complete. Go/No-Go: {analysis['go_no_go']}. Feedback: {analysis['feedback']}")
         return analysis
 
-    def _calculate_clarity_score(self, prompt_lower: str) -> float:
+    def _calculate_clarity_score(self, prompt_lower: str, keyword_hits: Dict[str, set] = None) -> float:
         """Calculate clarity score based on specificity indicators"""
         score = 0.5  # Base score
+        if keyword_hits is None:
+            keyword_hits = keyword_matcher.scan(prompt_lower)
         
         # Positive indicators
-        specific_count = sum(1 for phrase in self.clarity_indicators["specific_actions"] 
-                           if phrase in prompt_lower)
-        technical_count = sum(1 for phrase in self.clarity_indicators["technical_specificity"] 
-                            if phrase in prompt_lower)
+        specific_count = len(keyword_hits["specific_actions"])
+        technical_count = len(keyword_hits["technical_specificity"])
         
         # Negative indicators
-        vague_count = sum(1 for phrase in self.clarity_indicators["vague_phrases"] 
-                         if phrase in prompt_lower)
+        vague_count = len(keyword_hits["vague_phrases"])
         
         # Calculate score
         score += (specific_count * 0.1) + (technical_count * 0.05) - (vague_count * 0.15)
@@ -126,17 +133,16 @@ class GuardianProtocol:
         
         return min(1.0, max(0.0, score))
 
-    def _calculate_risk_score(self, prompt_lower: str) -> float:
+    def _calculate_risk_score(self, prompt_lower: str, keyword_hits: Dict[str, set] = None) -> float:
         """Calculate risk score based on risk patterns"""
         score = 0.0
+        if keyword_hits is None:
+            keyword_hits = keyword_matcher.scan(prompt_lower)
         
         # Check for high-risk patterns
-        high_risk_count = sum(1 for pattern in self.risk_patterns["high_risk"] 
-                             if pattern in prompt_lower)
-        medium_risk_count = sum(1 for pattern in self.risk_patterns["medium_risk"] 
-                              if pattern in prompt_lower)
-        low_risk_count = sum(1 for pattern in self.risk_patterns["low_risk"] 
-                           if pattern in prompt_lower)
+        high_risk_count = len(keyword_hits["high_risk"])
+        medium_risk_count = len(keyword_hits["medium_risk"])
+        low_risk_count = len(keyword_hits["low_risk"])
         
         # Calculate weighted risk score
         score += (high_risk_count * 0.8) + (medium_risk_count * 0.4) - (low_risk_count * 0.1)
@@ -0,0 +1,110 @@
+"""
+Keyword Matcher - Shared multi-pattern matching for prompt analysis
+Aho-Corasick automaton: every registered keyword list is matched in one pass over the prompt
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Compiled Aho-Corasick automaton over categorised keywords.
+
+    Matching is substring-based and case-insensitive, the same semantics as
+    ``keyword in prompt.lower()``, but the cost is linear in the prompt length
+    regardless of how many keywords are registered.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        self.categories = {name: tuple(dict.fromkeys(k.lower() for k in keywords if k))
+                           for name, keywords in categories.items()}
+        self._delta, self._outputs = self._compile(self.categories)
+
+    @staticmethod
+    def _compile(categories: Dict[str, Tuple[str, ...]]):
+        # Trie
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[str, str]]] = [[]]
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                node = 0
+                for ch in keyword:
+                    nxt = goto[node].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[node][ch] = nxt
+                        goto.append({})
+                        outputs.append([])
+                    node = nxt
+                outputs[node].append((category, keyword))
+
+        # Failure links in BFS order, folded into a full transition table (DFA) so
+        # scanning needs one dict lookup per character and never follows fail links
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            delta[node] = {**delta[fail[node]], **goto[node]}
+            outputs[node] = outputs[node] + outputs[fail[node]]
+            for ch, child in goto[node].items():
+                fail[child] = delta[fail[node]].get(ch, 0) if node else 0
+                queue.append(child)
+        return delta, [tuple(o) for o in outputs]
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        """Distinct keywords found in ``text``, grouped by category (missing categories read as empty)"""
+        hits: Dict[str, Set[str]] = defaultdict(set)
+        delta, outputs = self._delta, self._outputs
+        node = 0
+        for ch in text.lower():
+            node = delta[node].get(ch, 0)
+            if outputs[node]:
+                for category, keyword in outputs[node]:
+                    hits[category].add(keyword)
+        return hits
+
+    def counts(self, text: str) -> Dict[str, int]:
+        return {name: len(found) for name, found in self.scan(text).items()}
+
+
+class SharedKeywordMatcher:
+    """Process-wide matcher that components register their keyword lists with.
+
+    Registering an unchanged list is a no-op; a change recompiles once, lazily,
+    on the next scan.
+    """
+
+    def __init__(self):
+        self._categories: Dict[str, Tuple[str, ...]] = {}
+        self._matcher: KeywordMatcher = KeywordMatcher({})
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def register(self, category: str, keywords: Iterable[str]):
+        keywords = tuple(keywords)
+        with self._lock:
+            if self._categories.get(category) != keywords:
+                self._categories[category] = keywords
+                self._dirty = True
+
+    def register_all(self, categories: Dict[str, Iterable[str]]):
+        for category, keywords in categories.items():
+            self.register(category, keywords)
+
+    @property
+    def matcher(self) -> KeywordMatcher:
+        if self._dirty:
+            with self._lock:
+                if self._dirty:
+                    self._matcher = KeywordMatcher(self._categories)
+                    self._dirty = False
+        return self._matcher
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        return self.matcher.scan(text)
+
+
+# Global shared matcher instance
+keyword_matcher = SharedKeywordMatcher()
@@ -0,0 +1,143 @@
+"""
+Log Stream - Fixed-capacity log ring buffer with per-subscriber cursors
+Every entry gets a monotonic sequence number; SSE/WebSocket consumers resume from
+Last-Event-ID and read straight from the ring, so a slow consumer costs no extra memory
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+LEVEL_ORDER = {"TRACE": 5, "DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+
+class LogFilter:
+    """Server-side subscription filter: minimum level and/or a set of sources"""
+
+    def __init__(self, min_level: Optional[str] = None, sources: Optional[Iterable[str]] = None):
+        self.min_level = LEVEL_ORDER.get((min_level or "").upper(), 0)
+        self.sources = frozenset(sources) if sources else None
+
+    def __call__(self, entry: Dict[str, Any]) -> bool:
+        if self.min_level and LEVEL_ORDER.get(str(entry.get("level", "")).upper(), 0) < self.min_level:
+            return False
+        if self.sources is not None and entry.get("source") not in self.sources:
+            return False
+        return True
+
+    @classmethod
+    def from_params(cls, level: Optional[str] = None, source: Optional[str] = None) -> Optional["LogFilter"]:
+        """Build from query parameters (``source`` is comma-separated); None when nothing is filtered"""
+        sources = [s.strip() for s in source.split(",") if s.strip()] if source else None
+        if not level and not sources:
+            return None
+        return cls(level, sources)
+
+
+class LogRingBuffer:
+    """Preallocated ring of the last ``capacity`` log entries.
+
+    ``append`` is O(1) and stamps the entry with ``id`` (its sequence number, starting
+    at 1). ``clear`` empties the ring but never resets the sequence, so cursors held by
+    subscribers stay valid.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._slots: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._next_seq = 1
+        self._first_seq = 1  # oldest sequence still held
+        self._changed = asyncio.Event()
+        self.subscribers = 0
+
+    def __len__(self) -> int:
+        return self._next_seq - self._first_seq
+
+    @property
+    def last_seq(self) -> int:
+        return self._next_seq - 1
+
+    def append(self, entry: Dict[str, Any]) -> int:
+        seq = self._next_seq
+        entry["id"] = seq
+        self._slots[seq % self.capacity] = entry
+        self._next_seq = seq + 1
+        if seq - self._first_seq >= self.capacity:
+            self._first_seq = seq - self.capacity + 1
+        # Wake every waiting subscriber once, then arm a fresh event for the next append
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+        return seq
+
+    def clear(self):
+        self._slots = [None] * self.capacity
+        self._first_seq = self._next_seq
+
+    def since(self, after_seq: int, limit: Optional[int] = None,
+              entry_filter: Optional[LogFilter] = None) -> Tuple[List[Dict[str, Any]], int, int]:
+        """Entries with seq > ``after_seq``; returns (entries, new cursor, entries missed because they were overwritten)"""
+        start = max(after_seq + 1, self._first_seq)
+        missed = start - (after_seq + 1)
+        entries = []
+        cursor = start - 1
+        for seq in range(start, self._next_seq):
+            cursor = seq
+            entry = self._slots[seq % self.capacity]
+            if entry_filter is None or entry_filter(entry):
+                entries.append(entry)
+                if limit is not None and len(entries) >= limit:
+                    break
+        return entries, cursor, missed
+
+    def latest(self, count: int, entry_filter: Optional[LogFilter] = None) -> List[Dict[str, Any]]:
+        """The newest ``count`` entries (after filtering), oldest first"""
+        result = []
+        for seq in range(self._next_seq - 1, self._first_seq - 1, -1):
+            if len(result) >= count:
+                break
+            entry = self._slots[seq % self.capacity]
+            if entry_filter is None or entry_filter(entry):
+                result.append(entry)
+        result.reverse()
+        return result
+
+    async def wait(self, after_seq: int, timeout: Optional[float] = None) -> bool:
+        """Wait until an entry newer than ``after_seq`` exists; False on timeout"""
+        if self.last_seq > after_seq:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def subscribe(self, last_event_id: Optional[int] = None, entry_filter: Optional[LogFilter] = None,
+                        batch_size: int = 100, heartbeat: Optional[float] = None,
+                        replay: int = 50) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield ("logs", [entries]), ("gap", missed) and, every ``heartbeat`` idle seconds, ("heartbeat", None).
+
+        Without ``last_event_id`` the subscriber starts with the newest ``replay`` entries.
+        Batches coalesce everything that arrived since the last read, so a consumer that
+        falls more than ``capacity`` entries behind skips ahead with a single "gap" event.
+        """
+        if last_event_id is None:
+            backlog = self.latest(replay, entry_filter)
+            cursor = backlog[0]["id"] - 1 if backlog else self.last_seq
+        elif last_event_id > self.last_seq:
+            # Cursor from before a restart: sequence numbers started over, resend what is held
+            cursor = self._first_seq - 1
+        else:
+            cursor = last_event_id
+        self.subscribers += 1
+        try:
+            while True:
+                entries, cursor, missed = self.since(cursor, batch_size, entry_filter)
+                if missed:
+                    yield "gap", missed
+                if entries:
+                    yield "logs", entries
+                if cursor < self.last_seq:
+                    continue  # more than one batch pending
+                if not await self.wait(cursor, heartbeat):
+                    yield "heartbeat", None
+        finally:
+            self.subscribers -= 1
@@ -100,7 +100,7 @@ Provide your response in this formal JSON format:
                 )
             )
             crew.add_task(task_description, agent, expected_output)
-            solution_str = crew.execute()
+            solution_str = await crew.aexecute()
             
             try:
                 # Use our robust JSON parser to handle markdown code blocks
@@ -0,0 +1,127 @@
+"""
+Request Logging Middleware - Pure ASGI access logging for the FastAPI services
+Bodies stream through untouched; only a bounded prefix of the request body is kept for the log line
+"""
+
+import time
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+MAX_LOG_BODY = 2048
+STREAMING_CONTENT_TYPES = (b"text/event-stream", b"application/x-ndjson")
+
+
+def _status_phrase(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
+
+
+def _format_body(prefix: bytearray, total: int) -> Optional[str]:
+    if not total:
+        return None
+    body = bytes(prefix).decode(errors="replace")
+    if total > len(prefix):
+        return body + "... [truncated]"
+    return body
+
+
+class RequestLoggingMiddleware:
+    """Logs each HTTP request/response pair without buffering either body.
+
+    ``emit`` receives the structured entries for the live log stream and must not
+    block (e.g. a ``put_nowait`` into a bounded queue).
+    """
+
+    def __init__(self, app, emit: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 server_port: str = "8002", log_prefix: str = "ENGINE", max_body: int = MAX_LOG_BODY):
+        self.app = app
+        self.emit = emit
+        self.server_port = server_port
+        self.log_prefix = log_prefix
+        self.max_body = max_body
+
+    def _entry(self, message: str) -> Dict[str, Any]:
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "level": "INFO",
+            "message": message,
+            "source": "http_request",
+            "server_port": self.server_port,
+        }
+
+    def _push(self, message: str):
+        if self.emit is None:
+            return
+        try:
+            self.emit(self._entry(message))
+        except Exception as e:
+            logger.debug(f"Request log entry dropped: {e}")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        client = scope.get("client") or ("unknown", "unknown")
+        path = scope.get("path", "")
+        query = scope.get("query_string", b"")
+        target = path + ("?" + query.decode(errors="replace") if query else "")
+        request_line = f'{client[0]}:{client[1]} - "{scope["method"]} {path} HTTP/{scope.get("http_version", "1.1")}"'
+        self._push(f"INFO: {request_line}")
+
+        body_prefix = bytearray()
+        body_size = 0
+        status = 500
+        streaming = False
+        logged = False
+
+        async def receive_wrapper():
+            nonlocal body_size
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                body_size += len(chunk)
+                room = self.max_body - len(body_prefix)
+                if room > 0 and chunk:
+                    body_prefix.extend(chunk[:room])
+            return message
+
+        def log_response(suffix: str = ""):
+            nonlocal logged
+            if logged:
+                return
+            logged = True
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.info(
+                f"{self.log_prefix}: {scope['method']} {target} | Body: {_format_body(body_prefix, body_size)} "
+                f"-> {status} in {elapsed_ms:.1f}ms{suffix}"
+            )
+            self._push(f"INFO: {request_line} {status} {_status_phrase(status)}{suffix}")
+
+        async def send_wrapper(message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type" and value.split(b";")[0].strip() in STREAMING_CONTENT_TYPES:
+                        streaming = True
+                if streaming:
+                    # Event streams may stay open indefinitely; log when the stream starts
+                    log_response(" (streaming)")
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                log_response()
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception as e:
+            logger.error(f"{self.log_prefix}: Exception during request: {scope['method']} {target} - {e}", exc_info=True)
+            raise
+        finally:
+            log_response()
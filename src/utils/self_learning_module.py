@@ -140,7 +140,7 @@ Provide your response in this JSON format:
                 )
             )
             crew.add_task(task_description, agent, expected_output)
-            analysis_result_str = crew.execute()
+            analysis_result_str = await crew.aexecute()
             
             try:
                 analysis_result = json.loads(analysis_result_str)
@@ -227,7 +227,7 @@ Provide your response as a JSON array of improvements:
                 )
             )
             crew.add_task(task_description, agent, expected_output)
-            improvements_str = crew.execute()
+            improvements_str = await crew.aexecute()
             
             try:
                 improvements = json.loads(improvements_str)
@@ -412,31 +412,35 @@ Provide your response as a JSON array of improvements:
         logger.info("Analyzing performance of all completed missions...")
         
         try:
-            completed_missions = self.db_manager.list_missions(status='completed')
-            failed_missions = self.db_manager.list_missions(status='failed')
-
-            if not completed_missions and not failed_missions:
+            # Stream only the columns we need so the full history never sits in memory
+            total_completed = 0
+            total_time = 0.0
+            for mission in self.db_manager.iter_missions(columns=("execution_time",), status='completed'):
+                total_completed += 1
+                total_time += mission["execution_time"] or 0.0
+            total_failed = sum(1 for _ in self.db_manager.iter_missions(columns=("id",), status='failed'))
+
+            if not total_completed and not total_failed:
                 return {"patterns": [], "summary": "No completed or failed missions to analyze."}
 
             # Simple analysis for demonstration purposes
-            success_rate = len(completed_missions) / (len(completed_missions) + len(failed_missions))
+            success_rate = total_completed / (total_completed + total_failed)
             
             avg_execution_time = 0
-            if completed_missions:
-                total_time = sum(m.execution_time for m in completed_missions if m.execution_time)
-                avg_execution_time = total_time / len(completed_missions)
+            if total_completed:
+                avg_execution_time = total_time / total_completed
 
             insights = {
                 "patterns": [],
                 "summary": {
-                    "total_completed": len(completed_missions),
-                    "total_failed": len(failed_missions),
+                    "total_completed": total_completed,
+                    "total_failed": total_failed,
                     "success_rate": f"{success_rate:.2%}",
                     "avg_execution_time_sec": f"{avg_execution_time:.2f}"
                 }
             }
 
-            if success_rate < 0.8 and (len(completed_missions) + len(failed_missions)) > 10:
+            if success_rate < 0.8 and (total_completed + total_failed) > 10:
                 insights["patterns"].append({
                     "type": "low_success_rate",
                     "description": f"Overall mission success rate is low ({success_rate:.2%}). Suggests a review of agent error handling or prompt clarity.",
@@ -0,0 +1,57 @@
+"""
+Timer Wheel - Hashed timing wheel for large numbers of per-connection deadlines
+schedule/cancel are O(1) and each tick only touches the timers in one slot, so the
+cost of a check scales with the timers that expire rather than with all of them
+"""
+
+import math
+from typing import Any, Dict, Hashable, List
+
+
+class TimerWheel:
+    """``slots`` buckets of ``tick`` seconds each; delays longer than one revolution carry a round count.
+
+    The wheel holds at most one timer per key: scheduling a key again replaces its
+    previous deadline.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 64):
+        self.tick = tick
+        self._slots: List[Dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._where: Dict[Hashable, int] = {}
+        self._current = 0
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def schedule(self, key: Hashable, delay: float):
+        """Fire ``key`` after ``delay`` seconds (rounded up to whole ticks, at least one)"""
+        self.cancel(key)
+        ticks = max(1, math.ceil(delay / self.tick))
+        index = (self._current + ticks) % len(self._slots)
+        self._slots[index][key] = (ticks - 1) // len(self._slots)
+        self._where[key] = index
+
+    def cancel(self, key: Hashable) -> bool:
+        index = self._where.pop(key, None)
+        if index is None:
+            return False
+        self._slots[index].pop(key, None)
+        return True
+
+    def advance(self) -> List[Any]:
+        """Move one tick forward and return the keys whose timers expired"""
+        self._current = (self._current + 1) % len(self._slots)
+        bucket = self._slots[self._current]
+        expired = []
+        for key, rounds in list(bucket.items()):
+            if rounds:
+                bucket[key] = rounds - 1
+            else:
+                del bucket[key]
+                del self._where[key]
+                expired.append(key)
+        return expired
@@ -0,0 +1,16 @@
+"""
+Shared pytest setup: point the mission database at a throwaway SQLite file
+DATABASE_URL is read when src.models.advanced_database is imported, so it is set here first
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_DB_DIR = tempfile.mkdtemp(prefix="sentinel-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/sentinel_test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
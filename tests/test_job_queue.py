@@ -0,0 +1,134 @@
+"""
+Lease state machine of the durable mission job queue
+"""
+
+import threading
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import delete, update
+
+from src.models.advanced_database import SessionLocal, MissionJob, MissionResult
+from src.models.job_queue import JobQueue, ResultStore, _utcnow
+
+
+@pytest.fixture
+def queue():
+    with SessionLocal() as db:
+        db.execute(delete(MissionJob))
+        db.execute(delete(MissionResult))
+        db.commit()
+    return JobQueue(results=ResultStore(ttl=60), lease_seconds=30, max_pending=100)
+
+
+def _expire_leases():
+    with SessionLocal() as db:
+        db.execute(update(MissionJob).values(lease_expires_at=_utcnow() - timedelta(seconds=1)))
+        db.commit()
+
+
+def test_enqueue_is_idempotent_while_active(queue):
+    job, created = queue.enqueue("m1", "first prompt")
+    again, created_again = queue.enqueue("m1", "second prompt")
+    assert created and not created_again
+    assert again["id"] == job["id"]
+    assert again["prompt"] == "first prompt"
+
+    queue.claim("w1")
+    _, created_leased = queue.enqueue("m1", "third prompt")
+    assert not created_leased
+
+
+def test_enqueue_restarts_a_finished_mission(queue):
+    job, _ = queue.enqueue("m1", "prompt")
+    queue.complete(queue.claim("w1")[0]["id"], "w1", result={"ok": True})
+    again, created = queue.enqueue("m1", "prompt again")
+    assert created
+    assert again["id"] == job["id"]
+    assert again["status"] == "queued" and again["attempts"] == 0
+
+
+def test_claim_is_compare_and_set_between_workers(queue):
+    queue.enqueue("m1", "prompt")
+    first = queue.claim("w1")
+    assert [j["mission_id_str"] for j in first] == ["m1"]
+    assert first[0]["lease_owner"] == "w1" and first[0]["attempts"] == 1
+    assert queue.claim("w2") == []
+
+
+def test_concurrent_claims_never_share_a_job(queue):
+    for i in range(20):
+        queue.enqueue(f"m{i}", "prompt")
+    claimed = {}
+
+    def worker(name):
+        claimed[name] = [j["id"] for j in queue.claim(name, limit=20)]
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    ids = claimed["w0"] + claimed["w1"]
+    assert len(ids) == len(set(ids)) == 20
+
+
+def test_heartbeat_reports_ok_cancel_and_lost(queue):
+    queue.enqueue("m1", "prompt")
+    job_id = queue.claim("w1")[0]["id"]
+    assert queue.heartbeat(job_id, "w1") == "ok"
+    assert queue.heartbeat(job_id, "w2") == "lost"
+
+    assert queue.cancel("m1") == "leased"
+    assert queue.heartbeat(job_id, "w1") == "cancel"
+
+    assert queue.mark_cancelled(job_id, "w1")
+    assert queue.heartbeat(job_id, "w1") == "lost"
+
+
+def test_fail_with_retry_requeues_until_max_attempts(queue):
+    queue.enqueue("m1", "prompt", max_attempts=2)
+    job_id = queue.claim("w1")[0]["id"]
+    assert queue.fail(job_id, "w1", "boom", retry=True)
+    assert queue.get("m1")["status"] == "queued"
+
+    assert queue.claim("w1")[0]["attempts"] == 2
+    assert queue.fail(job_id, "w1", "boom again", retry=True)
+    job = queue.get("m1")
+    assert job["status"] == "failed" and job["error_message"] == "boom again"
+    assert queue.results.get("m1")["status"] == "failed"
+
+
+def test_outcome_from_a_stale_lease_is_dropped(queue):
+    queue.enqueue("m1", "prompt")
+    job_id = queue.claim("w1")[0]["id"]
+    assert not queue.complete(job_id, "w2")
+    assert not queue.fail(job_id, "w2", "not mine")
+    assert queue.get("m1")["status"] == "leased"
+
+
+def test_release_returns_the_job_without_charging_an_attempt(queue):
+    queue.enqueue("m1", "prompt")
+    job_id = queue.claim("w1")[0]["id"]
+    assert not queue.release(job_id, "w2")
+    assert queue.release(job_id, "w1")
+    job = queue.get("m1")
+    assert job["status"] == "queued" and job["attempts"] == 0 and job["lease_owner"] is None
+
+
+def test_requeue_expired_requeues_or_fails(queue):
+    queue.enqueue("retry", "prompt", max_attempts=2)
+    queue.enqueue("dead", "prompt", max_attempts=1)
+    queue.claim("w1", limit=2)
+    _expire_leases()
+
+    assert queue.requeue_expired() == {"requeued": 1, "failed": 1}
+    retry = queue.get("retry")
+    assert retry["status"] == "queued" and retry["lease_expires_at"] is None
+    dead = queue.get("dead")
+    assert dead["status"] == "failed"
+    assert dead["lease_owner"] is None and dead["lease_expires_at"] is None
+    assert queue.results.get("dead")["status"] == "failed"
+
+    assert queue.requeue_expired() == {"requeued": 0, "failed": 0}
@@ -0,0 +1,97 @@
+"""
+Sequence numbers, gaps and cursors of the LogRingBuffer
+"""
+
+import asyncio
+
+from src.utils.log_stream import LogFilter, LogRingBuffer
+
+
+def _fill(ring, count, level="INFO", source="engine"):
+    for i in range(count):
+        ring.append({"level": level, "source": source, "message": f"m{i}"})
+
+
+def test_append_assigns_sequence_numbers_and_wraps():
+    ring = LogRingBuffer(capacity=4)
+    _fill(ring, 6)
+    assert ring.last_seq == 6
+    assert len(ring) == 4
+    assert [e["id"] for e in ring.latest(10)] == [3, 4, 5, 6]
+
+
+def test_since_reports_entries_lost_to_overwrite():
+    ring = LogRingBuffer(capacity=4)
+    _fill(ring, 10)
+    entries, cursor, missed = ring.since(2)
+    assert [e["id"] for e in entries] == [7, 8, 9, 10]
+    assert cursor == 10 and missed == 4
+
+    entries, cursor, missed = ring.since(10)
+    assert entries == [] and cursor == 10 and missed == 0
+
+
+def test_since_respects_limit_and_resumes_from_cursor():
+    ring = LogRingBuffer(capacity=10)
+    _fill(ring, 5)
+    first, cursor, _ = ring.since(0, limit=2)
+    rest, cursor, _ = ring.since(cursor, limit=10)
+    assert [e["id"] for e in first] == [1, 2]
+    assert [e["id"] for e in rest] == [3, 4, 5]
+    assert cursor == 5
+
+
+def test_filtered_entries_still_advance_the_cursor():
+    ring = LogRingBuffer(capacity=10)
+    _fill(ring, 3, level="DEBUG")
+    _fill(ring, 1, level="ERROR", source="db")
+    _fill(ring, 2, level="DEBUG")
+    entries, cursor, _ = ring.since(0, entry_filter=LogFilter(min_level="WARNING"))
+    assert [e["id"] for e in entries] == [4]
+    assert cursor == 6
+    assert LogFilter.from_params() is None
+    assert [e["id"] for e in ring.latest(5, LogFilter.from_params(source="db, api"))] == [4]
+
+
+def test_clear_keeps_the_sequence():
+    ring = LogRingBuffer(capacity=4)
+    _fill(ring, 3)
+    ring.clear()
+    assert len(ring) == 0 and ring.last_seq == 3
+    assert ring.append({"level": "INFO"}) == 4
+    assert [e["id"] for e in ring.since(3)[0]] == [4]
+
+
+def test_subscriber_that_falls_behind_gets_one_gap_event():
+    async def scenario():
+        ring = LogRingBuffer(capacity=4)
+        _fill(ring, 2)
+        stream = ring.subscribe(last_event_id=0, batch_size=10, heartbeat=0.01)
+        assert await stream.__anext__() == ("logs", ring.latest(2))
+        _fill(ring, 7)
+        events = [await stream.__anext__(), await stream.__anext__()]
+        assert events[0] == ("gap", 3)
+        assert [e["id"] for e in events[1][1]] == [6, 7, 8, 9]
+        assert await stream.__anext__() == ("heartbeat", None)
+        assert ring.subscribers == 1
+        await stream.aclose()
+        assert ring.subscribers == 0
+
+    asyncio.run(scenario())
+
+
+def test_cursor_from_before_a_restart_replays_what_is_held():
+    async def scenario():
+        ring = LogRingBuffer(capacity=4)
+        _fill(ring, 3)
+        stream = ring.subscribe(last_event_id=500)
+        kind, entries = await stream.__anext__()
+        assert kind == "logs" and [e["id"] for e in entries] == [1, 2, 3]
+        await stream.aclose()
+
+        stream = ring.subscribe(replay=2)
+        kind, entries = await stream.__anext__()
+        assert [e["id"] for e in entries] == [2, 3]
+        await stream.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+"""
+Session-per-mission writes: buffered progress must reach the row when a status update follows
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from src.models.advanced_database import (
+    ASYNC_DB_AVAILABLE, AsyncDatabaseManager, ThreadedDatabaseManager, SessionLocal, Mission, db_manager,
+)
+
+
+def _managers():
+    managers = [pytest.param(lambda: ThreadedDatabaseManager(db_manager), id="threaded")]
+    if ASYNC_DB_AVAILABLE:
+        managers.append(pytest.param(AsyncDatabaseManager, id="async"))
+    return managers
+
+
+def _stored(mission_id):
+    with SessionLocal() as db:
+        mission = db.query(Mission).filter(Mission.mission_id_str == mission_id).one()
+        return mission.progress, mission.status
+
+
+@pytest.mark.parametrize("make_manager", _managers())
+def test_progress_then_failure_persists_both(make_manager):
+    mission_id = f"m-{uuid.uuid4().hex}"
+
+    async def scenario():
+        manager = make_manager()
+        await manager.create_mission(mission_id_str=mission_id, prompt="p", title="t", status="pending")
+        async with manager.mission_scope(mission_id) as mission:
+            await mission.update_progress(60)
+            await mission.update_status("failed", error_message="boom")
+
+    asyncio.run(scenario())
+    assert _stored(mission_id) == (60, "failed")
+
+
+@pytest.mark.parametrize("make_manager", _managers())
+def test_status_already_set_by_progress_is_persisted(make_manager):
+    mission_id = f"m-{uuid.uuid4().hex}"
+
+    async def scenario():
+        manager = make_manager()
+        await manager.create_mission(mission_id_str=mission_id, prompt="p", title="t", status="pending")
+        async with manager.mission_scope(mission_id) as mission:
+            await mission.update_progress(30, status="running")
+            await mission.update_status("running")
+
+    asyncio.run(scenario())
+    assert _stored(mission_id) == (30, "running")
@@ -0,0 +1,40 @@
+"""
+Long-run numerical stability of the RLS latency model
+"""
+
+import random
+import warnings
+
+import numpy as np
+
+from src.core.hybrid_decision_engine import PathPerformanceModel
+
+
+def test_intervals_stay_finite_after_a_long_run_on_a_small_vocabulary():
+    model = PathPerformanceModel(hash_dim=32, forgetting=0.999, learning_rate=0.01)
+    rng = random.Random(7)
+    prompts = ["fix the login bug", "write unit tests", "refactor the parser"]
+    rows = []
+    for prompt in prompts:
+        for complexity in (0.2, 0.8):
+            rows.append((model.features(prompt, complexity), 1.0 + 4.0 * complexity))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        for _ in range(30000):
+            x, seconds = rows[rng.randrange(len(rows))]
+            model.update(x, seconds * rng.uniform(0.8, 1.25), True)
+
+        assert np.abs(model.latency_cov).max() <= PathPerformanceModel.PRIOR_COV * (1 + 1e-9)
+        assert np.all(np.linalg.eigvalsh(model.latency_cov) > -1e-9)
+
+        X = np.vstack([x for x, _ in rows] + [model.features("an unseen prompt entirely", 0.5)])
+        prediction = model.predict(X)
+
+    for key in ("time", "time_low", "time_high"):
+        assert np.all(np.isfinite(prediction[key]))
+    seen = slice(0, len(rows))
+    # Seen prompts get tight intervals around the trained latency
+    assert np.all(prediction["time_high"][seen] / prediction["time_low"][seen] < 3.0)
+    expected = np.array([seconds for _, seconds in rows])
+    assert np.allclose(prediction["time"][seen], expected, rtol=0.15)
@@ -0,0 +1,113 @@
+"""
+TTL-LRU behaviour and byte accounting of the PredictiveCache
+"""
+
+import time
+
+import pytest
+
+from src.core import hybrid_decision_engine
+from src.core.hybrid_decision_engine import PredictiveCache, ThreadSafePredictiveCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(hybrid_decision_engine, "time", clock)
+    return clock
+
+
+def _entry(value, padding=0):
+    return {"value": value, "padding": "x" * padding}
+
+
+def test_evicts_least_recently_used_at_max_size(clock):
+    cache = PredictiveCache(max_size=2, ttl=60, max_bytes=1 << 20)
+    cache.set("a", "fast", _entry(1))
+    cache.set("b", "fast", _entry(2))
+    assert cache.get("a", "fast")["value"] == 1  # "b" is now least recently used
+    cache.set("c", "fast", _entry(3))
+
+    assert cache.get("b", "fast") is None
+    assert cache.get("a", "fast")["value"] == 1
+    assert cache.get("c", "fast")["value"] == 3
+    assert cache.get_stats()["evictions_by_path"] == {"fast": 1}
+
+
+def test_byte_budget_evicts_and_accounts_sizes(clock):
+    entry = _entry(0, padding=400)
+    size = PredictiveCache._sizeof(entry)
+    cache = PredictiveCache(max_size=100, ttl=60, max_bytes=size * 2 + size // 2)
+    for i in range(3):
+        cache.set(f"p{i}", "full", _entry(i, padding=400))
+
+    assert len(cache.cache) == 2
+    assert cache.get("p0", "full") is None
+    assert cache.current_bytes == sum(e[2] for e in cache.cache.values())
+
+    cache.set("p1", "full", _entry(1, padding=400))  # replacing a key does not double count
+    assert cache.current_bytes == sum(e[2] for e in cache.cache.values())
+    cache.clear()
+    assert cache.current_bytes == 0
+
+
+def test_oversized_entry_is_not_cached(clock):
+    cache = PredictiveCache(max_size=10, ttl=60, max_bytes=64)
+    cache.set("big", "full", _entry(0, padding=1000))
+    assert len(cache.cache) == 0 and cache.current_bytes == 0
+
+
+def test_ttl_is_measured_from_last_access(clock):
+    cache = PredictiveCache(max_size=10, ttl=10, max_bytes=1 << 20)
+    cache.set("a", "fast", _entry(1))
+    clock.now += 8
+    assert cache.get("a", "fast") is not None
+    clock.now += 8
+    assert cache.get("a", "fast") is not None
+    clock.now += 11
+    assert cache.get("a", "fast") is None
+    assert cache.current_bytes == 0
+    assert cache.get_stats()["expirations_by_path"] == {"fast": 1}
+
+
+def test_expire_drops_only_the_stale_prefix(clock):
+    cache = PredictiveCache(max_size=10, ttl=10, max_bytes=1 << 20)
+    cache.set("old", "fast", _entry(1))
+    clock.now += 6
+    cache.set("new", "fast", _entry(2))
+    clock.now += 6
+
+    assert cache.expire() == 1
+    assert cache.get("new", "fast") is not None
+    assert cache.current_bytes == sum(e[2] for e in cache.cache.values())
+
+
+def test_scope_separates_entries(clock):
+    cache = PredictiveCache(max_size=10, ttl=60, max_bytes=1 << 20)
+    cache.set("prompt", "fast", _entry(1), scope="tenant-a:0")
+    assert cache.get("prompt", "fast", scope="tenant-b:0") is None
+    assert cache.get("prompt", "fast", scope="tenant-a:1") is None
+    assert cache.get("prompt", "fast", scope="tenant-a:0")["value"] == 1
+
+
+def test_only_the_locked_cache_runs_a_sweeper():
+    assert not hasattr(PredictiveCache(max_size=10, ttl=60, max_bytes=1 << 20), "start_sweeper")
+
+    cache = ThreadSafePredictiveCache(max_size=10, ttl=0.01, max_bytes=1 << 20)
+    cache.set("a", "fast", _entry(1))
+    cache.start_sweeper(interval=0.01)
+    try:
+        deadline = time.monotonic() + 2
+        while cache.cache and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        cache.stop_sweeper()
+    assert len(cache.cache) == 0 and cache.current_bytes == 0
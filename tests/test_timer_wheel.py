@@ -0,0 +1,65 @@
+"""
+TimerWheel scheduling, rounds and cancellation, and ping priority in the send queue
+"""
+
+from src.core.supercharged_websocket_manager import ClientConnection
+from src.utils.timer_wheel import TimerWheel
+
+
+def _advance_until_fired(wheel, key, max_ticks):
+    for tick in range(1, max_ticks + 1):
+        if key in wheel.advance():
+            return tick
+    return None
+
+
+def test_timer_fires_after_rounded_up_ticks():
+    wheel = TimerWheel(tick=1.0, slots=8)
+    wheel.schedule("a", 2.5)
+    wheel.schedule("b", 0)
+    assert wheel.advance() == ["b"]
+    assert wheel.advance() == []
+    assert wheel.advance() == ["a"]
+    assert len(wheel) == 0
+
+
+def test_delays_longer_than_one_revolution_carry_rounds():
+    wheel = TimerWheel(tick=1.0, slots=8)
+    for delay in (8, 9, 17, 24):
+        wheel.schedule(delay, delay)
+    fired = {}
+    for tick in range(1, 30):
+        for key in wheel.advance():
+            fired[key] = tick
+    assert fired == {8: 8, 9: 9, 17: 17, 24: 24}
+
+
+def test_reschedule_replaces_the_previous_deadline():
+    wheel = TimerWheel(tick=1.0, slots=8)
+    wheel.schedule("a", 3)
+    wheel.advance()
+    wheel.schedule("a", 10)
+    assert len(wheel) == 1
+    assert _advance_until_fired(wheel, "a", 20) == 10
+
+
+def test_cancel():
+    wheel = TimerWheel(tick=1.0, slots=8)
+    wheel.schedule("a", 2)
+    assert "a" in wheel
+    assert wheel.cancel("a")
+    assert not wheel.cancel("a")
+    assert "a" not in wheel
+    assert _advance_until_fired(wheel, "a", 20) is None
+
+
+def test_urgent_ping_survives_overflow_and_is_sent_first():
+    connection = ClientConnection(None, {"id": "c1"}, max_queue=2)
+    connection.push("m1")
+    connection.push("ping", urgent=True)
+    assert connection.push("m2") is None
+    assert connection.push("m3") == "overflow"
+    assert connection.push("m4") == "overflow"
+    assert [slot[0] for slot in connection.take(10)] == ["ping", "m3", "m4"]
+    assert connection.dropped == 2
+    assert not connection.wakeup.is_set()
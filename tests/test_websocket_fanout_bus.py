@@ -0,0 +1,114 @@
+"""
+LocalSocketBus hub relay and the manager's once-per-process delivery
+"""
+
+import asyncio
+import socket
+
+import pytest
+
+from src.core.supercharged_websocket_manager import ClientConnection, SuperchargedWebSocketManager
+from src.core.websocket_fanout_bus import FanoutBus, InProcessBus, LocalSocketBus
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _until(predicate, timeout=3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def _envelope(n, topic="t"):
+    return {"origin": "test", "topic": topic, "message_type": "broadcast", "message": {"n": n}}
+
+
+def test_hub_relays_every_publish_to_all_members_in_one_order():
+    async def scenario():
+        port = _free_port()
+        received = {"hub": [], "member": []}
+        hub, member = LocalSocketBus(port=port), LocalSocketBus(port=port)
+        await hub.start(lambda e: received["hub"].append(e["message"]["n"]))
+        await member.start(lambda e: received["member"].append(e["message"]["n"]))
+        try:
+            assert hub.is_hub and not member.is_hub
+            await _until(lambda: len(hub._peers) == 1)
+
+            for n in range(10):
+                await (hub if n % 2 else member).publish(_envelope(n))
+            await _until(lambda: len(received["hub"]) == 10 and len(received["member"]) == 10)
+
+            # Each process sees each publish exactly once, and both see the same order
+            assert sorted(received["hub"]) == list(range(10))
+            assert received["hub"] == received["member"]
+            assert hub.get_stats()["role"] == "hub" and member.get_stats()["role"] == "member"
+        finally:
+            await member.stop()
+            await hub.stop()
+
+    asyncio.run(scenario())
+
+
+def test_member_takes_over_when_the_hub_exits():
+    async def scenario():
+        port = _free_port()
+        received = []
+        hub, member = LocalSocketBus(port=port), LocalSocketBus(port=port)
+        await hub.start(lambda e: None)
+        await member.start(lambda e: received.append(e["message"]["n"]))
+        try:
+            await hub.stop()
+            await _until(lambda: member.is_hub)
+            await member.publish(_envelope(1))
+            await _until(lambda: received == [1])
+        finally:
+            await member.stop()
+
+    asyncio.run(scenario())
+
+
+def test_manager_delivers_each_broadcast_once_per_process():
+    async def scenario():
+        manager = SuperchargedWebSocketManager()
+        manager.fanout_bus = InProcessBus()
+        connection = ClientConnection(None, {"id": "c1"}, max_queue=10)
+        manager.firehose.add(connection)
+
+        envelope = {
+            "origin": "other-process",
+            "topic": "t",
+            "message_type": "broadcast",
+            "message": {"broadcast_id": "b-1", "type": "broadcast"},
+        }
+        manager._deliver_envelope(envelope)
+        manager._deliver_envelope(envelope)
+        assert len(connection.queue) == 1
+        assert manager.performance_stats["duplicates_suppressed"] == 1
+
+        await manager.broadcast({"value": 1})
+        assert len(connection.queue) == 2
+
+    asyncio.run(scenario())
+
+
+def test_dedup_window_is_bounded():
+    manager = SuperchargedWebSocketManager()
+    manager.dedup_window = 3
+    for n in range(5):
+        manager._deliver_envelope({"topic": "t", "message_type": "broadcast", "message": {"broadcast_id": f"b-{n}"}})
+    assert list(manager._recent_broadcast_ids) == ["b-2", "b-3", "b-4"]
+
+
+def test_bus_without_publish_fails_at_construction():
+    class Incomplete(FanoutBus):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    with pytest.raises(TypeError):
+        FanoutBus()